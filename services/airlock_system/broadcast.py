@@ -0,0 +1,306 @@
+# Broadcast backends for airlock WebSocket fan-out
+# File: /services/airlock_system/broadcast.py
+#
+# Both the airlock service and the chat feedback system keep their WebSocket
+# connections in per-process dicts. A broadcast backend carries each broadcast to
+# every process serving the same item: the in-memory backend only reaches the
+# local process, the Postgres backend relays messages with LISTEN/NOTIFY so any
+# number of workers and replicas can serve the same item.
+
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+import asyncio
+import json
+import logging
+import os
+import uuid
+
+import asyncpg
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_MESSAGES = Counter('airlock_broadcast_messages_total', 'Broadcast messages handled by the backend',
+                             ['channel', 'backend', 'direction'])
+SEND_QUEUE_DEPTH = Gauge('airlock_websocket_send_queue_depth', 'Messages waiting in WebSocket send queues', ['channel'])
+SEND_QUEUE_DROPPED = Counter('airlock_websocket_messages_dropped_total', 'WebSocket messages dropped for slow consumers',
+                             ['channel', 'reason'])
+SLOW_CONSUMER_DISCONNECTS = Counter('airlock_websocket_slow_consumer_disconnects_total',
+                                    'WebSocket clients disconnected for falling behind', ['channel'])
+
+# Per-connection send queue configuration
+SEND_QUEUE_SIZE = int(os.getenv("AIRLOCK_WS_SEND_QUEUE_SIZE", "256"))
+SEND_TIMEOUT = float(os.getenv("AIRLOCK_WS_SEND_TIMEOUT", "10"))
+# 'drop_oldest' discards the oldest queued message, 'disconnect' closes the slow client
+SLOW_CONSUMER_POLICY = os.getenv("AIRLOCK_WS_SLOW_CONSUMER_POLICY", "drop_oldest")
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more; larger messages go through the outbox table
+NOTIFY_PAYLOAD_LIMIT = 7500
+
+# Delivers a message to the local WebSocket connections of an item
+DeliverCallback = Callable[[str, Dict[str, Any], Optional[str]], Awaitable[None]]
+
+def resume_cursor(message: Dict[str, Any]) -> Optional[str]:
+    """last_message_id of a client "resume" message.
+
+    Both WebSocket endpoints accept {"type": "resume", "last_message_id": ...} and
+    {"type": "resume", "data": {"last_message_id": ...}}, the envelope their other
+    client messages use; the top-level field wins if both are present.
+    """
+    data = message.get("data")
+    nested = data.get("last_message_id") if isinstance(data, dict) else None
+    return message.get("last_message_id") or nested
+
+class WebSocketSender:
+    """Bounded send queue and writer task for one WebSocket connection.
+
+    Broadcasting only enqueues pre-serialised text, so a slow client never delays
+    other clients or the request that triggered the broadcast. When the queue is full
+    the slow-consumer policy either drops the oldest queued message or disconnects
+    the client. on_close is called once when the sender stops for any reason.
+    """
+
+    def __init__(self, websocket, channel: str, on_close: Optional[Callable[["WebSocketSender"], None]] = None,
+                 max_queue: int = SEND_QUEUE_SIZE, policy: str = SLOW_CONSUMER_POLICY,
+                 send_timeout: float = SEND_TIMEOUT):
+        if policy not in ("drop_oldest", "disconnect"):
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+        self.websocket = websocket
+        self.channel = channel
+        self.on_close = on_close
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.closed = False
+        self._task: Optional[asyncio.Task] = None
+        self._close_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    def send(self, text: str) -> bool:
+        """Queue a serialised message; returns False if the message was not queued"""
+        if self.closed or self._close_task:
+            return False
+        if self.queue.full():
+            if self.policy == "disconnect":
+                SEND_QUEUE_DROPPED.labels(channel=self.channel, reason="disconnect").inc()
+                SLOW_CONSUMER_DISCONNECTS.labels(channel=self.channel).inc()
+                logger.warning(f"Disconnecting slow WebSocket consumer on {self.channel}")
+                # Held on the sender so the close is not garbage collected mid-flight
+                self._close_task = asyncio.create_task(self.close(close_socket=True))
+                return False
+            self.queue.get_nowait()
+            SEND_QUEUE_DEPTH.labels(channel=self.channel).dec()
+            SEND_QUEUE_DROPPED.labels(channel=self.channel, reason="drop_oldest").inc()
+        self.queue.put_nowait(text)
+        SEND_QUEUE_DEPTH.labels(channel=self.channel).inc()
+        return True
+
+    async def close(self, close_socket: bool = False):
+        if self.closed:
+            return
+        self._stop()
+        if self._task and self._task is not asyncio.current_task():
+            self._task.cancel()
+        if close_socket:
+            try:
+                # 1013: try again later
+                await self.websocket.close(code=1013)
+            except Exception:
+                pass
+
+    def _stop(self):
+        if self.closed:
+            return
+        self.closed = True
+        SEND_QUEUE_DEPTH.labels(channel=self.channel).dec(self.queue.qsize())
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        if self.on_close:
+            self.on_close(self)
+
+    async def _run(self):
+        try:
+            while True:
+                text = await self.queue.get()
+                SEND_QUEUE_DEPTH.labels(channel=self.channel).dec()
+                await asyncio.wait_for(self.websocket.send_text(text), timeout=self.send_timeout)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"WebSocket send failed on {self.channel}: {e}")
+        finally:
+            self._stop()
+
+class BroadcastBackend:
+    """Fan-out transport for messages addressed to an airlock item"""
+
+    name = "base"
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.deliver: Optional[DeliverCallback] = None
+
+    async def start(self, deliver: DeliverCallback):
+        self.deliver = deliver
+
+    async def stop(self):
+        pass
+
+    async def publish(self, item_id: str, message: Dict[str, Any], exclude_connection: Optional[str] = None):
+        raise NotImplementedError
+
+class InMemoryBroadcastBackend(BroadcastBackend):
+    """Delivers to connections held by this process only"""
+
+    name = "memory"
+
+    async def publish(self, item_id: str, message: Dict[str, Any], exclude_connection: Optional[str] = None):
+        BROADCAST_MESSAGES.labels(channel=self.channel, backend=self.name, direction="published").inc()
+        await self.deliver(item_id, message, exclude_connection)
+
+class PostgresBroadcastBackend(BroadcastBackend):
+    """Relays broadcasts between processes with Postgres LISTEN/NOTIFY.
+
+    Messages are delivered to local connections immediately and published on the
+    channel for other processes; notifications originating from this process are
+    ignored on receipt. The listener connection is re-established with backoff if
+    it drops, and the publish pool is created on first use, so neither an unreachable
+    database at startup nor an outage later stops the service.
+    """
+
+    name = "postgres"
+
+    def __init__(self, channel: str, database_url: str, publish_pool_size: int = 4,
+                 outbox_retention_seconds: int = 300):
+        super().__init__(channel)
+        self.database_url = database_url
+        self.publish_pool_size = publish_pool_size
+        self.outbox_retention_seconds = outbox_retention_seconds
+        self.node_id = uuid.uuid4().hex
+        self.publish_pool: Optional[asyncpg.Pool] = None
+        self.listen_conn: Optional[asyncpg.Connection] = None
+        self._listen_task: Optional[asyncio.Task] = None
+        self._notification_tasks: Set[asyncio.Task] = set()
+        self._connection_lost = asyncio.Event()
+        self._pool_lock = asyncio.Lock()
+        self._published_to_outbox = 0
+
+    async def start(self, deliver: DeliverCallback):
+        await super().start(deliver)
+        self._listen_task = asyncio.create_task(self._listen_forever())
+        logger.info(f"Postgres broadcast backend started on channel {self.channel} (node {self.node_id})")
+
+    async def stop(self):
+        if self._listen_task:
+            self._listen_task.cancel()
+            try:
+                await self._listen_task
+            except asyncio.CancelledError:
+                pass
+            self._listen_task = None
+        for task in list(self._notification_tasks):
+            task.cancel()
+        await asyncio.gather(*self._notification_tasks, return_exceptions=True)
+        if self.listen_conn and not self.listen_conn.is_closed():
+            await self.listen_conn.close()
+        if self.publish_pool:
+            await self.publish_pool.close()
+            self.publish_pool = None
+
+    async def publish(self, item_id: str, message: Dict[str, Any], exclude_connection: Optional[str] = None):
+        await self.deliver(item_id, message, exclude_connection)
+
+        envelope = {"origin": self.node_id, "item_id": item_id, "message": message}
+        if exclude_connection:
+            envelope["exclude"] = exclude_connection
+        payload = json.dumps(envelope, default=str)
+
+        try:
+            pool = await self._get_publish_pool()
+            async with pool.acquire() as conn:
+                if len(payload.encode()) >= NOTIFY_PAYLOAD_LIMIT:
+                    outbox_id = await conn.fetchval("""
+                        INSERT INTO airlock_broadcast_outbox (payload) VALUES ($1) RETURNING id
+                    """, payload)
+                    payload = json.dumps({"origin": self.node_id, "outbox_id": outbox_id})
+                    await self._prune_outbox(conn)
+                await conn.execute("SELECT pg_notify($1, $2)", self.channel, payload)
+            BROADCAST_MESSAGES.labels(channel=self.channel, backend=self.name, direction="published").inc()
+        except Exception as e:
+            # Local clients already have the message; remote nodes miss this one
+            BROADCAST_MESSAGES.labels(channel=self.channel, backend=self.name, direction="publish_failed").inc()
+            logger.error(f"Failed to publish broadcast for item {item_id}: {e}")
+
+    async def _get_publish_pool(self) -> asyncpg.Pool:
+        """The publish pool, created on first use; a failed attempt is retried on the next call"""
+        if self.publish_pool is None:
+            async with self._pool_lock:
+                if self.publish_pool is None:
+                    self.publish_pool = await asyncpg.create_pool(self.database_url, min_size=1,
+                                                                  max_size=self.publish_pool_size)
+        return self.publish_pool
+
+    async def _prune_outbox(self, conn):
+        self._published_to_outbox += 1
+        if self._published_to_outbox % 100 == 0:
+            await conn.execute("""
+                DELETE FROM airlock_broadcast_outbox
+                WHERE created_at < NOW() - make_interval(secs => $1)
+            """, self.outbox_retention_seconds)
+
+    async def _listen_forever(self):
+        backoff = 0.5
+        while True:
+            try:
+                self._connection_lost.clear()
+                self.listen_conn = await asyncpg.connect(self.database_url)
+                self.listen_conn.add_termination_listener(lambda _conn: self._connection_lost.set())
+                await self.listen_conn.add_listener(self.channel, self._on_notification)
+                logger.info(f"Listening for broadcasts on channel {self.channel}")
+                backoff = 0.5
+                await self._connection_lost.wait()
+                logger.warning(f"Broadcast listener connection lost on channel {self.channel}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Broadcast listener error on channel {self.channel}: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def _on_notification(self, _conn, _pid, _channel, payload: str):
+        task = asyncio.create_task(self._handle_notification(payload))
+        self._notification_tasks.add(task)
+        task.add_done_callback(self._notification_tasks.discard)
+
+    async def _handle_notification(self, payload: str):
+        try:
+            envelope = json.loads(payload)
+            if envelope.get("origin") == self.node_id:
+                return
+            if "outbox_id" in envelope:
+                pool = await self._get_publish_pool()
+                async with pool.acquire() as conn:
+                    stored = await conn.fetchval("""
+                        SELECT payload FROM airlock_broadcast_outbox WHERE id = $1
+                    """, envelope["outbox_id"])
+                if stored is None:
+                    logger.warning(f"Broadcast outbox entry {envelope['outbox_id']} expired before delivery")
+                    return
+                envelope = json.loads(stored)
+            BROADCAST_MESSAGES.labels(channel=self.channel, backend=self.name, direction="received").inc()
+            await self.deliver(envelope["item_id"], envelope["message"], envelope.get("exclude"))
+        except Exception as e:
+            logger.error(f"Failed to handle broadcast notification: {e}")
+
+def create_broadcast_backend(channel: str, database_url: str) -> BroadcastBackend:
+    """Build the backend selected by AIRLOCK_BROADCAST_BACKEND ('memory' or 'postgres')"""
+    backend = os.getenv("AIRLOCK_BROADCAST_BACKEND", "memory").lower()
+    if backend == "postgres":
+        return PostgresBroadcastBackend(
+            channel, database_url,
+            publish_pool_size=int(os.getenv("AIRLOCK_BROADCAST_PUBLISH_POOL_SIZE", "4"))
+        )
+    if backend != "memory":
+        raise ValueError(f"Unknown broadcast backend: {backend}")
+    return InMemoryBroadcastBackend(channel)
@@ -13,6 +13,8 @@ import logging
 import asyncio
 from enum import Enum
 import os
+from broadcast import create_broadcast_backend, resume_cursor, WebSocketSender
+from lookup_cache import LRUTTLCache, upsert_chat_session
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -79,12 +81,20 @@ class WebSocketMessage(BaseModel):
 class ChatFeedbackManager:
     def __init__(self, database_url: str):
         self.database_url = database_url
-        # WebSocket connections: {item_id: {connection_id: websocket}}
-        self.connections: Dict[str, Dict[str, WebSocket]] = {}
+        # WebSocket connections: {item_id: {connection_id: sender}}
+        self.connections: Dict[str, Dict[str, WebSocketSender]] = {}
         # Typing indicators: {item_id: {user_id: timestamp}}
         self.typing_indicators: Dict[str, Dict[str, datetime]] = {}
         # User presence: {item_id: {user_id: {name, last_seen}}}
         self.user_presence: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Carries broadcasts to connections held by other workers and replicas
+        self.broadcaster = create_broadcast_backend("airlock_chat", database_url)
+        # (item_id, participant_type, participant_id) -> chat session id
+        self.session_cache = LRUTTLCache(
+            "chat_session",
+            int(os.getenv("AIRLOCK_SESSION_CACHE_SIZE", "10000")),
+            float(os.getenv("AIRLOCK_SESSION_CACHE_TTL", "600"))
+        )
         
     async def get_db_connection(self):
         return await asyncpg.connect(self.database_url)
@@ -99,7 +109,10 @@ class ChatFeedbackManager:
         if item_id not in self.connections:
             self.connections[item_id] = {}
         
-        self.connections[item_id][connection_id] = websocket
+        sender = WebSocketSender(websocket, "airlock_chat",
+                                 on_close=lambda _sender: self._remove_connection(item_id, connection_id))
+        self.connections[item_id][connection_id] = sender
+        sender.start()
         
         # Update user presence
         if item_id not in self.user_presence:
@@ -134,11 +147,9 @@ class ChatFeedbackManager:
     
     async def disconnect_user(self, item_id: str, connection_id: str, user_id: str):
         """Disconnect a user from an airlock item chat"""
-        if item_id in self.connections and connection_id in self.connections[item_id]:
-            del self.connections[item_id][connection_id]
-            
-            if not self.connections[item_id]:
-                del self.connections[item_id]
+        sender = self.connections.get(item_id, {}).get(connection_id)
+        if sender:
+            await sender.close()
         
         # Update user presence
         if item_id in self.user_presence and user_id in self.user_presence[item_id]:
@@ -181,9 +192,9 @@ class ChatFeedbackManager:
             message_id = str(uuid.uuid4())
             await conn.execute("""
                 INSERT INTO airlock_chat_messages (
-                    id, session_id, sender_type, sender_id, message_type, content, metadata
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7)
-            """, message_id, session_id, message.sender_type.value, message.sender_id,
+                    id, session_id, airlock_item_id, sender_type, sender_id, message_type, content, metadata
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+            """, message_id, session_id, item_id, message.sender_type.value, message.sender_id,
                 message.message_type.value, message.content, json.dumps(message.metadata))
             
             # Broadcast to connected users
@@ -301,18 +312,39 @@ class ChatFeedbackManager:
         finally:
             await conn.close()
     
-    async def get_chat_history(self, item_id: str, limit: int = 50, offset: int = 0) -> List[Dict]:
-        """Get chat history for an item"""
+    async def get_chat_history(self, item_id: str, limit: int = 50, offset: int = 0,
+                               after: Optional[str] = None, before: Optional[str] = None) -> List[Dict]:
+        """Get chat history for an item in chronological order.
+        
+        `after`/`before` are message IDs; they seek on the (airlock_item_id, created_at, id)
+        index instead of skipping `offset` rows.
+        """
         conn = await self.get_db_connection()
         try:
-            rows = await conn.fetch("""
-                SELECT acm.*
-                FROM airlock_chat_messages acm
-                JOIN airlock_chat_sessions acs ON acm.session_id = acs.id
-                WHERE acs.airlock_item_id = $1
-                ORDER BY acm.created_at ASC
-                LIMIT $2 OFFSET $3
-            """, item_id, limit, offset)
+            if after or before:
+                position = await self._message_position(conn, item_id, after or before)
+                if after:
+                    rows = await conn.fetch("""
+                        SELECT * FROM airlock_chat_messages
+                        WHERE airlock_item_id = $1 AND (created_at, id) > ($2, $3)
+                        ORDER BY created_at ASC, id ASC
+                        LIMIT $4
+                    """, item_id, position['created_at'], position['id'], limit)
+                else:
+                    rows = await conn.fetch("""
+                        SELECT * FROM airlock_chat_messages
+                        WHERE airlock_item_id = $1 AND (created_at, id) < ($2, $3)
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT $4
+                    """, item_id, position['created_at'], position['id'], limit)
+                    rows = list(reversed(rows))
+            else:
+                rows = await conn.fetch("""
+                    SELECT * FROM airlock_chat_messages
+                    WHERE airlock_item_id = $1
+                    ORDER BY created_at ASC, id ASC
+                    LIMIT $2 OFFSET $3
+                """, item_id, limit, offset)
             
             return [{
                 "id": str(row['id']),
@@ -327,6 +359,39 @@ class ChatFeedbackManager:
         finally:
             await conn.close()
     
+    async def send_missed_messages(self, websocket: WebSocket, item_id: str, last_message_id: Optional[str],
+                                   max_messages: int = 1000):
+        """Replay messages after last_message_id to a reconnecting client in pages.
+        
+        Messages broadcast while the replay is in flight may arrive twice; clients
+        de-duplicate on message ID.
+        """
+        if not last_message_id:
+            await websocket.send_json({"type": "error", "message": "resume requires last_message_id"})
+            return
+        cursor = last_message_id
+        sent = 0
+        while sent < max_messages:
+            page = await self.get_chat_history(item_id, limit=100, after=cursor)
+            if not page:
+                break
+            await websocket.send_json({
+                "type": "resume_messages",
+                "messages": page,
+                "timestamp": datetime.now(timezone.utc).isoformat()
+            })
+            sent += len(page)
+            cursor = page[-1]["id"]
+            if len(page) < 100:
+                break
+        await websocket.send_json({
+            "type": "resume_complete",
+            "last_message_id": cursor,
+            "count": sent,
+            "truncated": sent >= max_messages,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        })
+    
     async def get_feedback_history(self, item_id: str) -> List[Dict]:
         """Get feedback history for an item"""
         conn = await self.get_db_connection()
@@ -349,26 +414,39 @@ class ChatFeedbackManager:
             await conn.close()
     
     # Broadcasting and Notifications
+    async def start_broadcast(self):
+        """Start the broadcast backend that fans messages out to every worker"""
+        await self.broadcaster.start(self._deliver_to_item)
+    
+    async def stop_broadcast(self):
+        await self.broadcaster.stop()
+    
     async def _broadcast_to_item(self, item_id: str, message: Dict, exclude_connection: Optional[str] = None):
-        """Broadcast a message to all connected users for an item"""
+        """Broadcast a message to all connected users for an item, on every worker"""
+        await self.broadcaster.publish(item_id, message, exclude_connection)
+    
+    async def _deliver_to_item(self, item_id: str, message: Dict, exclude_connection: Optional[str] = None):
+        """Queue a message for the users of an item connected to this worker.
+        
+        The message is serialised once and handed to each connection's send queue;
+        the per-connection writer tasks deliver concurrently.
+        """
         if item_id not in self.connections:
             return
         
-        disconnected = []
-        for connection_id, websocket in self.connections[item_id].items():
+        text = json.dumps(message, default=str)
+        for connection_id, sender in list(self.connections[item_id].items()):
             if exclude_connection and connection_id == exclude_connection:
                 continue
-                
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.warning(f"Failed to send message to connection {connection_id}: {e}")
-                disconnected.append(connection_id)
-        
-        # Remove disconnected websockets
-        for conn_id in disconnected:
-            if conn_id in self.connections[item_id]:
-                del self.connections[item_id][conn_id]
+            sender.send(text)
+    
+    def _remove_connection(self, item_id: str, connection_id: str):
+        """Drop a stopped sender from the connection registry"""
+        if item_id in self.connections and connection_id in self.connections[item_id]:
+            del self.connections[item_id][connection_id]
+            
+            if not self.connections[item_id]:
+                del self.connections[item_id]
     
     async def _broadcast_typing_update(self, item_id: str):
         """Broadcast typing indicator updates"""
@@ -400,23 +478,31 @@ class ChatFeedbackManager:
         })
     
     # Helper Methods
-    async def _get_or_create_chat_session(self, conn, item_id: str, participant_type: str, participant_id: str) -> str:
-        """Get or create chat session"""
+    async def _message_position(self, conn, item_id: str, message_id: str):
+        """Look up the (created_at, id) sort key of a message belonging to an item"""
+        try:
+            uuid.UUID(message_id)
+        except ValueError:
+            raise ValueError(f"Invalid message cursor: {message_id}")
         row = await conn.fetchrow("""
-            SELECT id FROM airlock_chat_sessions 
-            WHERE airlock_item_id = $1 AND participant_type = $2 AND participant_id = $3
-        """, item_id, participant_type, participant_id)
-        
-        if row:
-            return str(row['id'])
+            SELECT created_at, id FROM airlock_chat_messages
+            WHERE id = $1 AND airlock_item_id = $2
+        """, message_id, item_id)
+        if not row:
+            raise ValueError(f"Message {message_id} not found for item {item_id}")
+        return row
+    
+    async def _get_or_create_chat_session(self, conn, item_id: str, participant_type: str, participant_id: str) -> str:
+        """Get or create chat session, served from the session cache when possible"""
+        cache_key = (str(item_id), participant_type, participant_id)
+        session_id = self.session_cache.get(cache_key)
+        if session_id:
+            return session_id
         
-        # Create new session
-        session_id = str(uuid.uuid4())
-        await conn.execute("""
-            INSERT INTO airlock_chat_sessions (id, airlock_item_id, participant_type, participant_id)
-            VALUES ($1, $2, $3, $4)
-        """, session_id, item_id, participant_type, participant_id)
+        session_id = str(await upsert_chat_session(conn, item_id, participant_type, participant_id))
         
+        if not conn.is_in_transaction():
+            self.session_cache.put(cache_key, session_id)
         return session_id
     
     # Background Tasks
@@ -462,15 +548,33 @@ chat_manager = ChatFeedbackManager(DATABASE_URL)
 # Start background tasks
 @app.on_event("startup")
 async def startup_event():
+    await chat_manager.start_broadcast()
     asyncio.create_task(chat_manager.cleanup_expired_typing_indicators())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    await chat_manager.stop_broadcast()
+
 # WebSocket endpoint
 @app.websocket("/api/v1/chat/{item_id}/ws")
-async def websocket_endpoint(websocket: WebSocket, item_id: str, user_id: str, user_name: Optional[str] = None):
-    """WebSocket endpoint for real-time chat and feedback"""
+async def websocket_endpoint(websocket: WebSocket, item_id: str, user_id: str, user_name: Optional[str] = None,
+                             last_message_id: Optional[str] = None):
+    """WebSocket endpoint for real-time chat and feedback.
+    
+    Reconnecting clients pass `last_message_id` as a query parameter, or send a
+    {"type": "resume", "data": {"last_message_id": ...}} message (a top-level
+    "last_message_id" is accepted too, as on the airlock item endpoint), to receive
+    only the messages they missed.
+    """
     connection_id = await chat_manager.connect_user(websocket, item_id, user_id, user_name)
     
     try:
+        if last_message_id:
+            try:
+                await chat_manager.send_missed_messages(websocket, item_id, last_message_id)
+            except ValueError as e:
+                await websocket.send_json({"type": "error", "message": str(e)})
+        
         while True:
             data = await websocket.receive_text()
             try:
@@ -499,6 +603,9 @@ async def websocket_endpoint(websocket: WebSocket, item_id: str, user_id: str, u
                     reaction = MessageReaction(**message_data["data"])
                     await chat_manager.handle_message_reaction(item_id, reaction)
                 
+                elif message_type == "resume":
+                    await chat_manager.send_missed_messages(websocket, item_id, resume_cursor(message_data))
+                
                 else:
                     await websocket.send_json({
                         "type": "error", 
@@ -522,9 +629,15 @@ async def add_message(item_id: str, message: ChatMessage):
     return {"message_id": message_id, "status": "added"}
 
 @app.get("/api/v1/chat/{item_id}/messages")
-async def get_messages(item_id: str, limit: int = 50, offset: int = 0):
-    """Get chat history via REST API"""
-    return await chat_manager.get_chat_history(item_id, limit, offset)
+async def get_messages(item_id: str, limit: int = 50, offset: int = 0,
+                       after: Optional[str] = None, before: Optional[str] = None):
+    """Get chat history via REST API; page with `after`/`before` message IDs"""
+    if after and before:
+        raise HTTPException(status_code=400, detail="Use either 'after' or 'before', not both")
+    try:
+        return await chat_manager.get_chat_history(item_id, limit, offset, after, before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/api/v1/chat/{item_id}/feedback")
 async def add_feedback_rest(item_id: str, feedback: FeedbackMessage):
@@ -560,6 +673,7 @@ async def health_check():
         "status": "healthy", 
         "service": "chat_feedback_system",
         "active_connections": sum(len(conns) for conns in chat_manager.connections.values()),
+        "broadcast_backend": chat_manager.broadcaster.name,
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
@@ -0,0 +1,85 @@
+# Bounded in-process caches for airlock lookups, and the upsert behind a session cache miss
+# File: /services/airlock_system/lookup_cache.py
+
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+import time
+import uuid
+
+from prometheus_client import Counter, Gauge
+
+CACHE_REQUESTS = Counter('airlock_lookup_cache_requests_total', 'Lookup cache requests', ['cache', 'result'])
+CACHE_ENTRIES = Gauge('airlock_lookup_cache_entries', 'Entries held by lookup caches', ['cache'])
+
+class LRUTTLCache:
+    """Least-recently-used cache whose entries also expire after a fixed TTL.
+
+    Intended for effectively immutable mappings such as chat session and content
+    type IDs; values are only ever added after the database row is known to exist.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl_seconds: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            CACHE_REQUESTS.labels(cache=self.name, result="miss").inc()
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            CACHE_ENTRIES.labels(cache=self.name).set(len(self._entries))
+            CACHE_REQUESTS.labels(cache=self.name, result="expired").inc()
+            return None
+        self._entries.move_to_end(key)
+        CACHE_REQUESTS.labels(cache=self.name, result="hit").inc()
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        CACHE_ENTRIES.labels(cache=self.name).set(len(self._entries))
+
+    def invalidate(self, key: Hashable):
+        if self._entries.pop(key, None) is not None:
+            CACHE_ENTRIES.labels(cache=self.name).set(len(self._entries))
+
+    def clear(self):
+        self._entries.clear()
+        CACHE_ENTRIES.labels(cache=self.name).set(0)
+
+    def __len__(self):
+        return len(self._entries)
+
+async def upsert_chat_session(conn, item_id: str, participant_type: str, participant_id: str):
+    """ID of the participant's session for the item, creating it if needed.
+    
+    Relies on UNIQUE(airlock_item_id, participant_type, participant_id) from the airlock
+    schema; DO NOTHING leaves an existing session untouched.
+    """
+    session_id = await conn.fetchval("""
+        WITH created AS (
+            INSERT INTO airlock_chat_sessions (id, airlock_item_id, participant_type, participant_id)
+            VALUES ($1, $2, $3, $4)
+            ON CONFLICT (airlock_item_id, participant_type, participant_id) DO NOTHING
+            RETURNING id
+        )
+        SELECT id FROM created
+        UNION ALL
+        SELECT id FROM airlock_chat_sessions
+        WHERE airlock_item_id = $2 AND participant_type = $3 AND participant_id = $4
+        LIMIT 1
+    """, str(uuid.uuid4()), item_id, participant_type, participant_id)
+    if session_id is None:
+        # Created by a transaction that committed after this statement's snapshot
+        session_id = await conn.fetchval("""
+            SELECT id FROM airlock_chat_sessions
+            WHERE airlock_item_id = $1 AND participant_type = $2 AND participant_id = $3
+        """, item_id, participant_type, participant_id)
+    return session_id
@@ -0,0 +1,123 @@
+import asyncio
+import websockets
+import json
+import os
+import time
+import uuid
+
+# Base URLs of independently running airlock workers/replicas sharing one database,
+# started with AIRLOCK_BROADCAST_BACKEND=postgres
+WORKER_URLS = os.getenv("AIRLOCK_WORKER_URLS", "http://localhost:8007,http://localhost:8008").split(",")
+
+def create_room(base_url):
+    """Create an airlock item to use as the shared room"""
+    import requests
+    payload = {
+        "content_type": "training_validation",
+        "source_service": "multiworker_test",
+        "source_id": f"multiworker_{uuid.uuid4().hex[:8]}",
+        "title": "Multi-Worker WebSocket Test",
+        "content": {"test": True},
+        "priority": "low"
+    }
+    response = requests.post(f"{base_url}/api/v1/airlock/items", json=payload)
+    response.raise_for_status()
+    return response.json()["item_id"]
+
+async def listening_client(client_id, base_url, room_id, expected_messages, ready, timeout=15.0):
+    """Connect to one worker and collect new_message broadcasts"""
+    uri = base_url.replace("http", "ws", 1) + f"/api/v1/airlock/items/{room_id}/ws"
+    received = set()
+    latencies = []
+
+    try:
+        async with websockets.connect(uri) as websocket:
+            ready.release()
+            deadline = time.time() + timeout
+            while len(received) < expected_messages and time.time() < deadline:
+                try:
+                    raw = await asyncio.wait_for(websocket.recv(), timeout=deadline - time.time())
+                except asyncio.TimeoutError:
+                    break
+                message = json.loads(raw)
+                if message.get("type") != "new_message":
+                    continue
+                metadata = message.get("metadata") or {}
+                if "sent_at" in metadata:
+                    latencies.append(time.time() - metadata["sent_at"])
+                received.add(message["content"])
+
+        return {'client_id': client_id, 'worker': base_url, 'received': len(received),
+                'latencies': latencies, 'success': len(received) == expected_messages}
+    except Exception as e:
+        ready.release()
+        print(f"Client {client_id} on {base_url} failed: {e}")
+        return {'client_id': client_id, 'worker': base_url, 'received': 0,
+                'latencies': [], 'success': False, 'error': str(e)}
+
+async def sending_client(base_url, room_id, message_count):
+    """Send chat messages through one worker"""
+    uri = base_url.replace("http", "ws", 1) + f"/api/v1/airlock/items/{room_id}/ws"
+    async with websockets.connect(uri) as websocket:
+        for i in range(message_count):
+            await websocket.send(json.dumps({
+                "type": "chat_message",
+                "data": {
+                    "sender_type": "human",
+                    "sender_id": "multiworker_sender",
+                    "content": f"Cross-worker message {i + 1}",
+                    "metadata": {"sent_at": time.time()}
+                }
+            }))
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(1.0)
+
+async def test_multi_worker_websocket(clients_per_worker=10, message_count=20):
+    """Messages sent via one worker must reach clients connected to every worker"""
+    print(f"=== Multi-Worker WebSocket Testing ({len(WORKER_URLS)} workers) ===")
+
+    try:
+        room_id = create_room(WORKER_URLS[0])
+        print(f"Using room ID: {room_id}")
+    except Exception as e:
+        print(f"Error creating room: {e}")
+        return False
+
+    ready = asyncio.Semaphore(0)
+    listeners = [
+        asyncio.create_task(listening_client(w * clients_per_worker + i, url, room_id, message_count, ready))
+        for w, url in enumerate(WORKER_URLS)
+        for i in range(clients_per_worker)
+    ]
+    for _ in listeners:
+        await ready.acquire()
+
+    start_time = time.time()
+    # Send through the last worker so most listeners are on other workers
+    await sending_client(WORKER_URLS[-1], room_id, message_count)
+    results = await asyncio.gather(*listeners)
+    end_time = time.time()
+
+    print(f"\n=== Multi-Worker WebSocket Test Results ===")
+    print(f"Test duration: {end_time - start_time:.2f} seconds")
+    for url in WORKER_URLS:
+        worker_results = [r for r in results if r['worker'] == url]
+        complete = sum(1 for r in worker_results if r['success'])
+        print(f"{url}: {complete}/{len(worker_results)} clients received all {message_count} messages")
+
+    latencies = sorted(l for r in results for l in r['latencies'])
+    if latencies:
+        print(f"Delivery latency p50: {latencies[len(latencies) // 2] * 1000:.1f}ms, "
+              f"p99: {latencies[int(len(latencies) * 0.99) - 1] * 1000:.1f}ms")
+
+    success_rate = sum(1 for r in results if r['success']) / len(results)
+    test_passed = success_rate >= 0.95
+
+    print(f"\nSuccess rate: {success_rate:.1%}")
+    print(f"Test result: {'✅ PASSED' if test_passed else '❌ FAILED'}")
+
+    return test_passed
+
+if __name__ == "__main__":
+    success = asyncio.run(test_multi_worker_websocket())
+    exit(0 if success else 1)
@@ -14,6 +14,9 @@ from governance.knowledge_graph import KnowledgeGraphManager, Entity, Relationsh
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Documents accepted by one /knowledge/store/batch request
+KNOWLEDGE_STORE_BATCH_MAX = int(os.getenv("KNOWLEDGE_STORE_BATCH_MAX", "5000"))
+
 app = FastAPI(title="Enhanced AOS Data Architecture Service", version="1.0.0")
 
 app.add_middleware(
@@ -33,6 +36,9 @@ class StoreDocumentRequest(BaseModel):
     metadata: Dict[str, Any]
     document_id: Optional[str] = None
 
+class StoreDocumentsRequest(BaseModel):
+    documents: List[StoreDocumentRequest]
+
 class SearchRequest(BaseModel):
     query: str
     top_k: int = 5
@@ -105,6 +111,9 @@ async def shutdown_event():
     
     if knowledge_graph:
         await knowledge_graph.close()
+    
+    if vector_client:
+        await vector_client.close()
 
 @app.get("/health")
 async def health_check():
@@ -161,6 +170,55 @@ async def store_knowledge(request: StoreDocumentRequest):
         logger.error(f"Error storing knowledge: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/knowledge/store/batch")
+async def store_knowledge_batch(request: StoreDocumentsRequest):
+    """Store many documents with batched embedding and upsert requests; results are reported per document"""
+    if not vector_client:
+        raise HTTPException(status_code=503, detail="Vector client not available")
+    
+    if len(request.documents) > KNOWLEDGE_STORE_BATCH_MAX:
+        raise HTTPException(status_code=413, detail=f"At most {KNOWLEDGE_STORE_BATCH_MAX} documents per batch")
+    
+    try:
+        timestamp = datetime.utcnow().timestamp()
+        documents = [
+            VectorDocument(
+                id=item.document_id or f"doc_{timestamp}_{index}",
+                content=item.content,
+                metadata=item.metadata
+            )
+            for index, item in enumerate(request.documents)
+        ]
+        
+        result = await vector_client.store_documents(documents)
+        
+        if result.stored and kafka_manager:
+            event = await kafka_manager.create_event(
+                event_type="knowledge.stored_batch",
+                source_service="data_architecture",
+                data={
+                    "document_ids": result.stored,
+                    "documents_count": len(result.stored),
+                    "failed_count": len(result.failed)
+                }
+            )
+            await kafka_manager.publish_event("agent.activities", event)
+        
+        return {
+            "success": not result.failed,
+            "document_ids": result.stored,
+            "stored_count": len(result.stored),
+            "failed": result.failed,
+            "requests": {
+                "embedding": result.embedding_requests,
+                "upsert": result.upsert_requests
+            }
+        }
+        
+    except Exception as e:
+        logger.error(f"Error storing knowledge batch: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/knowledge/search")
 async def search_knowledge(request: SearchRequest):
     """Search for similar documents using semantic similarity"""
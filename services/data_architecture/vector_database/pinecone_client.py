@@ -1,13 +1,41 @@
 import os
 import json
+import random
+import asyncio
 import logging
+from contextlib import nullcontext
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import aiohttp
 import numpy as np
 
 logger = logging.getLogger(__name__)
 
+OPENAI_EMBEDDINGS_URL = "https://api.openai.com/v1/embeddings"
+EMBEDDING_MODEL = "text-embedding-ada-002"
+# Per-request limits of the embeddings API: inputs per request, tokens per request and per input
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "512"))
+EMBEDDING_BATCH_TOKENS = int(os.getenv("EMBEDDING_BATCH_TOKENS", "250000"))
+EMBEDDING_MAX_INPUT_TOKENS = 8191
+# Conservative characters-per-token estimate for English text, used to stay under the token limits
+EMBEDDING_CHARS_PER_TOKEN = 3
+# Pinecone upserts: vectors per request and approximate request size (the API caps requests at 2 MB)
+PINECONE_UPSERT_BATCH_SIZE = int(os.getenv("PINECONE_UPSERT_BATCH_SIZE", "100"))
+PINECONE_UPSERT_BATCH_BYTES = int(os.getenv("PINECONE_UPSERT_BATCH_BYTES", str(1536 * 1024)))
+# Concurrent embedding and upsert requests per batch store
+VECTOR_STORE_CONCURRENCY = int(os.getenv("VECTOR_STORE_CONCURRENCY", "4"))
+# Retries of rate-limited, failed or timed-out requests, with exponential backoff and jitter
+VECTOR_STORE_MAX_RETRIES = int(os.getenv("VECTOR_STORE_MAX_RETRIES", "3"))
+VECTOR_STORE_RETRY_BASE_SECONDS = float(os.getenv("VECTOR_STORE_RETRY_BASE_SECONDS", "1"))
+VECTOR_STORE_RETRY_MAX_SECONDS = float(os.getenv("VECTOR_STORE_RETRY_MAX_SECONDS", "30"))
+VECTOR_STORE_REQUEST_TIMEOUT = float(os.getenv("VECTOR_STORE_REQUEST_TIMEOUT", "60"))
+
+class VectorStoreError(Exception):
+    """An embedding or Pinecone request failed; retryable when it still failed after its retries"""
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+
 @dataclass
 class VectorDocument:
     id: str
@@ -20,6 +48,54 @@ class SearchResult:
     document: VectorDocument
     score: float
 
+@dataclass
+class BatchStoreResult:
+    stored: List[str] = field(default_factory=list)
+    # Document id -> error, for documents that could not be embedded or upserted
+    failed: Dict[str, str] = field(default_factory=dict)
+    embedding_requests: int = 0
+    upsert_requests: int = 0
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // EMBEDDING_CHARS_PER_TOKEN + 1
+
+def embedding_batches(documents: List[VectorDocument],
+                      max_inputs: int = EMBEDDING_BATCH_SIZE,
+                      max_tokens: int = EMBEDDING_BATCH_TOKENS) -> List[List[VectorDocument]]:
+    """Group documents, in order, into embedding requests within the input and token limits"""
+    batches: List[List[VectorDocument]] = []
+    batch: List[VectorDocument] = []
+    tokens = 0
+    for document in documents:
+        document_tokens = min(estimate_tokens(document.content), EMBEDDING_MAX_INPUT_TOKENS)
+        if batch and (len(batch) >= max_inputs or tokens + document_tokens > max_tokens):
+            batches.append(batch)
+            batch, tokens = [], 0
+        batch.append(document)
+        tokens += document_tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+def upsert_batches(vectors: List[Dict[str, Any]],
+                   max_vectors: int = PINECONE_UPSERT_BATCH_SIZE,
+                   max_bytes: int = PINECONE_UPSERT_BATCH_BYTES) -> List[List[Dict[str, Any]]]:
+    """Group vectors, in order, into upsert requests within the vector count and request size limits"""
+    batches: List[List[Dict[str, Any]]] = []
+    batch: List[Dict[str, Any]] = []
+    size = 0
+    for vector in vectors:
+        # Float values serialise to about 20 bytes each
+        vector_size = len(json.dumps(vector["metadata"], default=str)) + 20 * len(vector["values"]) + 64
+        if batch and (len(batch) >= max_vectors or size + vector_size > max_bytes):
+            batches.append(batch)
+            batch, size = [], 0
+        batch.append(vector)
+        size += vector_size
+    if batch:
+        batches.append(batch)
+    return batches
+
 class PineconeVectorClient:
     """
     Vector database client for storing and searching task memories using Pinecone.
@@ -32,58 +108,116 @@ class PineconeVectorClient:
         self.index_name = index_name
         self.base_url = f"https://{index_name}-{environment}.svc.{environment}.pinecone.io"
         self.embedding_dimension = 1536  # OpenAI ada-002 embedding dimension
-        
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """One pooled session for all OpenAI and Pinecone requests, created in the running loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=VECTOR_STORE_REQUEST_TIMEOUT)
+            )
+        return self._session
+    
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    def _openai_headers(self) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}",
+            "Content-Type": "application/json"
+        }
+    
+    def _pinecone_headers(self) -> Dict[str, str]:
+        return {
+            "Api-Key": self.api_key,
+            "Content-Type": "application/json"
+        }
+    
+    async def _request_with_retry(self, method: str, url: str, headers: Dict[str, str], data: Dict,
+                                  semaphore: Optional[asyncio.Semaphore] = None) -> Dict:
+        """
+        JSON response; rate limits, server errors and connection failures are retried with backoff.
+
+        The semaphore, when given, is held per attempt only, not during the backoff sleep.
+        """
+        for attempt in range(VECTOR_STORE_MAX_RETRIES + 1):
+            retry_after = None
+            try:
+                async with semaphore or nullcontext():
+                    session = await self._get_session()
+                    async with session.request(method, url, headers=headers, json=data) as response:
+                        if response.status in [200, 201]:
+                            return await response.json()
+                        error = f"API error: {response.status} - {(await response.text())[:500]}"
+                        retryable = response.status == 429 or response.status >= 500
+                        if response.headers.get("Retry-After", "").isdigit():
+                            retry_after = float(response.headers["Retry-After"])
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error, retryable = f"{type(e).__name__}: {e}", True
+            if not retryable or attempt == VECTOR_STORE_MAX_RETRIES:
+                raise VectorStoreError(error, retryable=retryable)
+            delay = min(VECTOR_STORE_RETRY_MAX_SECONDS, VECTOR_STORE_RETRY_BASE_SECONDS * 2 ** attempt)
+            delay = max(retry_after or 0, delay * random.uniform(0.5, 1.0))
+            logger.warning(f"{method} {url} failed ({error}), retry {attempt + 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    
     async def _get_embedding(self, text: str) -> List[float]:
         """Generate embedding for text using OpenAI API"""
         try:
-            headers = {
-                "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY')}",
-                "Content-Type": "application/json"
-            }
+            headers = self._openai_headers()
             
             payload = {
                 "input": text,
-                "model": "text-embedding-ada-002"
+                "model": EMBEDDING_MODEL
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://api.openai.com/v1/embeddings",
-                    headers=headers,
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data["data"][0]["embedding"]
-                    else:
-                        logger.error(f"OpenAI API error: {response.status}")
-                        return np.random.random(self.embedding_dimension).tolist()
-                        
+            session = await self._get_session()
+            async with session.post(
+                OPENAI_EMBEDDINGS_URL,
+                headers=headers,
+                json=payload
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data["data"][0]["embedding"]
+                else:
+                    logger.error(f"OpenAI API error: {response.status}")
+                    return np.random.random(self.embedding_dimension).tolist()
+                    
         except Exception as e:
             logger.error(f"Error generating embedding: {str(e)}")
             return np.random.random(self.embedding_dimension).tolist()
     
     async def _pinecone_request(self, method: str, endpoint: str, data: Dict = None) -> Dict:
         """Make authenticated request to Pinecone API"""
-        headers = {
-            "Api-Key": self.api_key,
-            "Content-Type": "application/json"
-        }
+        headers = self._pinecone_headers()
         
         url = f"{self.base_url}{endpoint}"
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.request(method, url, headers=headers, json=data) as response:
-                    if response.status in [200, 201]:
-                        return await response.json()
-                    else:
-                        logger.error(f"Pinecone API error: {response.status} - {await response.text()}")
-                        return {"error": f"API error: {response.status}"}
+            session = await self._get_session()
+            async with session.request(method, url, headers=headers, json=data) as response:
+                if response.status in [200, 201]:
+                    return await response.json()
+                else:
+                    logger.error(f"Pinecone API error: {response.status} - {await response.text()}")
+                    return {"error": f"API error: {response.status}"}
         except Exception as e:
             logger.error(f"Pinecone request error: {str(e)}")
             return {"error": str(e)}
     
+    def _vector(self, document: VectorDocument) -> Dict[str, Any]:
+        return {
+            "id": document.id,
+            "values": document.embedding,
+            "metadata": {
+                **document.metadata,
+                "content": document.content
+            }
+        }
+    
     async def store_document(self, document: VectorDocument) -> bool:
         """Store a document with its embedding in the vector database"""
         try:
@@ -91,14 +225,7 @@ class PineconeVectorClient:
                 document.embedding = await self._get_embedding(document.content)
             
             vector_data = {
-                "vectors": [{
-                    "id": document.id,
-                    "values": document.embedding,
-                    "metadata": {
-                        **document.metadata,
-                        "content": document.content
-                    }
-                }]
+                "vectors": [self._vector(document)]
             }
             
             result = await self._pinecone_request("POST", "/vectors/upsert", vector_data)
@@ -114,6 +241,101 @@ class PineconeVectorClient:
             logger.error(f"Error storing document {document.id}: {str(e)}")
             return False
     
+    async def _embed(self, documents: List[VectorDocument], semaphore: Optional[asyncio.Semaphore] = None):
+        """Set the embeddings of the documents from one embeddings request"""
+        max_chars = EMBEDDING_MAX_INPUT_TOKENS * EMBEDDING_CHARS_PER_TOKEN
+        inputs = []
+        for document in documents:
+            if len(document.content) > max_chars:
+                logger.warning(f"Embedding the first {max_chars} characters of document {document.id}")
+            inputs.append(document.content[:max_chars])
+        
+        payload = {
+            "input": inputs,
+            "model": EMBEDDING_MODEL
+        }
+        data = await self._request_with_retry(
+            "POST", OPENAI_EMBEDDINGS_URL, self._openai_headers(), payload, semaphore=semaphore
+        )
+        embeddings = sorted(data["data"], key=lambda item: item["index"])
+        if len(embeddings) != len(documents):
+            raise VectorStoreError(f"Expected {len(documents)} embeddings, got {len(embeddings)}")
+        for document, item in zip(documents, embeddings):
+            document.embedding = item["embedding"]
+    
+    async def _send_with_fallback(self, batch: List[Any], send, item_id, failed: Dict[str, str]):
+        """
+        Send a batch; if the service rejects it, send each half the same way.
+
+        Only rejections (4xx other than 429, malformed responses) are split, isolating a bad
+        item in about 2 * log2(len(batch)) extra requests. A batch that still hits rate
+        limits, server errors or timeouts after its retries fails as a whole; splitting it
+        would only multiply requests against a service that is down.
+        """
+        try:
+            await send(batch)
+        except Exception as e:
+            if len(batch) == 1 or (isinstance(e, VectorStoreError) and e.retryable):
+                for item in batch:
+                    failed[item_id(item)] = str(e)
+                return
+            logger.warning(f"Batch of {len(batch)} rejected ({e}), retrying it in halves")
+            middle = len(batch) // 2
+            await asyncio.gather(
+                self._send_with_fallback(batch[:middle], send, item_id, failed),
+                self._send_with_fallback(batch[middle:], send, item_id, failed)
+            )
+    
+    async def store_documents(self, documents: List[VectorDocument]) -> BatchStoreResult:
+        """
+        Store many documents with few requests.
+
+        Embeddings are requested in batches within the embeddings API input and token
+        limits, and vectors upserted in batches within Pinecone's request limits, with
+        at most VECTOR_STORE_CONCURRENCY requests in flight over the shared session. A
+        batch the service rejects is split until the rejected documents are on their
+        own, so one bad document fails alone; a batch that exhausts its retries fails
+        as a whole. Unlike store_document, a document whose embedding fails
+        is reported as failed rather than stored with a placeholder vector.
+        """
+        result = BatchStoreResult()
+        if not documents:
+            return result
+        semaphore = asyncio.Semaphore(VECTOR_STORE_CONCURRENCY)
+        
+        async def embed(batch: List[VectorDocument]):
+            result.embedding_requests += 1
+            await self._embed(batch, semaphore=semaphore)
+        
+        async def upsert(batch: List[Dict[str, Any]]):
+            result.upsert_requests += 1
+            await self._request_with_retry(
+                "POST", f"{self.base_url}/vectors/upsert", self._pinecone_headers(), {"vectors": batch},
+                semaphore=semaphore
+            )
+        
+        pending = [document for document in documents if not document.embedding]
+        await asyncio.gather(*(
+            self._send_with_fallback(batch, embed, lambda document: document.id, result.failed)
+            for batch in embedding_batches(pending)
+        ))
+        
+        vectors = [
+            self._vector(document) for document in documents
+            if document.embedding and document.id not in result.failed
+        ]
+        await asyncio.gather(*(
+            self._send_with_fallback(batch, upsert, lambda vector: vector["id"], result.failed)
+            for batch in upsert_batches(vectors)
+        ))
+        
+        result.stored = [vector["id"] for vector in vectors if vector["id"] not in result.failed]
+        logger.info(
+            f"Stored {len(result.stored)}/{len(documents)} documents with {result.embedding_requests} "
+            f"embedding and {result.upsert_requests} upsert requests ({len(result.failed)} failed)"
+        )
+        return result
+    
     async def search_similar(self, 
                            query: str, 
                            top_k: int = 5,
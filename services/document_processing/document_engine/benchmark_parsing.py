@@ -0,0 +1,108 @@
+"""
+Throughput benchmark: one file at a time vs. the partition pool.
+
+The previous path parsed each document with a single blocking partition call, one
+document after another. The pool path is what /parse/batch does: all documents are
+admitted at once, PDFs are split into page ranges, and ranges from every document are
+partitioned concurrently on the shared worker pool.
+
+By default the configured Unstructured API (UNSTRUCTURED_API_URL) does the
+partitioning, so pass real PDFs for meaningful numbers:
+
+    python benchmark_parsing.py report1.pdf report2.pdf ...
+
+Without an API at hand, --simulate SECONDS_PER_PAGE replaces the partition call with
+a stand-in that sleeps for that long per page of the range it is given (the API does
+the work in its own process, so a sleeping thread is a fair model of the wait).
+Without files, blank PDFs are generated (--documents, --pages).
+
+    python benchmark_parsing.py --simulate 0.05 --documents 8 --pages 40
+"""
+import argparse
+import asyncio
+import io
+import os
+import tempfile
+import time
+from typing import List
+
+from pypdf import PdfReader, PdfWriter
+
+from src.document_parser import DocumentParser, PartitionPool
+from src.parse_cache import ParseCache
+
+def write_blank_pdf(path: str, pages: int):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+class SimulatedPartition:
+    """Stands in for UnstructuredClient.general: sleeps per page and returns one element per page"""
+    def __init__(self, seconds_per_page: float):
+        self.seconds_per_page = seconds_per_page
+
+    def partition(self, request):
+        content = request.files.content
+        pages = len(PdfReader(io.BytesIO(content)).pages)
+        time.sleep(self.seconds_per_page * pages)
+        first = request.starting_page_number or 1
+        elements = [{"type": "NarrativeText", "text": "", "metadata": {"page_number": first + i}} for i in range(pages)]
+        return type("PartitionResponse", (), {"elements": elements})()
+
+def sequential(parser: DocumentParser, paths: List[str]) -> int:
+    """The previous path: one blocking partition call per document, one document at a time"""
+    elements = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            elements += len(parser._partition(f.read(), os.path.basename(path), "auto"))
+    return elements
+
+async def pooled(parser: DocumentParser, paths: List[str]) -> int:
+    results = await asyncio.gather(*(parser.parse_document(path) for path in paths))
+    return sum(len(result["elements"]) for result in results if result)
+
+def main():
+    parser_args = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser_args.add_argument("files", nargs="*")
+    parser_args.add_argument("--simulate", type=float, metavar="SECONDS_PER_PAGE")
+    parser_args.add_argument("--documents", type=int, default=8)
+    parser_args.add_argument("--pages", type=int, default=40)
+    parser_args.add_argument("--workers", type=int, default=4)
+    parser_args.add_argument("--pages-per-chunk", type=int, default=10)
+    args = parser_args.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = args.files
+        if not paths:
+            paths = [os.path.join(directory, f"document_{i}.pdf") for i in range(args.documents)]
+            for path in paths:
+                write_blank_pdf(path, args.pages)
+        pages = sum(len(PdfReader(path).pages) for path in paths)
+
+        pool = PartitionPool(workers=args.workers, queue_size=len(paths))
+        # The parse cache would turn the repeated generated documents into hits
+        parser = DocumentParser(pool=pool, pages_per_chunk=args.pages_per_chunk, cache=ParseCache(enabled=False))
+        if args.simulate is not None:
+            parser.client.general = SimulatedPartition(args.simulate)
+
+        print(f"Parsing benchmark: {len(paths)} documents, {pages} pages, "
+              f"{args.workers} workers, {args.pages_per_chunk} pages per range"
+              + (f", simulated {args.simulate}s/page" if args.simulate is not None else ""))
+        print(f"{'path':<24}{'seconds':>10}{'pages/s':>10}{'elements':>10}")
+
+        start_time = time.perf_counter()
+        elements = sequential(parser, paths)
+        baseline = time.perf_counter() - start_time
+        print(f"{'one file at a time':<24}{baseline:>10.2f}{pages / baseline:>10.1f}{elements:>10}")
+
+        start_time = time.perf_counter()
+        elements = asyncio.run(pooled(parser, paths))
+        elapsed = time.perf_counter() - start_time
+        print(f"{'partition pool':<24}{elapsed:>10.2f}{pages / elapsed:>10.1f}{elements:>10}")
+        print(f"\nSpeedup: {baseline / elapsed:.1f}x")
+        pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from typing import Dict
+from prometheus_client import make_asgi_app
+from typing import Dict, List, Optional
+import asyncio
 import tempfile
+import hashlib
+import shutil
+import time
 import os
 import logging
-from src.document_parser import DocumentParser
+from src.document_parser import DocumentParser, ParserBusy
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -19,8 +24,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.mount("/metrics", make_asgi_app())
+
 parser = DocumentParser()
 
+# Upload bodies are copied to disk in chunks of this size, never held in memory whole
+STREAM_CHUNK_BYTES = int(os.getenv("STREAM_CHUNK_BYTES", str(1024 * 1024)))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    parser.pool.close()
+
 @app.get("/")
 async def root():
     return {"message": "AOS Document Processing Engine", "status": "operational"}
@@ -29,11 +43,20 @@ async def root():
 async def health_check():
     return {"status": "healthy", "service": "document_engine"}
 
+def _cache_status(parsed_data: Dict) -> str:
+    """RFC 9211 Cache-Status value for a parse result"""
+    status = parsed_data.get("stats", {}).get("cache")
+    if status == "hit":
+        return "document_engine; hit"
+    if status == "miss":
+        return "document_engine; fwd=miss; stored"
+    return "document_engine; fwd=bypass"
+
 @app.post("/parse")
-async def parse_document_endpoint(file: UploadFile = File(...)):
+async def parse_document_endpoint(response: Response, file: UploadFile = File(...)):
     try:
         with tempfile.NamedTemporaryFile(delete=False, suffix=file.filename) as tmp:
-            tmp.write(await file.read())
+            shutil.copyfileobj(file.file, tmp, STREAM_CHUNK_BYTES)
             tmp_path = tmp.name
         
         parsed_data = await parser.parse_document(tmp_path)
@@ -41,7 +64,114 @@ async def parse_document_endpoint(file: UploadFile = File(...)):
         os.unlink(tmp_path)
         
         if parsed_data:
+            response.headers["Cache-Status"] = _cache_status(parsed_data)
             return parsed_data
         raise HTTPException(status_code=400, detail="Failed to parse document.")
+    except ParserBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/parse/stream")
+async def parse_document_stream(request: Request, response: Response, filename: str = "document", strategy: str = "auto"):
+    """
+    Parse a document sent as the raw request body (application/octet-stream).
+
+    The body is written to disk chunk by chunk as it arrives, so memory stays bounded
+    regardless of file size; its size and SHA-256 are computed on the way through and
+    returned under "source".
+    """
+    tmp_path = None
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.basename(filename)) as tmp:
+            tmp_path = tmp.name
+            async for chunk in request.stream():
+                tmp.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty document.")
+        
+        parsed_data = await parser.parse_document(tmp_path, strategy=strategy)
+        
+        if parsed_data:
+            parsed_data["source"] = {"filename": filename, "size_bytes": size, "sha256": digest.hexdigest()}
+            response.headers["Cache-Status"] = _cache_status(parsed_data)
+            return parsed_data
+        raise HTTPException(status_code=400, detail="Failed to parse document.")
+    except HTTPException:
+        raise
+    except ParserBusy as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+async def _parse_spooled(filename: str, tmp_path: str, strategy: str) -> Dict:
+    try:
+        parsed_data = await parser.parse_document(tmp_path, strategy=strategy)
+        if parsed_data:
+            return {"filename": filename, "status": "parsed", **parsed_data}
+        return {"filename": filename, "status": "failed", "error": "Failed to parse document."}
+    except ParserBusy as e:
+        return {"filename": filename, "status": "busy", "error": str(e)}
+    finally:
+        os.unlink(tmp_path)
+
+@app.post("/parse/batch")
+async def parse_documents_batch(files: List[UploadFile] = File(...), strategy: str = "auto"):
+    """
+    Parse several documents concurrently on the shared partition pool.
+
+    Results are returned in upload order, each with its own status; a document that
+    fails does not fail the batch. The batch is refused with 503 up front if it does
+    not fit in the parser queue.
+    """
+    if len(files) > parser.pool.capacity:
+        raise HTTPException(status_code=413, detail=f"At most {parser.pool.capacity} files per batch.")
+    if parser.pool.admitted + len(files) > parser.pool.capacity:
+        raise HTTPException(status_code=503, detail="Parser queue full, retry later.")
+    
+    spooled = []
+    try:
+        for file in files:
+            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.basename(file.filename or "document")) as tmp:
+                shutil.copyfileobj(file.file, tmp, STREAM_CHUNK_BYTES)
+                spooled.append((file.filename, tmp.name))
+    except Exception as e:
+        for _, tmp_path in spooled:
+            os.unlink(tmp_path)
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    start_time = time.perf_counter()
+    results = await asyncio.gather(*(
+        _parse_spooled(filename, tmp_path, strategy) for filename, tmp_path in spooled
+    ))
+    elapsed = time.perf_counter() - start_time
+    pages = sum(result.get("stats", {}).get("pages", 0) for result in results)
+    return {
+        "results": results,
+        "stats": {
+            "documents": len(results),
+            "parsed": sum(1 for result in results if result["status"] == "parsed"),
+            "pages": pages,
+            "seconds": round(elapsed, 3),
+            "pages_per_second": round(pages / elapsed, 2) if elapsed > 0 else None
+        }
+    }
+
+@app.get("/admin/cache")
+async def get_parse_cache_stats():
+    """Parse cache size, hit ratio and evictions"""
+    return parser.cache.stats()
+
+@app.delete("/admin/cache")
+async def purge_parse_cache(sha256: Optional[str] = None):
+    """Delete every cached parse result, or only those for the file with the given SHA-256"""
+    purged = await asyncio.to_thread(parser.cache.purge, sha256.lower() if sha256 else None)
+    return {"purged": purged, **parser.cache.stats()}
@@ -1,44 +1,199 @@
 import os
+import io
+import time
+import hashlib
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional, Tuple
+from pypdf import PdfReader, PdfWriter
 from unstructured_client import UnstructuredClient
 from unstructured_client.models import shared
 from unstructured_client.models.errors import SDKError
+from src.parse_cache import ParseCache
+from src.metrics import (
+    DOCUMENTS_IN_FLIGHT,
+    DOCUMENTS_PARSED,
+    PAGES_PARSED,
+    PARSE_DURATION,
+    PARSE_PAGES_PER_SECOND,
+    PARTITION_DURATION,
+)
+
+# Concurrent partition calls (the calls block on the Unstructured API, so threads suffice)
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "4"))
+# Documents that may wait for a worker before new ones are turned away
+PARSER_QUEUE_SIZE = int(os.getenv("PARSER_QUEUE_SIZE", "16"))
+# PDFs longer than this are partitioned in page ranges of this size; 0 disables splitting
+PARSER_PAGES_PER_CHUNK = int(os.getenv("PARSER_PAGES_PER_CHUNK", "10"))
+
+class ParserBusy(Exception):
+    """Raised when the partition queue is full"""
+
+class PartitionPool:
+    """
+    Thread pool for blocking partition calls, with a bounded number of admitted documents.
+
+    At most `workers` partition calls run at once across all requests (page ranges of one
+    PDF included); at most `workers + queue_size` documents are admitted, and admission
+    beyond that raises ParserBusy instead of queueing without limit.
+    """
+    def __init__(self, workers: int = PARSER_WORKERS, queue_size: int = PARSER_QUEUE_SIZE):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="partition")
+        self.admitted = 0
+
+    @asynccontextmanager
+    async def admit(self, documents: int = 1):
+        if self.admitted + documents > self.capacity:
+            raise ParserBusy(f"Parser queue full ({self.admitted}/{self.capacity} documents admitted)")
+        self.admitted += documents
+        DOCUMENTS_IN_FLIGHT.set(self.admitted)
+        try:
+            yield
+        finally:
+            self.admitted -= documents
+            DOCUMENTS_IN_FLIGHT.set(self.admitted)
+
+    async def run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+def split_pdf(content: bytes, pages_per_chunk: int) -> Tuple[Optional[int], List[Tuple[int, bytes]]]:
+    """Page count and (first page index, PDF bytes) per page range; one range if short enough"""
+    try:
+        reader = PdfReader(io.BytesIO(content))
+        page_count = len(reader.pages)
+    except Exception as e:
+        # Leave PDFs pypdf cannot read to the Unstructured API, unsplit
+        logging.getLogger(__name__).warning(f"Could not read PDF pages, partitioning unsplit: {e}")
+        return None, [(0, content)]
+    if pages_per_chunk <= 0 or page_count <= pages_per_chunk:
+        return page_count, [(0, content)]
+    chunks = []
+    for start in range(0, page_count, pages_per_chunk):
+        writer = PdfWriter()
+        for page in reader.pages[start:start + pages_per_chunk]:
+            writer.add_page(page)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        chunks.append((start, buffer.getvalue()))
+    return page_count, chunks
 
 class DocumentParser:
-    def __init__(self):
+    def __init__(self, pool: Optional[PartitionPool] = None, pages_per_chunk: int = PARSER_PAGES_PER_CHUNK,
+                 cache: Optional[ParseCache] = None):
         server_url = os.getenv("UNSTRUCTURED_API_URL", "http://unstructured_api:8000")
         api_key = os.getenv("UNSTRUCTURED_API_KEY", "")
         self.client = UnstructuredClient(server_url=server_url, api_key_auth=api_key)
+        self.pool = pool or PartitionPool()
+        self.pages_per_chunk = pages_per_chunk
+        self.cache = cache or ParseCache()
         self.logger = logging.getLogger(__name__)
         self.logger.info(f"DocumentParser initialized for local Unstructured API at: {server_url}")
 
+    def _partition(self, content: bytes, file_name: str, strategy: str, starting_page: int = 1) -> List[Any]:
+        """One blocking partition call; runs on a pool thread"""
+        start_time = time.perf_counter()
+        try:
+            files = shared.Files(content=content, file_name=file_name)
+            # Splitting is done here, on the shared pool, not by the client per call
+            req = shared.PartitionParameters(
+                files=files, strategy=strategy, split_pdf_page=False,
+                starting_page_number=starting_page if starting_page > 1 else None
+            )
+            res = self.client.general.partition(req)
+            return res.elements or []
+        finally:
+            PARTITION_DURATION.observe(time.perf_counter() - start_time)
+
     async def parse_document(self, file_path: str, strategy: str = "auto") -> Optional[Dict[str, Any]]:
         self.logger.info(f"Parsing document: {file_path} with strategy: {strategy}")
+        start_time = time.perf_counter()
         try:
             with open(file_path, "rb") as f:
-                files = shared.Files(content=f.read(), file_name=os.path.basename(file_path))
-            
-            req = shared.PartitionParameters(files=files, strategy=strategy)
-            res = self.client.general.partition(req)
-            
-            if res.elements:
-                # Convert elements to a serializable format
-                elements = []
-                for element in res.elements:
-                    if hasattr(element, 'to_dict') and callable(element.to_dict):
+                content = f.read()
+            file_name = os.path.basename(file_path)
+            sha256 = hashlib.sha256(content).hexdigest()
+
+            # Identical bytes parsed with the same strategy give the same elements
+            cached = await asyncio.to_thread(self.cache.get, sha256, strategy)
+            if cached is not None:
+                elapsed = time.perf_counter() - start_time
+                self.logger.info(f"Parse cache hit for {file_path} ({sha256[:12]})")
+                return {
+                    "elements": cached["elements"],
+                    "stats": {
+                        **cached["stats"],
+                        "seconds": round(elapsed, 3),
+                        "cache": "hit",
+                        "sha256": sha256
+                    }
+                }
+
+            async with self.pool.admit():
+                page_count, chunks = None, [(0, content)]
+                if file_name.lower().endswith(".pdf"):
+                    page_count, chunks = await self.pool.run(split_pdf, content, self.pages_per_chunk)
+
+                # Page ranges are partitioned concurrently and stitched back in page order
+                partitioned = await asyncio.gather(*(
+                    self.pool.run(self._partition, chunk, file_name, strategy, first_page + 1)
+                    for first_page, chunk in chunks
+                ))
+
+            # Convert elements to a serializable format
+            elements = []
+            for chunk_elements in partitioned:
+                for element in chunk_elements:
+                    if isinstance(element, dict):
+                        elements.append(element)
+                    elif hasattr(element, 'to_dict') and callable(element.to_dict):
                         elements.append(element.to_dict())
                     elif hasattr(element, '__dict__'):
                         elements.append(element.__dict__)
                     else:
                         elements.append(str(element))
-                return {"elements": elements}
-                
-            return None
-            
+
+            if not elements:
+                DOCUMENTS_PARSED.labels(status="empty").inc()
+                return None
+
+            if page_count is None:
+                page_count = len({
+                    element.get("metadata", {}).get("page_number")
+                    for element in elements if isinstance(element, dict)
+                } - {None}) or 1
+            elapsed = time.perf_counter() - start_time
+            DOCUMENTS_PARSED.labels(status="parsed").inc()
+            PAGES_PARSED.inc(page_count)
+            PARSE_DURATION.observe(elapsed)
+            PARSE_PAGES_PER_SECOND.observe(page_count / elapsed if elapsed > 0 else 0)
+            stats = {"pages": page_count, "page_ranges": len(chunks)}
+            await asyncio.to_thread(self.cache.put, sha256, strategy, {"elements": elements, "stats": stats})
+            return {
+                "elements": elements,
+                "stats": {
+                    **stats,
+                    "seconds": round(elapsed, 3),
+                    "pages_per_second": round(page_count / elapsed, 2) if elapsed > 0 else None,
+                    "cache": "miss" if self.cache.enabled else "bypass",
+                    "sha256": sha256
+                }
+            }
+
+        except ParserBusy:
+            DOCUMENTS_PARSED.labels(status="busy").inc()
+            raise
         except SDKError as e:
             self.logger.error(f"SDKError parsing {file_path}: {e}")
+            DOCUMENTS_PARSED.labels(status="failed").inc()
             return None
         except Exception as e:
             self.logger.error(f"Unexpected error parsing {file_path}: {str(e)}")
+            DOCUMENTS_PARSED.labels(status="failed").inc()
             return None
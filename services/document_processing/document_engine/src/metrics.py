@@ -0,0 +1,46 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+DOCUMENTS_PARSED = Counter(
+    'document_engine_documents_parsed_total',
+    'Documents parsed by result',
+    ['status']
+)
+
+PAGES_PARSED = Counter(
+    'document_engine_pages_parsed_total',
+    'Pages parsed; rate() of this is throughput in pages per second'
+)
+
+PARSE_DURATION = Histogram(
+    'document_engine_parse_duration_seconds',
+    'Wall-clock time to parse one document, including queueing',
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+)
+
+PARSE_PAGES_PER_SECOND = Histogram(
+    'document_engine_parse_pages_per_second',
+    'Per-document parsing throughput in pages per second',
+    buckets=(0.5, 1, 2, 5, 10, 20, 50, 100, 200)
+)
+
+PARTITION_DURATION = Histogram(
+    'document_engine_partition_duration_seconds',
+    'Time of one partition call (a whole document or one page range)',
+    buckets=(0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+)
+
+DOCUMENTS_IN_FLIGHT = Gauge(
+    'document_engine_documents_in_flight',
+    'Documents admitted to the partition pool (running or queued)'
+)
+
+PARSE_CACHE_REQUESTS = Counter(
+    'document_engine_parse_cache_requests_total',
+    'Parse cache lookups by result',
+    ['result']
+)
+
+PARSE_CACHE_BYTES = Gauge(
+    'document_engine_parse_cache_bytes',
+    'Compressed size of the parse cache on disk'
+)
@@ -0,0 +1,157 @@
+import os
+import re
+import gzip
+import json
+import logging
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from src.metrics import PARSE_CACHE_BYTES, PARSE_CACHE_REQUESTS
+
+PARSE_CACHE_ENABLED = os.getenv("PARSE_CACHE_ENABLED", "true").lower() == "true"
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR", os.path.join(tempfile.gettempdir(), "document_engine_parse_cache"))
+PARSE_CACHE_MAX_BYTES = int(os.getenv("PARSE_CACHE_MAX_BYTES", str(1024 * 1024 * 1024)))
+
+# Strategies are short identifiers; anything else is not cached rather than used in a file name
+_STRATEGY = re.compile(r"^[a-z_]{1,32}$")
+_ENTRY = re.compile(r"^([0-9a-f]{64})\.([a-z_]{1,32})\.json\.gz$")
+
+class ParseCache:
+    """
+    Parse results on local disk, keyed by SHA-256 of the file bytes plus the strategy.
+
+    Each entry is one gzip-compressed JSON file. An in-memory index, rebuilt from the
+    directory at start-up in modification-time order, tracks entry sizes in LRU order;
+    once the total exceeds max_bytes the least recently used entries are deleted.
+    Reads touch the file so the order survives restarts. Cache errors are logged and
+    treated as misses.
+    """
+    def __init__(self, directory: str = PARSE_CACHE_DIR, max_bytes: int = PARSE_CACHE_MAX_BYTES,
+                 enabled: bool = PARSE_CACHE_ENABLED):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.enabled:
+            os.makedirs(self.directory, exist_ok=True)
+            self._load_index()
+
+    def _load_index(self):
+        found = []
+        for name in os.listdir(self.directory):
+            if _ENTRY.match(name):
+                stat = os.stat(os.path.join(self.directory, name))
+                found.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(found):
+            self._entries[name] = size
+            self.total_bytes += size
+        PARSE_CACHE_BYTES.set(self.total_bytes)
+
+    @staticmethod
+    def key(sha256: str, strategy: str) -> Optional[str]:
+        if not _STRATEGY.match(strategy):
+            return None
+        return f"{sha256}.{strategy}.json.gz"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, sha256: str, strategy: str) -> Optional[Dict[str, Any]]:
+        key = self.key(sha256, strategy)
+        if not self.enabled or key is None:
+            return None
+        with self._lock:
+            present = key in self._entries
+            if present:
+                self._entries.move_to_end(key)
+        if not present:
+            self.misses += 1
+            PARSE_CACHE_REQUESTS.labels(result="miss").inc()
+            return None
+        try:
+            with gzip.open(self._path(key), "rt", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(self._path(key))
+        except Exception as e:
+            self.logger.warning(f"Parse cache read failed for {key}, treating as miss: {e}")
+            self._remove(key)
+            self.misses += 1
+            PARSE_CACHE_REQUESTS.labels(result="error").inc()
+            return None
+        self.hits += 1
+        PARSE_CACHE_REQUESTS.labels(result="hit").inc()
+        return result
+
+    def put(self, sha256: str, strategy: str, result: Dict[str, Any]):
+        key = self.key(sha256, strategy)
+        if not self.enabled or key is None:
+            return
+        try:
+            # Write to a temp file in the same directory, then rename, so readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) as f:
+                f.write(json.dumps(result, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8"))
+            size = os.path.getsize(tmp_path)
+            if size > self.max_bytes:
+                os.unlink(tmp_path)
+                return
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            self.logger.warning(f"Parse cache write failed for {key}: {e}")
+            if "tmp_path" in locals() and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+        with self._lock:
+            self.total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            evicted = []
+            while self.total_bytes > self.max_bytes and self._entries:
+                old_key, old_size = self._entries.popitem(last=False)
+                self.total_bytes -= old_size
+                evicted.append(old_key)
+            PARSE_CACHE_BYTES.set(self.total_bytes)
+        for old_key in evicted:
+            self._unlink(old_key)
+        self.evictions += len(evicted)
+
+    def _unlink(self, key: str):
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _remove(self, key: str) -> bool:
+        with self._lock:
+            size = self._entries.pop(key, None)
+            if size is not None:
+                self.total_bytes -= size
+                PARSE_CACHE_BYTES.set(self.total_bytes)
+        self._unlink(key)
+        return size is not None
+
+    def purge(self, sha256: Optional[str] = None) -> int:
+        """Delete every entry, or only the entries for one file; returns how many were deleted"""
+        with self._lock:
+            keys = [key for key in self._entries if sha256 is None or key.startswith(f"{sha256}.")]
+        return sum(1 for key in keys if self._remove(key))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions
+        }
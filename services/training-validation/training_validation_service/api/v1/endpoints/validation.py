@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, Body
+from fastapi import APIRouter, Depends, HTTPException, Body, Query
 from typing import Dict, Any
 from ....services.validation_service import ValidationService, validation_service
+from ....services.llm_cache import CachePolicy
 from ....schemas.unit_schema import Unit
 from ....schemas.document_schema import DocumentProcessingResult
 
@@ -14,6 +15,7 @@ router = APIRouter()
 async def run_validation(
     unit_data: Unit = Body(..., description="The scraped and parsed data for the training unit."),
     document_data: DocumentProcessingResult = Body(..., description="The processed document content."),
+    cache_policy: CachePolicy = Query(CachePolicy.USE, description="LLM response cache policy: use, refresh or bypass."),
     val_service: ValidationService = Depends(lambda: validation_service)
 ) -> Dict[str, Any]:
     """
@@ -23,7 +25,8 @@ async def run_validation(
     try:
         results = val_service.validate_document(
             unit_data=unit_data,
-            document_elements=document_data.elements
+            document_elements=document_data.elements,
+            cache_policy=cache_policy
         )
         return results
     except Exception as e:
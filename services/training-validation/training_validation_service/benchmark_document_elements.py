@@ -0,0 +1,90 @@
+"""
+Payload and memory benchmark: full element metadata vs. the compact element store.
+
+Builds Unstructured-style elements for a session of large documents (coordinates,
+languages, parent ids and the rest of the per-element metadata the parser returns)
+and compares what the validation job loads per document:
+
+- metadata: the previous path. validation_documents.metadata holds the whole
+  processed document JSON, which the job fetches and json.loads.
+- columns: validation_document_elements.element_columns, the packed element types,
+  pages and text offsets, which the job unpacks. The text comes from
+  content_extracted in both cases and is not counted.
+
+Bytes are what the query returns for the column; peak Python heap (tracemalloc)
+and wall time cover decoding every document of the session.
+
+    python benchmark_document_elements.py [documents] [pages]
+"""
+import json
+import random
+import sys
+import time
+import tracemalloc
+
+from integrations.document_processing_client import DocumentProcessingClient
+from models.document_elements import DocumentElements
+
+ELEMENT_TYPES = ("Title", "NarrativeText", "ListItem", "NarrativeText", "Table", "Header", "Footer")
+WORDS = ("assessment", "learner", "evidence", "workplace", "safety", "procedure", "report",
+         "supervisor", "task", "observe", "record", "complete", "criteria", "the", "and", "of")
+
+def make_elements(pages: int, per_page: int = 25):
+    random.seed(pages)
+    elements = []
+    for page in range(1, pages + 1):
+        for i in range(per_page):
+            text = " ".join(random.choice(WORDS) for _ in range(random.randint(4, 40))) + "."
+            y = 60 + i * 28
+            elements.append({
+                "type": random.choice(ELEMENT_TYPES),
+                "element_id": f"{random.getrandbits(128):032x}",
+                "text": text,
+                "metadata": {
+                    "coordinates": {
+                        "points": [[72.0, y], [72.0, y + 24.0], [540.0, y + 24.0], [540.0, y]],
+                        "system": "PixelSpace", "layout_width": 1700, "layout_height": 2200
+                    },
+                    "filetype": "application/pdf",
+                    "languages": ["eng"],
+                    "page_number": page,
+                    "parent_id": f"{random.getrandbits(128):032x}",
+                    "filename": "assessment_tool.pdf",
+                    "detection_class_prob": round(random.random(), 4)
+                }
+            })
+    return elements
+
+def measure(func, blobs):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    decoded = [func(blob) for blob in blobs]
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return decoded, peak, elapsed
+
+def main():
+    documents = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    pages = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    client = DocumentProcessingClient("http://document_engine:8031")
+    metadata_blobs, column_blobs = [], []
+    for document in range(documents):
+        processed = client._extract_training_content({"elements": make_elements(pages + document)})
+        columns, content = DocumentElements.from_elements(processed["elements"])
+        if content != processed["text_content"]:
+            print("❌ Element store text differs from text_content")
+        metadata_blobs.append(json.dumps(processed))
+        column_blobs.append(columns.pack())
+
+    print(f"Document element loading benchmark: {documents} documents, ~{pages} pages each")
+    print(f"{'path':<12}{'query MB':>12}{'peak MB':>12}{'seconds':>10}")
+    for name, func, blobs in (("metadata", json.loads, metadata_blobs),
+                              ("columns", DocumentElements.unpack, column_blobs)):
+        payload = sum(len(blob) for blob in blobs)
+        _, peak, elapsed = measure(func, blobs)
+        print(f"{name:<12}{payload / 1024 / 1024:>12.2f}{peak / 1024 / 1024:>12.2f}{elapsed:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Memory benchmark: buffered vs. streaming document upload.
+
+Generates a large document on disk (100 MB by default) and pushes it through both
+upload paths as an UploadFile, the way FastAPI hands it to the endpoint:
+
+- buffered: the previous path. The endpoint reads the upload into memory and writes
+  a temp file, the client reads the temp file back and posts it as multipart, and
+  the document engine reads the whole part before writing its own temp file.
+- streaming: DigestingStream pipes the upload in chunks into an httpx request body
+  (sizing and hashing it on the way), and the engine writes each chunk to disk as
+  it arrives.
+
+Both request bodies are built by httpx and consumed chunk by chunk as a transport
+would, without a network. Peak Python heap (tracemalloc) and wall time are reported.
+
+    python benchmark_document_upload.py [megabytes]
+"""
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import aiofiles
+import httpx
+from fastapi import UploadFile
+
+from integrations.document_processing_client import DigestingStream
+
+ENGINE_URL = "http://document_engine:8031"
+
+def write_document(path: str, megabytes: int):
+    with open(path, "wb") as f:
+        for _ in range(megabytes):
+            f.write(os.urandom(1024 * 1024))
+
+def upload_file(path: str) -> UploadFile:
+    return UploadFile(file=open(path, "rb"), filename=os.path.basename(path))
+
+async def buffered_upload(path: str) -> str:
+    upload = upload_file(path)
+    # Endpoint: read the whole upload, then write it to a temp file
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        content = await upload.read()
+        tmp.write(content)
+        tmp_path = tmp.name
+    # Client: read the temp file back and post it as a multipart file
+    async with aiofiles.open(tmp_path, "rb") as file:
+        file_content = await file.read()
+    request = httpx.Request("POST", f"{ENGINE_URL}/parse",
+                            files={"file": (upload.filename, file_content, "application/octet-stream")})
+    received = bytearray()
+    async for chunk in request.stream:
+        received.extend(chunk)
+    # Engine: read the whole part, then write its own temp file
+    with tempfile.NamedTemporaryFile(delete=False) as engine_tmp:
+        engine_tmp.write(bytes(received))
+        engine_path = engine_tmp.name
+    digest = hashlib.sha256(content).hexdigest()
+    os.unlink(tmp_path)
+    os.unlink(engine_path)
+    await upload.close()
+    return digest
+
+async def streaming_upload(path: str) -> str:
+    upload = upload_file(path)
+    stream = DigestingStream(upload)
+    request = httpx.Request("POST", f"{ENGINE_URL}/parse/stream", params={"filename": upload.filename},
+                            content=stream, headers={"Content-Type": "application/octet-stream"})
+    # Engine: write each chunk to disk as it arrives
+    with tempfile.NamedTemporaryFile(delete=False) as engine_tmp:
+        async for chunk in request.stream:
+            engine_tmp.write(chunk)
+        engine_path = engine_tmp.name
+    os.unlink(engine_path)
+    await upload.close()
+    return stream.sha256
+
+def measure(func, path: str):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    digest = asyncio.run(func(path))
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return digest, peak, elapsed
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "benchmark.pdf")
+        write_document(path, megabytes)
+
+        print(f"Document upload memory benchmark: {megabytes} MB file")
+        print(f"{'path':<12}{'peak MB':>12}{'seconds':>10}")
+        digests = set()
+        for name, func in (("buffered", buffered_upload), ("streaming", streaming_upload)):
+            digest, peak, elapsed = measure(func, path)
+            digests.add(digest)
+            print(f"{name:<12}{peak / 1024 / 1024:>12.1f}{elapsed:>10.2f}")
+
+        if len(digests) != 1:
+            print("❌ SHA-256 differs between the two paths")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Micro-benchmark: per-keyword counting vs. the single-pass KeywordMatcher.
+
+Builds a ~200 page training document and times, for each rule-based validator's
+keyword set, the previous approach (lower-case the text and call str.count once
+per keyword) against one KeywordMatcher scan, checking both give identical counts.
+It also times the whole Foundation Skills coverage analysis, which previously
+re-split the document into sentences for every keyword hit.
+
+    python benchmark_keyword_matching.py [pages] [repeats]
+"""
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+from validation_engines import (
+    AssessmentConditionsValidator,
+    FoundationSkillsValidator,
+    KnowledgeEvidenceValidator,
+    PerformanceEvidenceValidator,
+    analyse_documents,
+)
+
+WORDS_PER_PAGE = 500
+
+FILLER = (
+    "the learner will complete each task in accordance with workplace procedures and "
+    "record the outcome in the logbook provided by the training organisation before "
+    "submitting it for review at the end of the scheduled session"
+).split()
+
+def build_document(keywords, pages: int, seed: int = 42) -> str:
+    """Mostly filler prose with keywords sprinkled in at a realistic density"""
+    rng = random.Random(seed)
+    sentences = []
+    for _ in range(pages * WORDS_PER_PAGE // 20):
+        words = [rng.choice(FILLER) for _ in range(18)]
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+        sentence = " ".join(words)
+        sentences.append(sentence[0].upper() + sentence[1:] + ".")
+    return " ".join(sentences)
+
+def naive_counts(matcher, content: str):
+    counts = {}
+    for keywords in matcher.categories.values():
+        for keyword in keywords:
+            counts[keyword] = content.lower().count(keyword)
+    return counts
+
+def matcher_counts(matcher, content: str):
+    scan = matcher.scan(content)
+    return {keyword: scan.count(keyword) for keywords in matcher.categories.values() for keyword in keywords}
+
+def legacy_foundation_skills_coverage(categories, documents):
+    """The Foundation Skills coverage loop as it was before the shared matcher"""
+    coverage = {}
+    for category, keywords in categories.items():
+        total_matches, found_keywords, supporting_content = 0, set(), []
+        for doc in documents:
+            content = doc.get("content_extracted", "").lower()
+            for keyword in keywords:
+                matches = content.count(keyword)
+                if matches > 0:
+                    total_matches += matches
+                    found_keywords.add(keyword)
+                    for sentence in content.split('.'):
+                        if keyword in sentence and len(sentence.strip()) > 20:
+                            supporting_content.append(sentence.strip()[:200])
+                            if len(supporting_content) >= 3:
+                                break
+        assessment_integration = False
+        for doc in documents:
+            content = doc.get("content_extracted", "").lower()
+            for keyword in keywords:
+                for assess_keyword in ["assess", "evaluate", "test", "measure", "demonstrate"]:
+                    if keyword in content and assess_keyword in content:
+                        assessment_integration = True
+                        break
+        coverage[category] = (total_matches, found_keywords, supporting_content[:3], assessment_integration)
+    return coverage
+
+def time_call(func, repeats: int, setup=None) -> float:
+    """Median time of func(); with setup, func(setup()) and only func is timed"""
+    samples = []
+    for _ in range(repeats):
+        args = (setup(),) if setup else ()
+        start_time = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start_time)
+    return statistics.median(samples)
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    validators = [
+        AssessmentConditionsValidator,
+        FoundationSkillsValidator,
+        KnowledgeEvidenceValidator,
+        PerformanceEvidenceValidator,
+    ]
+
+    print(f"Keyword matching benchmark: {pages} pages, median of {repeats} runs")
+    print(f"{'validator':<32}{'keywords':>10}{'naive ms':>12}{'matcher ms':>12}{'speedup':>10}")
+    for validator in validators:
+        matcher = validator.KEYWORD_MATCHER
+        keywords = sorted({k for group in matcher.categories.values() for k in group})
+        content = build_document(keywords, pages)
+
+        if naive_counts(matcher, content) != matcher_counts(matcher, content):
+            print(f"❌ {validator.__name__}: matcher counts differ from str.count")
+            continue
+
+        naive = time_call(lambda: naive_counts(matcher, content), repeats)
+        single_pass = time_call(lambda: matcher.scan(content), repeats)
+        print(f"{validator.__name__:<32}{len(keywords):>10}{naive * 1000:>12.1f}"
+              f"{single_pass * 1000:>12.1f}{naive / single_pass:>9.1f}x")
+
+    validator = FoundationSkillsValidator()
+    matcher = validator.KEYWORD_MATCHER
+    content = build_document(sorted({k for group in matcher.categories.values() for k in group}), pages)
+    documents = [{"filename": "benchmark.pdf", "content_extracted": content}]
+    legacy = time_call(lambda: legacy_foundation_skills_coverage(validator.foundation_skills_categories, documents), repeats)
+    # The shared DocumentAnalysis is built once per request for all validators, so it is timed separately
+    analysis = time_call(lambda: analyse_documents(documents), repeats)
+    current = time_call(
+        lambda analyses: asyncio.run(validator._analyze_foundation_skills_coverage([], analyses)),
+        repeats, setup=lambda: analyse_documents(documents)
+    )
+    print(f"\nFoundation Skills coverage analysis: {legacy * 1000:.1f} ms -> {current * 1000:.1f} ms "
+          f"({legacy / current:.1f}x), plus {analysis * 1000:.1f} ms shared document analysis per request")
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,50 @@
+import os
+import hashlib
 import httpx
 import logging
-from typing import Dict, Any, Optional
+from typing import AsyncIterator, Awaitable, Dict, Any, Optional, Protocol
 import aiofiles
 
 logger = logging.getLogger(__name__)
 
+# Uploads are piped to the document engine in chunks of this size
+DOCUMENT_UPLOAD_CHUNK_BYTES = int(os.getenv("DOCUMENT_UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+
+class AsyncReadable(Protocol):
+    def read(self, size: int = -1) -> Awaitable[bytes]: ...
+
+class DigestingStream:
+    """
+    Async iterator over a readable's chunks that counts and hashes them on the way through.
+    
+    Wraps an UploadFile (or any object with an async read) so the upload can be streamed
+    to the document engine without being held in memory; size and sha256 are final once
+    the stream has been consumed.
+    """
+    def __init__(self, source: AsyncReadable, chunk_size: int = DOCUMENT_UPLOAD_CHUNK_BYTES):
+        self.source = source
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._digest = hashlib.sha256()
+    
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        while True:
+            chunk = await self.source.read(self.chunk_size)
+            if not chunk:
+                break
+            self.size += len(chunk)
+            self._digest.update(chunk)
+            yield chunk
+    
+    async def drain(self):
+        """Consume the rest of the stream, e.g. to size and hash an upload that is not parsed"""
+        async for _ in self:
+            pass
+    
+    @property
+    def sha256(self) -> str:
+        return self._digest.hexdigest()
+
 class DocumentProcessingClient:
     def __init__(self, base_url: str):
         self.base_url = base_url.rstrip('/')
@@ -13,23 +53,42 @@ class DocumentProcessingClient:
         """Process a document using the Document Processing Engine"""
         try:
             async with aiofiles.open(file_path, 'rb') as file:
-                file_content = await file.read()
-                
-            files = {"file": (filename, file_content, "application/octet-stream")}
-            
+                return await self.process_stream(DigestingStream(file), filename)
+        
+        except Exception as e:
+            logger.error(f"Error processing document {filename}: {e}")
+            return None
+    
+    async def process_stream(self, stream: DigestingStream, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Process a document by streaming its bytes to the Document Processing Engine.
+        
+        The body is sent with chunked transfer encoding as it is read, so neither side holds
+        the whole file in memory. The stream's size and SHA-256 are recorded in the metadata.
+        """
+        try:
             async with httpx.AsyncClient(timeout=60.0) as client:
                 response = await client.post(
-                    f"{self.base_url}/parse",
-                    files=files
+                    f"{self.base_url}/parse/stream",
+                    params={"filename": filename},
+                    content=stream,
+                    headers={"Content-Type": "application/octet-stream"}
                 )
                 
                 if response.status_code == 200:
                     parsed_data = response.json()
-                    return self._extract_training_content(parsed_data)
+                    processed = self._extract_training_content(parsed_data)
+                    processed["metadata"]["file_size_bytes"] = stream.size
+                    processed["metadata"]["sha256"] = stream.sha256
+                    source = parsed_data.get("source") or {}
+                    if source.get("sha256") and source["sha256"] != stream.sha256:
+                        logger.warning(f"Document engine received different bytes for {filename}: "
+                                       f"sent {stream.sha256}, parsed {source['sha256']}")
+                    return processed
                 else:
                     logger.error(f"Failed to process document {filename}: {response.status_code}")
                     return None
-                    
+        
         except Exception as e:
             logger.error(f"Error processing document {filename}: {e}")
             return None
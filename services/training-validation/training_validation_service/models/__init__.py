@@ -1,3 +1,4 @@
+from .document_elements import DocumentElements
 from .validation_models import (
     ValidationType,
     ValidationStatus,
@@ -17,5 +18,6 @@ __all__ = [
     "TrainingUnit",
     "ValidationDocument",
     "ValidationRequest",
-    "ValidationResponse"
+    "ValidationResponse",
+    "DocumentElements"
 ]
@@ -0,0 +1,124 @@
+import sys
+import zlib
+import struct
+from array import array
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Packed layout version; bump when the layout below changes
+DOCUMENT_ELEMENTS_FORMAT = 1
+
+# format, element count, type name count, type name table bytes
+_HEADER = struct.Struct("<BIII")
+# Column typecodes, in packed order: type ids, page numbers, text start and end offsets
+_COLUMNS = ("types", "pages", "starts", "ends")
+_TYPECODES = ("H", "I", "I", "I")
+
+class DocumentElements:
+    """
+    Type, page and text span of every element of one parsed document, stored as columns.
+
+    Element i has type type_names[types[i]], is on page pages[i] (0 when the parser gave
+    no page) and its text is content_extracted[starts[i]:ends[i]], so the text itself is
+    not stored twice. pack() gives a compressed blob of a few bytes per element, which
+    validation loads instead of the full Unstructured element JSON.
+    """
+    __slots__ = ("type_names", "types", "pages", "starts", "ends")
+
+    def __init__(self, type_names: Tuple[str, ...], types: array, pages: array, starts: array, ends: array):
+        self.type_names = type_names
+        self.types = types
+        self.pages = pages
+        self.starts = starts
+        self.ends = ends
+
+    @classmethod
+    def from_elements(cls, elements: Iterable[Any]) -> Tuple["DocumentElements", str]:
+        """Columns for the elements and the text they index: element texts joined by newlines, stripped"""
+        names: Dict[str, int] = {}
+        types, pages = array("H"), array("I")
+        starts: List[int] = []
+        texts: List[str] = []
+        position = 0
+        for element in elements:
+            if isinstance(element, dict):
+                text = element.get("text") or ""
+                element_type = element.get("type") or ""
+                page = (element.get("metadata") or {}).get("page_number")
+            else:
+                text, element_type, page = str(element), "", None
+            types.append(names.setdefault(element_type, len(names)))
+            pages.append(page if isinstance(page, int) and page > 0 else 0)
+            starts.append(position)
+            texts.append(text)
+            position += len(text) + 1
+
+        joined = "\n".join(texts)
+        content = joined.strip()
+        # Offsets are shifted by the stripped leading whitespace and clamped to the stripped text
+        lead, limit = len(joined) - len(joined.lstrip()), len(content)
+        start_column, end_column = array("I"), array("I")
+        for start, text in zip(starts, texts):
+            start_column.append(min(max(start - lead, 0), limit))
+            end_column.append(min(max(start + len(text) - lead, 0), limit))
+        return cls(tuple(names), types, pages, start_column, end_column), content
+
+    def pack(self) -> bytes:
+        table = "\x00".join(self.type_names).encode("utf-8")
+        parts = [_HEADER.pack(DOCUMENT_ELEMENTS_FORMAT, len(self), len(self.type_names), len(table)), table]
+        for name in _COLUMNS:
+            column = getattr(self, name)
+            if sys.byteorder == "big":
+                column = array(column.typecode, column)
+                column.byteswap()
+            parts.append(column.tobytes())
+        return zlib.compress(b"".join(parts), 6)
+
+    @classmethod
+    def unpack(cls, blob: bytes) -> "DocumentElements":
+        body = zlib.decompress(blob)
+        version, count, name_count, table_size = _HEADER.unpack_from(body)
+        if version != DOCUMENT_ELEMENTS_FORMAT:
+            raise ValueError(f"Unsupported document elements format {version}")
+        offset = _HEADER.size
+        table = body[offset:offset + table_size].decode("utf-8")
+        offset += table_size
+        columns = []
+        for typecode in _TYPECODES:
+            column = array(typecode)
+            size = count * column.itemsize
+            column.frombytes(body[offset:offset + size])
+            if sys.byteorder == "big":
+                column.byteswap()
+            columns.append(column)
+            offset += size
+        return cls(tuple(table.split("\x00")) if name_count else (), *columns)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def element_type(self, index: int) -> str:
+        return self.type_names[self.types[index]]
+
+    def page_at(self, offset: int) -> Optional[int]:
+        """Page of the element whose text contains the offset into content_extracted"""
+        index = bisect_right(self.starts, offset) - 1
+        if index < 0:
+            return None
+        return self.pages[index] or None
+
+    @property
+    def page_numbers(self) -> List[int]:
+        return sorted(set(self.pages) - {0})
+
+    def page_spans(self) -> List[Tuple[int, int, int]]:
+        """(page, start, end) text spans of consecutive elements on the same page, in document order"""
+        spans: List[Tuple[int, int, int]] = []
+        for page, start, end in zip(self.pages, self.starts, self.ends):
+            if not page:
+                continue
+            if spans and spans[-1][0] == page:
+                spans[-1] = (page, spans[-1][1], end)
+            else:
+                spans.append((page, start, end))
+        return spans
@@ -2,6 +2,7 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from enum import Enum, auto
+from .document_elements import DocumentElements
 
 class ValidationType(str, Enum):
     ASSESSMENT_CONDITIONS = "assessment_conditions"
@@ -22,6 +23,11 @@ class ValidationResult:
     details: Dict[str, Any]
     recommendations: List[str] = field(default_factory=list)
     error: Optional[str] = None
+    # Executor, wall and CPU seconds for the validator run
+    timing: Dict[str, Any] = field(default_factory=dict)
+    # Fingerprint of the engine's inputs; reused is True when the stored result was returned
+    fingerprint: Optional[str] = None
+    reused: bool = False
 
 @dataclass
 class ValidationSummary:
@@ -46,6 +52,8 @@ class ValidationDocument:
     filename: str
     content_extracted: str
     metadata: Dict[str, Any]
+    # Element types and pages by offset into content_extracted, when stored at upload
+    elements: Optional[DocumentElements] = None
 
 @dataclass
 class ValidationRequest:
@@ -61,3 +69,5 @@ class ValidationResponse:
     recommendations: List[str]
     summary: ValidationSummary
     strictness_level: str
+    # Validation types whose stored results were reused, and those recomputed
+    reuse: Dict[str, List[str]] = field(default_factory=dict)
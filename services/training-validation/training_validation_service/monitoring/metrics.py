@@ -33,6 +33,74 @@ DOCUMENTS_PROCESSED = Counter(
     ['status']
 )
 
+LLM_REQUEST_DURATION = Histogram(
+    'training_validation_llm_request_duration_seconds',
+    'Duration of LLM completion requests in seconds',
+    ['model', 'status'],
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+)
+
+LLM_REQUESTS_IN_FLIGHT = Gauge(
+    'training_validation_llm_requests_in_flight',
+    'LLM completion requests currently in flight',
+    ['model']
+)
+
+LLM_CACHE_REQUESTS = Counter(
+    'training_validation_llm_cache_requests_total',
+    'LLM response cache lookups by result',
+    ['result']
+)
+
+VALIDATOR_WALL_SECONDS = Histogram(
+    'training_validation_validator_wall_seconds',
+    'Wall-clock time of a rule-based validator run',
+    ['validator', 'executor'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+VALIDATOR_CPU_SECONDS = Histogram(
+    'training_validation_validator_cpu_seconds',
+    'CPU time of a rule-based validator run',
+    ['validator', 'executor'],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+VALIDATION_JOBS = Counter(
+    'training_validation_jobs_total',
+    'Validation job state transitions',
+    ['status']
+)
+
+VALIDATION_JOBS_RUNNING = Gauge(
+    'training_validation_jobs_running',
+    'Validation jobs currently running on this replica'
+)
+
+VALIDATION_JOB_DURATION = Histogram(
+    'training_validation_job_duration_seconds',
+    'Duration of one validation job attempt in seconds',
+    ['status'],
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600, 1200, 1800)
+)
+
+VALIDATION_RESULT_REUSE = Counter(
+    'training_validation_engine_result_reuse_total',
+    'Per-engine stored result lookups by result',
+    ['result']
+)
+
+SERVICE_TIME_TO_READY = Gauge(
+    'training_validation_time_to_ready_seconds',
+    'Seconds from process start-up to the end of the warm-up phase'
+)
+
+SERVICE_WARMUP_STEP_SECONDS = Gauge(
+    'training_validation_warmup_step_seconds',
+    'Duration of each warm-up step at start-up',
+    ['step']
+)
+
 def setup_metrics(app):
     """
     Configure Prometheus metrics collection for the FastAPI application.
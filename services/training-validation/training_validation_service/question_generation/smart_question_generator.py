@@ -1,20 +1,19 @@
 import logging
 from typing import Dict, Any, List, Optional
 import json
-from openai import OpenAI
 import os
 from datetime import datetime
 
+from services.llm_cache import CachePolicy, LLMResponseCache, llm_response_cache, make_cache_key
+
 logger = logging.getLogger(__name__)
 
 class SMARTQuestionGenerator:
     """Generates SMART questions based on validation findings and training unit requirements"""
     
-    def __init__(self):
-        self.client = OpenAI(
-            base_url="https://openrouter.ai/api/v1",
-            api_key=os.getenv("OPENROUTER_API_KEY"),
-        )
+    def __init__(self, cache: Optional[LLMResponseCache] = None):
+        self.cache = cache or llm_response_cache
+        self._client = None
         self.default_model = os.getenv("OPENROUTER_MODEL", "openai/gpt-4o")
         self.question_types = [
             "open_ended",
@@ -25,11 +24,23 @@ class SMARTQuestionGenerator:
             "problem_solving"
         ]
     
+    @property
+    def client(self):
+        """OpenRouter client, created (and openai imported) on first use"""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(
+                base_url="https://openrouter.ai/api/v1",
+                api_key=os.getenv("OPENROUTER_API_KEY"),
+            )
+        return self._client
+    
     async def generate_questions_from_validation(
         self, 
         validation_results: Dict[str, Any], 
         training_unit: Dict[str, Any],
-        question_count: int = 10
+        question_count: int = 10,
+        cache_policy: CachePolicy = CachePolicy.USE
     ) -> Dict[str, Any]:
         """Generate SMART questions based on validation results and training unit"""
         logger.info(f"Generating {question_count} SMART questions for unit {training_unit.get('unit_code')}")
@@ -43,17 +54,17 @@ class SMARTQuestionGenerator:
             questions = []
             
             pc_questions = await self._generate_performance_criteria_questions(
-                performance_criteria, unit_context, question_count // 3
+                performance_criteria, unit_context, question_count // 3, cache_policy
             )
             questions.extend(pc_questions)
             
             ke_questions = await self._generate_knowledge_evidence_questions(
-                knowledge_evidence, unit_context, question_count // 3
+                knowledge_evidence, unit_context, question_count // 3, cache_policy
             )
             questions.extend(ke_questions)
             
             gap_questions = await self._generate_gap_based_questions(
-                validation_gaps, unit_context, question_count // 3
+                validation_gaps, unit_context, question_count // 3, cache_policy
             )
             questions.extend(gap_questions)
             
@@ -112,7 +123,8 @@ class SMARTQuestionGenerator:
         self, 
         performance_criteria: List[Dict], 
         unit_context: Dict[str, Any], 
-        count: int
+        count: int,
+        cache_policy: CachePolicy = CachePolicy.USE
     ) -> List[Dict[str, Any]]:
         """Generate questions based on performance criteria"""
         if not performance_criteria or count <= 0:
@@ -121,17 +133,11 @@ class SMARTQuestionGenerator:
         try:
             prompt = self._build_performance_criteria_prompt(performance_criteria, unit_context, count)
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert training assessment designer specializing in creating SMART questions for vocational education."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
+            questions_text = await self._complete(
+                "You are an expert training assessment designer specializing in creating SMART questions for vocational education.",
+                prompt,
+                cache_policy
             )
-            
-            questions_text = response.choices[0].message.content
             questions = self._parse_generated_questions(questions_text, "performance_criteria")
             
             return questions[:count]
@@ -144,7 +150,8 @@ class SMARTQuestionGenerator:
         self, 
         knowledge_evidence: List[Dict], 
         unit_context: Dict[str, Any], 
-        count: int
+        count: int,
+        cache_policy: CachePolicy = CachePolicy.USE
     ) -> List[Dict[str, Any]]:
         """Generate questions based on knowledge evidence requirements"""
         if not knowledge_evidence or count <= 0:
@@ -153,17 +160,11 @@ class SMARTQuestionGenerator:
         try:
             prompt = self._build_knowledge_evidence_prompt(knowledge_evidence, unit_context, count)
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert training assessment designer specializing in knowledge-based questions for vocational education."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
+            questions_text = await self._complete(
+                "You are an expert training assessment designer specializing in knowledge-based questions for vocational education.",
+                prompt,
+                cache_policy
             )
-            
-            questions_text = response.choices[0].message.content
             questions = self._parse_generated_questions(questions_text, "knowledge_evidence")
             
             return questions[:count]
@@ -176,7 +177,8 @@ class SMARTQuestionGenerator:
         self, 
         validation_gaps: List[Dict], 
         unit_context: Dict[str, Any], 
-        count: int
+        count: int,
+        cache_policy: CachePolicy = CachePolicy.USE
     ) -> List[Dict[str, Any]]:
         """Generate questions to address validation gaps"""
         if not validation_gaps or count <= 0:
@@ -185,17 +187,11 @@ class SMARTQuestionGenerator:
         try:
             prompt = self._build_gap_based_prompt(validation_gaps, unit_context, count)
             
-            response = self.client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are an expert training assessment designer specializing in addressing training material gaps through targeted questions."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=2000
+            questions_text = await self._complete(
+                "You are an expert training assessment designer specializing in addressing training material gaps through targeted questions.",
+                prompt,
+                cache_policy
             )
-            
-            questions_text = response.choices[0].message.content
             questions = self._parse_generated_questions(questions_text, "gap_based")
             
             return questions[:count]
@@ -204,6 +200,27 @@ class SMARTQuestionGenerator:
             logger.error(f"Error generating gap-based questions: {str(e)}")
             return []
     
+    async def _complete(self, system_prompt: str, prompt: str, cache_policy: CachePolicy) -> str:
+        """Run a question generation completion, reusing a cached response when the policy allows"""
+        cache_key = make_cache_key("gpt-4", system_prompt, prompt, temperature=0.7, max_tokens=2000)
+        cached = await self.cache.get(cache_key, cache_policy)
+        if cached is not None:
+            return cached["content"]
+        
+        response = self.client.chat.completions.create(
+            model="gpt-4",
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=0.7,
+            max_tokens=2000
+        )
+        
+        questions_text = response.choices[0].message.content
+        await self.cache.put(cache_key, "gpt-4", {"content": questions_text}, cache_policy)
+        return questions_text
+    
     def _build_performance_criteria_prompt(
         self, 
         performance_criteria: List[Dict], 
@@ -2,7 +2,6 @@ import logging
 from typing import Dict, Any, List, Optional
 import json
 from datetime import datetime
-from jinja2 import Template
 import os
 
 logger = logging.getLogger(__name__)
@@ -16,6 +15,15 @@ class ReportGenerator:
             "html": self._get_html_template(),
             "summary": self._get_summary_template()
         }
+        self._compiled_templates: Dict[str, Any] = {}
+    
+    def _template(self, name: str):
+        """Compiled Jinja2 template, built (and jinja2 imported) on first use"""
+        template = self._compiled_templates.get(name)
+        if template is None:
+            from jinja2 import Template
+            template = self._compiled_templates[name] = Template(self.report_templates[name])
+        return template
     
     async def generate_comprehensive_report(
         self, 
@@ -129,17 +137,17 @@ class ReportGenerator:
     
     def _generate_markdown_report(self, report_data: Dict[str, Any]) -> str:
         """Generate markdown format report"""
-        template = Template(self.report_templates["markdown"])
+        template = self._template("markdown")
         return template.render(**report_data)
     
     def _generate_html_report(self, report_data: Dict[str, Any]) -> str:
         """Generate HTML format report"""
-        template = Template(self.report_templates["html"])
+        template = self._template("html")
         return template.render(**report_data)
     
     def _generate_summary_report(self, report_data: Dict[str, Any]) -> str:
         """Generate summary format report"""
-        template = Template(self.report_templates["summary"])
+        template = self._template("summary")
         return template.render(**report_data)
     
     def _determine_compliance_level(self, score: float) -> str:
@@ -0,0 +1,250 @@
+import os
+import re
+import logging
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import tiktoken
+
+from schemas.document_schema import ProcessedElement
+
+logger = logging.getLogger(__name__)
+
+# Token budget for the document part of each validator prompt
+VALIDATION_CHUNK_TOKENS = int(os.getenv("VALIDATION_CHUNK_TOKENS", "12000"))
+
+# Element types that start a new section; chunks prefer to break before them
+SECTION_ELEMENT_TYPES = {"Title", "Header"}
+
+STATUS_RANK = {"Not Met": 0, "Partially Met": 1, "Met": 2}
+
+@lru_cache(maxsize=16)
+def _encoding_for_model(model: Optional[str]) -> "tiktoken.Encoding":
+    # OpenRouter model names carry a provider prefix ("openai/gpt-4o")
+    name = (model or "").split("/")[-1]
+    try:
+        return tiktoken.encoding_for_model(name)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count tokens with the model's tokenizer (o200k_base for unknown models)"""
+    return len(_encoding_for_model(model).encode(text, disallowed_special=()))
+
+@dataclass
+class DocumentChunk:
+    """A contiguous run of document elements that fits within the chunk token budget"""
+    index: int
+    text: str
+    token_count: int
+    first_element: int
+    last_element: int
+    pages: List[int] = field(default_factory=list)
+
+class DocumentChunker:
+    """
+    Splits processed documents into token-bounded chunks on element boundaries.
+
+    Elements are grouped into sections that start at Title/Header elements. Whole
+    sections are packed into a chunk while they fit; a section larger than the budget
+    is split between elements, and a single oversized element is split by tokens.
+    """
+    def __init__(self, max_tokens: int = VALIDATION_CHUNK_TOKENS, model: Optional[str] = None):
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        self.max_tokens = max_tokens
+        self.model = model
+
+    @property
+    def encoding(self) -> "tiktoken.Encoding":
+        # Resolved on first use; tiktoken may fetch the BPE file the first time
+        return _encoding_for_model(self.model)
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def chunk(self, elements: List[ProcessedElement], max_tokens: Optional[int] = None) -> List[DocumentChunk]:
+        budget = max_tokens or self.max_tokens
+        chunks: List[DocumentChunk] = []
+        current: List[Tuple[int, str, int]] = []
+        current_tokens = 0
+
+        def flush():
+            nonlocal current, current_tokens
+            if current:
+                chunks.append(self._make_chunk(len(chunks), current, elements))
+            current, current_tokens = [], 0
+
+        for section in self._sections(elements):
+            section_tokens = sum(tokens for _, _, tokens in section)
+            if current and current_tokens + section_tokens > budget:
+                flush()
+            for index, text, tokens in section:
+                if tokens > budget:
+                    flush()
+                    for piece in self._split_text(text, budget):
+                        chunks.append(self._make_chunk(len(chunks), [(index, piece, self.count(piece))], elements))
+                    continue
+                if current_tokens + tokens > budget:
+                    flush()
+                current.append((index, text, tokens))
+                current_tokens += tokens
+        flush()
+        return chunks
+
+    def _sections(self, elements: List[ProcessedElement]) -> Iterable[List[Tuple[int, str, int]]]:
+        section: List[Tuple[int, str, int]] = []
+        for index, element in enumerate(elements):
+            if not element.text or not element.text.strip():
+                continue
+            if element.type in SECTION_ELEMENT_TYPES and section:
+                yield section
+                section = []
+            # +1 for the separator the element is joined with
+            section.append((index, element.text, self.count(element.text) + 1))
+        if section:
+            yield section
+
+    def _split_text(self, text: str, budget: int) -> List[str]:
+        tokens = self.encoding.encode(text, disallowed_special=())
+        return [self.encoding.decode(tokens[start:start + budget]) for start in range(0, len(tokens), budget)]
+
+    def _make_chunk(self, chunk_index: int, parts: List[Tuple[int, str, int]],
+                    elements: List[ProcessedElement]) -> DocumentChunk:
+        pages = sorted({
+            elements[index].metadata.get("page_number")
+            for index, _, _ in parts
+            if elements[index].metadata.get("page_number") is not None
+        })
+        return DocumentChunk(
+            index=chunk_index,
+            text="\n".join(text for _, text, _ in parts),
+            token_count=sum(tokens for _, _, tokens in parts),
+            first_element=parts[0][0],
+            last_element=parts[-1][0],
+            pages=pages,
+        )
+
+# Per-validator merge specification for list-shaped verdicts:
+# result key, fields identifying a requirement, list fields to union, numeric fields to max
+LIST_VERDICT_SPECS: Dict[str, Dict[str, Any]] = {
+    "performance_evidence": {
+        "key": "performance_evidence_validation",
+        "identity": ("evidence_requirement",),
+        "lists": ("mapped_tasks",),
+        "numbers": ("coverage_percentage",),
+    },
+    "knowledge_evidence": {
+        "key": "knowledge_evidence_validation",
+        "identity": ("knowledge_requirement",),
+        "lists": ("mapped_content",),
+        "numbers": (),
+    },
+    "foundation_skills": {
+        "key": "foundation_skills_validation",
+        "identity": ("skill_name",),
+        "lists": ("integration_points",),
+        "numbers": (),
+    },
+    "elements_and_performance_criteria": {
+        "key": "epc_validation",
+        "identity": ("performance_criterion",),
+        "lists": ("assessment_tasks",),
+        "numbers": (),
+    },
+}
+
+def _normalise(text: Any) -> str:
+    return re.sub(r"\s+", " ", str(text or "")).strip().lower()
+
+def _status_rank(entry: Dict[str, Any]) -> int:
+    return STATUS_RANK.get(entry.get("status"), -1)
+
+def _union(values: Iterable[Any]) -> List[Any]:
+    seen, merged = set(), []
+    for value in values:
+        marker = _normalise(value)
+        if marker and marker not in seen:
+            seen.add(marker)
+            merged.append(value)
+    return merged
+
+def _to_number(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).rstrip("%"))
+    except (TypeError, ValueError):
+        return None
+
+def _chunk_metadata(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    metadata = [r.get("_metadata", {}) for r in results if isinstance(r, dict)]
+    return {
+        "model": next((m.get("model") for m in metadata if m.get("model")), None),
+        "chunks": len(results),
+        "cached_chunks": sum(1 for m in metadata if m.get("cached")),
+    }
+
+def merge_list_verdicts(validator: str, results: List[Dict[str, Any]],
+                        expected: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+    """
+    Merge per-chunk verdicts for a list-shaped validator into one verdict.
+
+    A requirement takes its best status across chunks (evidence only has to appear in
+    one chunk); list fields are unioned and numeric scores take the maximum. Expected
+    requirements that no chunk reported are added as "Not Met" so coverage is complete.
+    """
+    spec = LIST_VERDICT_SPECS[validator]
+    merged: Dict[str, Dict[str, Any]] = {}
+    order: List[str] = []
+
+    for result in results:
+        entries = result.get(spec["key"], []) if isinstance(result, dict) else []
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            identity = "|".join(_normalise(entry.get(f)) for f in spec["identity"])
+            current = merged.get(identity)
+            if current is None:
+                merged[identity] = dict(entry)
+                order.append(identity)
+                continue
+            best = dict(entry) if _status_rank(entry) > _status_rank(current) else dict(current)
+            for list_field in spec["lists"]:
+                best[list_field] = _union(list(current.get(list_field) or []) + list(entry.get(list_field) or []))
+            for number_field in spec["numbers"]:
+                numbers = [n for n in (_to_number(current.get(number_field)), _to_number(entry.get(number_field)))
+                           if n is not None]
+                if numbers:
+                    best[number_field] = str(int(max(numbers)))
+            merged[identity] = best
+
+    for requirement in expected or []:
+        identity = "|".join(_normalise(requirement.get(f)) for f in spec["identity"])
+        if identity not in merged:
+            merged[identity] = {
+                **requirement,
+                "status": "Not Met",
+                "gap_analysis": "No evidence for this requirement was found in any part of the document",
+            }
+            order.append(identity)
+
+    return {spec["key"]: [merged[identity] for identity in order], "_metadata": _chunk_metadata(results)}
+
+def merge_condition_verdicts(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-chunk Assessment Conditions verdicts (one object per condition)"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        for condition, verdict in result.items():
+            if condition.startswith("_") or not isinstance(verdict, dict):
+                continue
+            current = merged.get(condition)
+            if current is None:
+                merged[condition] = dict(verdict)
+            elif _status_rank(verdict) > _status_rank(current):
+                merged[condition] = dict(verdict)
+            elif verdict.get("status") == "Met" and current.get("status") == "Met":
+                current["evidence"] = "; ".join(_union([current.get("evidence"), verdict.get("evidence")]))
+    merged["_metadata"] = _chunk_metadata(results)
+    return merged
@@ -1,13 +1,23 @@
 import os
+import time
+import shutil
+import asyncio
+import logging
 import tempfile
-import nltk
+import threading
 from fastapi import UploadFile
-from unstructured.partition.auto import partition
-from typing import List
+from typing import Dict, List
 from schemas.document_schema import ProcessedElement
 
+logger = logging.getLogger(__name__)
+
+# Download missing NLTK data during warm-up (the image ships it, see the Dockerfile)
+AUTO_DOWNLOAD_NLTK = os.getenv("AUTO_DOWNLOAD_NLTK", "True").lower() == "true"
+
 def check_for_nltk_package(package_name: str, package_category: str) -> bool:
     """Checks to see if the specified NLTK package exists on the image."""
+    import nltk
+
     paths: list[str] = []
     for path in nltk.data.path:
         if not path.endswith("nltk_data"):
@@ -22,6 +32,8 @@ def check_for_nltk_package(package_name: str, package_category: str) -> bool:
 
 def download_nltk_packages():
     """If required NLTK packages are not available, download them."""
+    import nltk
+
     tagger_available = check_for_nltk_package(
         package_category="taggers",
         package_name="averaged_perceptron_tagger_eng",
@@ -34,13 +46,56 @@ def download_nltk_packages():
         nltk.download("averaged_perceptron_tagger_eng", quiet=True)
         nltk.download("punkt_tab", quiet=True)
 
-if os.getenv("AUTO_DOWNLOAD_NLTK", "True").lower() == "true":
-    download_nltk_packages()
-
 class DocumentService:
     """
     A service to handle document processing tasks, primarily using the 'unstructured' library.
+
+    'unstructured' and NLTK are imported, and the tokenizer and tagger loaded, once by
+    warm_up(): at startup, or by the first document if that comes sooner. Requests after
+    that go straight to partitioning.
     """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._partition = None
+        # Seconds spent per warm-up step, once warmed up
+        self.warmup_seconds: Dict[str, float] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self._partition is not None
+
+    def warm_up(self) -> Dict[str, float]:
+        """Load NLTK data and the partitioner once; blocking, so call it from a thread"""
+        with self._lock:
+            if self._partition is not None:
+                return self.warmup_seconds
+            timings = {}
+            start_time = time.perf_counter()
+            # Partition locally; this service never calls a hosted Unstructured API
+            os.environ["UNSTRUCTURED_API_KEY"] = ""
+            os.environ["UNSTRUCTURED_API_URL"] = ""
+            if AUTO_DOWNLOAD_NLTK:
+                download_nltk_packages()
+            timings["nltk_data"] = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            import nltk
+            try:
+                # Tokenizer and tagger models are cached by NLTK after their first use
+                nltk.pos_tag(nltk.word_tokenize(nltk.sent_tokenize("Warm up the tokenizer. Then the tagger.")[0]))
+            except LookupError as e:
+                logger.warning(f"NLTK models not loaded during warm-up, partitioning will load them: {e}")
+            timings["nltk_models"] = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            from unstructured.partition.auto import partition
+            timings["unstructured"] = time.perf_counter() - start_time
+
+            self.warmup_seconds = {step: round(seconds, 3) for step, seconds in timings.items()}
+            self._partition = partition
+            logger.info(f"Document service warmed up: {self.warmup_seconds}")
+            return self.warmup_seconds
+
     async def process_document(self, file: UploadFile) -> List[ProcessedElement]:
         """
         Processes an uploaded file to extract structured content.
@@ -53,17 +108,14 @@ class DocumentService:
         """
         try:
             with tempfile.NamedTemporaryFile(delete=False, suffix=file.filename) as tmp_file:
-                content = await file.read()
-                tmp_file.write(content)
+                # Copy in chunks rather than reading the whole upload into memory
+                shutil.copyfileobj(file.file, tmp_file, 1024 * 1024)
                 tmp_file_path = tmp_file.name
 
-            os.environ["UNSTRUCTURED_API_KEY"] = ""
-            os.environ["UNSTRUCTURED_API_URL"] = ""
-            os.environ["AUTO_DOWNLOAD_NLTK"] = "True"
-            
-            download_nltk_packages()
+            if not self.ready:
+                await asyncio.to_thread(self.warm_up)
             
-            elements = partition(
+            elements = self._partition(
                 filename=tmp_file_path,
                 strategy="fast"
             )
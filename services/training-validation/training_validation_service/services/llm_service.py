@@ -1,36 +1,169 @@
 import os
+import asyncio
 import logging
+import time
 from datetime import datetime
-from openai import OpenAI
-from typing import Dict, Any, Optional
+import httpx
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
 import json
 
+from monitoring.metrics import LLM_REQUEST_DURATION, LLM_REQUESTS_IN_FLIGHT
+from services.llm_cache import CachePolicy, LLMResponseCache, llm_response_cache, make_cache_key
+
+if TYPE_CHECKING:
+    # Imported on first client creation; the openai package is slow to import
+    from openai import AsyncOpenAI, OpenAI
+
 logger = logging.getLogger(__name__)
 
+OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+OPENROUTER_HEADERS = {
+    "HTTP-Referer": "https://enhanced-ai-agent-os.com",
+    "X-Title": "Training Validation Service",
+}
+
+# Connection pool and timeout configuration for the shared async client
+LLM_MAX_CONNECTIONS = int(os.environ.get("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get("LLM_MAX_KEEPALIVE_CONNECTIONS", "10"))
+LLM_CONNECT_TIMEOUT = float(os.environ.get("LLM_CONNECT_TIMEOUT", "10"))
+LLM_REQUEST_TIMEOUT = float(os.environ.get("LLM_REQUEST_TIMEOUT", "120"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "2"))
+
+# Concurrent requests allowed per model; LLM_MODEL_CONCURRENCY_OVERRIDES takes "model=n,model=n"
+LLM_MODEL_CONCURRENCY = int(os.environ.get("LLM_MODEL_CONCURRENCY", "8"))
+
+def _parse_concurrency_overrides(value: str) -> Dict[str, int]:
+    overrides = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        model, _, limit = entry.rpartition("=")
+        if not model or not limit.isdigit():
+            logger.warning(f"Ignoring invalid LLM_MODEL_CONCURRENCY_OVERRIDES entry: {entry}")
+            continue
+        overrides[model] = int(limit)
+    return overrides
+
+LLM_MODEL_CONCURRENCY_OVERRIDES = _parse_concurrency_overrides(os.environ.get("LLM_MODEL_CONCURRENCY_OVERRIDES", ""))
+
 class LLMService:
     """
     A service to interact with a Large Language Model via OpenRouter for validation tasks.
+
+    Requests go through one shared async client (HTTP/2, pooled connections), so
+    concurrent validation prompts run in parallel without blocking the event loop.
+    Each model has its own concurrency limit. Responses are cached by content
+    hash (prompts run at temperature 0, so reuse is safe).
     """
-    def __init__(self):
+    def __init__(self, cache: Optional[LLMResponseCache] = None):
         """Initialize the LLM service with OpenRouter configuration.
-        
+
         Environment Variables:
             OPENROUTER_API_KEY: Your OpenRouter API key (optional for testing)
             OPENROUTER_MODEL: The default model to use (defaults to "openai/gpt-4o")
+            LLM_MAX_CONNECTIONS / LLM_MAX_KEEPALIVE_CONNECTIONS: HTTP connection pool limits
+            LLM_CONNECT_TIMEOUT / LLM_REQUEST_TIMEOUT: Timeouts in seconds
+            LLM_MODEL_CONCURRENCY: Concurrent requests allowed per model (default 8)
+            LLM_MODEL_CONCURRENCY_OVERRIDES: Per-model limits, e.g. "openai/gpt-4o=4"
         """
-        api_key = os.environ.get("OPENROUTER_API_KEY")
-        if not api_key:
+        self.api_key = os.environ.get("OPENROUTER_API_KEY")
+        self.client: Optional["OpenAI"] = None
+        self.async_client: Optional["AsyncOpenAI"] = None
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._model_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.cache = cache or llm_response_cache
+        if not self.api_key:
             logger.warning("OPENROUTER_API_KEY not set - LLM service will return mock responses for testing")
-            self.client = None
             self.default_model = "mock-model"
         else:
+            self.default_model = os.environ.get("OPENROUTER_MODEL", "openai/gpt-4o")
+
+    def _get_async_client(self) -> "AsyncOpenAI":
+        """Create the shared async client on first use, inside the running event loop"""
+        if self.async_client is None:
+            from openai import AsyncOpenAI
+            self._http_client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(
+                    max_connections=LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+                ),
+                timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+            )
+            self.async_client = AsyncOpenAI(
+                base_url=OPENROUTER_BASE_URL,
+                api_key=self.api_key,
+                http_client=self._http_client,
+                max_retries=LLM_MAX_RETRIES,
+            )
+        return self.async_client
+
+    def _get_sync_client(self) -> "OpenAI":
+        if self.client is None:
+            from openai import OpenAI
             self.client = OpenAI(
-                base_url="https://openrouter.ai/api/v1",
-                api_key=api_key,
+                base_url=OPENROUTER_BASE_URL,
+                api_key=self.api_key,
+                timeout=httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+                max_retries=LLM_MAX_RETRIES,
             )
-            self.default_model = os.environ.get("OPENROUTER_MODEL", "openai/gpt-4o")
+        return self.client
+
+    def _semaphore_for(self, model: str) -> asyncio.Semaphore:
+        semaphore = self._model_semaphores.get(model)
+        if semaphore is None:
+            limit = LLM_MODEL_CONCURRENCY_OVERRIDES.get(model, LLM_MODEL_CONCURRENCY)
+            semaphore = self._model_semaphores[model] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def close(self):
+        """Close pooled connections (called on application shutdown)"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        self._http_client = None
+        self.async_client = None
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+        await self.cache.close()
+
+    def _build_messages(self, prompt: str, context: str) -> List[Dict[str, str]]:
+        return [
+            {"role": "system", "content": prompt},
+            {"role": "user", "content": f"Here is the document content to analyze:\n\n---\n{context}\n---"}
+        ]
+
+    def _mock_response(self) -> Dict[str, Any]:
+        logger.info("Returning mock validation response - no OPENROUTER_API_KEY configured")
+        return {
+            "status": "Met",
+            "gaps": [],
+            "recommendations": ["Mock validation - configure OPENROUTER_API_KEY for real validation"],
+            "confidence_score": 0.5,
+            "_metadata": {
+                "model": "mock-model",
+                "service": "mock",
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        }
+
+    def _parse_response(self, response, model: str) -> Dict[str, Any]:
+        # Validate and parse the response
+        if not response.choices or not response.choices[0].message.content:
+            raise ValueError("Empty or invalid response from LLM")
 
-    def get_json_validation(self, prompt: str, context: str, model: Optional[str] = None) -> Dict[str, Any]:
+        result = json.loads(response.choices[0].message.content)
+
+        # Add metadata about the model used
+        if isinstance(result, dict):
+            result["_metadata"] = {
+                "model": model,
+                "service": "openrouter",
+                "timestamp": datetime.utcnow().isoformat()
+            }
+
+        return result
+
+    async def get_json_validation(self, prompt: str, context: str, model: Optional[str] = None,
+                                  cache_policy: CachePolicy = CachePolicy.USE) -> Dict[str, Any]:
         """
         Sends a prompt and a document context to the specified OpenRouter model
         and asks for a structured JSON response for validation.
@@ -40,66 +173,95 @@ class LLMService:
             context: The document content to be analyzed.
             model: The model to use via OpenRouter (e.g., "openai/gpt-4o", "anthropic/claude-3.5-sonnet").
                    If not provided, uses the default model from OPENROUTER_MODEL env var.
+            cache_policy: "use" to serve cached responses, "refresh" to call the model and
+                          overwrite the cached response, "bypass" to skip the cache entirely.
 
         Returns:
             A dictionary parsed from the LLM's JSON response.
-            
+
         Raises:
             ValueError: If the response cannot be parsed as JSON or is invalid
             Exception: For any other errors during the API call
         """
         model = model or self.default_model
-        
-        if not self.client:
-            logger.info("Returning mock validation response - no OPENROUTER_API_KEY configured")
-            return {
-                "status": "Met",
-                "gaps": [],
-                "recommendations": ["Mock validation - configure OPENROUTER_API_KEY for real validation"],
-                "confidence_score": 0.5,
-                "_metadata": {
-                    "model": "mock-model",
-                    "service": "mock",
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-            }
-        
+
+        if not self.api_key:
+            return self._mock_response()
+
+        cache_key = make_cache_key(model, prompt, context, temperature=0.0, response_format="json_object")
+        cached = await self.cache.get(cache_key, cache_policy)
+        if cached is not None:
+            if isinstance(cached, dict):
+                cached.setdefault("_metadata", {})["cached"] = True
+            return cached
+
+        result = await self._complete_json(prompt, context, model)
+        await self.cache.put(cache_key, model, result, cache_policy)
+        return result
+
+    async def _complete_json(self, prompt: str, context: str, model: str) -> Dict[str, Any]:
+        client = self._get_async_client()
+        status = "error"
+        async with self._semaphore_for(model):
+            LLM_REQUESTS_IN_FLIGHT.labels(model=model).inc()
+            start_time = time.perf_counter()
+            try:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=self._build_messages(prompt, context),
+                    response_format={"type": "json_object"},
+                    temperature=0.0,  # Set to 0 for maximum fact-based consistency
+                    extra_headers=OPENROUTER_HEADERS
+                )
+                result = self._parse_response(response, model)
+                status = "success"
+                return result
+
+            except json.JSONDecodeError as e:
+                error_msg = f"Failed to parse LLM response as JSON: {str(e)}"
+                logger.error(error_msg)
+                raise ValueError(error_msg) from e
+
+            except ValueError:
+                raise
+
+            except Exception as e:
+                error_msg = f"Error during LLM validation with model {model}: {str(e)}"
+                logger.error(error_msg)
+                raise Exception(error_msg) from e
+
+            finally:
+                LLM_REQUESTS_IN_FLIGHT.labels(model=model).dec()
+                LLM_REQUEST_DURATION.labels(model=model, status=status).observe(time.perf_counter() - start_time)
+
+    def get_json_validation_sync(self, prompt: str, context: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Blocking variant of get_json_validation for callers without an event loop.
+        Do not call this from async code; it blocks the loop for the whole request.
+        """
+        model = model or self.default_model
+
+        if not self.api_key:
+            return self._mock_response()
+
         try:
-            response = self.client.chat.completions.create(
+            response = self._get_sync_client().chat.completions.create(
                 model=model,
-                messages=[
-                    {"role": "system", "content": prompt},
-                    {"role": "user", "content": f"Here is the document content to analyze:\n\n---\n{context}\n---"}
-                ],
+                messages=self._build_messages(prompt, context),
                 response_format={"type": "json_object"},
-                temperature=0.0,  # Set to 0 for maximum fact-based consistency
-                extra_headers={
-                    "HTTP-Referer": "https://enhanced-ai-agent-os.com",
-                    "X-Title": "Training Validation Service",
-                }
+                temperature=0.0,
+                extra_headers=OPENROUTER_HEADERS
             )
-            
-            # Validate and parse the response
-            if not response.choices or not response.choices[0].message.content:
-                raise ValueError("Empty or invalid response from LLM")
-                
-            result = json.loads(response.choices[0].message.content)
-            
-            # Add metadata about the model used
-            if isinstance(result, dict):
-                result["_metadata"] = {
-                    "model": model,
-                    "service": "openrouter",
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-                
-            return result
-            
+            return self._parse_response(response, model)
+
         except json.JSONDecodeError as e:
             error_msg = f"Failed to parse LLM response as JSON: {str(e)}"
             logger.error(error_msg)
             raise ValueError(error_msg) from e
-            
+
+        except ValueError:
+            raise
+
         except Exception as e:
             error_msg = f"Error during LLM validation with model {model}: {str(e)}"
             logger.error(error_msg)
@@ -4,6 +4,8 @@ from typing import List, Dict, Any, Optional
 from schemas.unit_schema import Unit
 from schemas.document_schema import ProcessedElement
 from services.llm_service import LLMService, llm_service
+from services.llm_cache import CachePolicy
+from services.chunking import DocumentChunker, merge_condition_verdicts, merge_list_verdicts
 from integrations.data_architecture_client import DataArchitectureClient
 from prompts.validation_prompts import (
     ASSESSMENT_CONDITIONS_PROMPT,
@@ -22,8 +24,11 @@ class ValidationService:
     LLM-driven analysis with prompts from the centralized prompt store.
     Enhanced with vector store context for improved accuracy.
     """
-    def __init__(self, llm_service: LLMService, data_architecture_client: Optional[DataArchitectureClient] = None):
+    def __init__(self, llm_service: LLMService, data_architecture_client: Optional[DataArchitectureClient] = None,
+                 chunker: Optional[DocumentChunker] = None):
         self.llm = llm_service
+        self.chunker = chunker or DocumentChunker(model=llm_service.default_model)
+        self.chunk_concurrency = int(os.getenv("VALIDATION_CHUNK_CONCURRENCY", "10"))
         self.data_client = data_architecture_client or DataArchitectureClient(
             os.getenv("DATA_ARCHITECTURE_URL", "http://data_architecture:8020")
         )
@@ -70,12 +75,17 @@ class ValidationService:
             logger.error(f"Error retrieving additional context: {e}")
             return ""
 
-    async def validate_document_fully(self, unit_data: Unit, document_elements: List[ProcessedElement]) -> Dict[str, Any]:
+    async def validate_document_fully(self, unit_data: Unit, document_elements: List[ProcessedElement],
+                                      cache_policy: CachePolicy = CachePolicy.USE) -> Dict[str, Any]:
         """
         Runs all validation checks CONCURRENTLY using asyncio and returns a comprehensive report.
         Enhanced with additional context from vector store for current documents.
+        cache_policy controls reuse of cached LLM responses (use / refresh / bypass).
+
+        The document is split into token-bounded chunks on element boundaries; every
+        validator prompt runs per chunk (bounded by VALIDATION_CHUNK_CONCURRENCY) and the
+        per-chunk verdicts are merged, so prompt size stays constant as documents grow.
         """
-        doc_context = self._prepare_context(document_elements)
         additional_context = await self._get_additional_context(unit_data, document_elements)
 
         
@@ -98,40 +108,68 @@ class ValidationService:
         epc_list_str = "\n".join(epc_list_items)
         epc_prompt = EPC_PROMPT.format(evidence_list=epc_list_str)
 
-        context_with_additional = doc_context
-        if additional_context:
-            context_with_additional = f"{doc_context}\n\nAdditional Context:\n{additional_context}"
-
-        tasks = [
-            self.llm.get_json_validation(ac_prompt, context_with_additional),
-            self.llm.get_json_validation(pe_prompt, context_with_additional),
-            self.llm.get_json_validation(ke_prompt, context_with_additional),
-            self.llm.get_json_validation(fs_prompt, context_with_additional),
-            self.llm.get_json_validation(epc_prompt, context_with_additional)
-        ]
-        
-        results = await asyncio.gather(*tasks)
-        
-        ac_results, pe_results, ke_results, fs_results, epc_results = results
+        # Requirements every merged verdict must account for
+        expected = {
+            "performance_evidence": [{"evidence_requirement": pe} for pe in unit_data.performance_evidence],
+            "knowledge_evidence": [{"knowledge_requirement": ke} for ke in unit_data.knowledge_evidence],
+            "foundation_skills": [{"skill_name": fs.skill, "skill_description": fs.description}
+                                  for fs in unit_data.foundation_skills],
+            "elements_and_performance_criteria": [
+                {"element": element.element_description, "performance_criterion": pc}
+                for element in unit_data.elements_and_performance_criteria
+                for pc in element.performance_criteria
+            ],
+        }
+
+        additional_block = f"\n\nAdditional Context:\n{additional_context}" if additional_context else ""
+        chunk_budget = max(self.chunker.max_tokens - self.chunker.count(additional_block), 1)
+        chunks = self.chunker.chunk(document_elements, max_tokens=chunk_budget)
+        contexts = [chunk.text + additional_block for chunk in chunks] or [additional_block]
+        logger.info(f"Validating {unit_data.unit_code} in {len(contexts)} chunk(s) "
+                    f"(largest {max((c.token_count for c in chunks), default=0)} tokens)")
+
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+
+        async def run_chunk(prompt: str, context: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.llm.get_json_validation(prompt, context, cache_policy=cache_policy)
+
+        async def run_validator(prompt: str) -> List[Dict[str, Any]]:
+            return await asyncio.gather(*(run_chunk(prompt, context) for context in contexts))
+
+        ac_chunks, pe_chunks, ke_chunks, fs_chunks, epc_chunks = await asyncio.gather(
+            run_validator(ac_prompt),
+            run_validator(pe_prompt),
+            run_validator(ke_prompt),
+            run_validator(fs_prompt),
+            run_validator(epc_prompt)
+        )
 
         final_report = {
             "unit_code": unit_data.unit_code,
             "document_name": document_elements[0].metadata.get("file_name", "N/A") if document_elements else "N/A",
+            "chunk_count": len(contexts),
             "validation_report": {
-                "assessment_conditions": ac_results,
-                "performance_evidence": pe_results,
-                "knowledge_evidence": ke_results,
-                "foundation_skills": fs_results,
-                "elements_and_performance_criteria": epc_results,
+                "assessment_conditions": merge_condition_verdicts(ac_chunks),
+                "performance_evidence": merge_list_verdicts("performance_evidence", pe_chunks,
+                                                            expected["performance_evidence"]),
+                "knowledge_evidence": merge_list_verdicts("knowledge_evidence", ke_chunks,
+                                                          expected["knowledge_evidence"]),
+                "foundation_skills": merge_list_verdicts("foundation_skills", fs_chunks,
+                                                         expected["foundation_skills"]),
+                "elements_and_performance_criteria": merge_list_verdicts(
+                    "elements_and_performance_criteria", epc_chunks,
+                    expected["elements_and_performance_criteria"]),
             }
         }
         
         return final_report
 
-    def validate_document(self, unit_data: Unit, document_elements: List[ProcessedElement]) -> Dict[str, Any]:
+    def validate_document(self, unit_data: Unit, document_elements: List[ProcessedElement],
+                          cache_policy: CachePolicy = CachePolicy.USE) -> Dict[str, Any]:
         """
         Synchronous wrapper for backward compatibility with existing endpoint.
         """
-        return asyncio.run(self.validate_document_fully(unit_data, document_elements))
+        return asyncio.run(self.validate_document_fully(unit_data, document_elements, cache_policy))
 
 validation_service = ValidationService(llm_service=llm_service)
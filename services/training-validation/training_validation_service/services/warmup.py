@@ -0,0 +1,70 @@
+import os
+import time
+import asyncio
+import logging
+import importlib
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from monitoring.metrics import SERVICE_TIME_TO_READY, SERVICE_WARMUP_STEP_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Warm up at startup; when false everything is loaded by the first request that needs it
+WARMUP_ON_STARTUP = os.environ.get("WARMUP_ON_STARTUP", "true").lower() == "true"
+# Imported lazily by the modules that use them; warm-up imports them before traffic arrives
+WARMUP_MODULES = tuple(filter(None, os.environ.get("WARMUP_MODULES", "openai,jinja2,textstat").split(",")))
+
+def import_modules(modules: Iterable[str] = WARMUP_MODULES) -> Dict[str, float]:
+    """Import the modules; returns seconds per module"""
+    timings = {}
+    for module in modules:
+        start_time = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            logger.warning(f"Warm-up could not import {module}: {e}")
+        timings[module] = round(time.perf_counter() - start_time, 3)
+    return timings
+
+class Readiness:
+    """
+    Warm-up phase and time-to-ready of the service.
+
+    Warm-up steps are blocking callables run one after another in a worker thread, so the
+    event loop keeps answering liveness checks meanwhile. A failing step is logged and
+    recorded; what it would have loaded is then loaded on first use instead. The service
+    is ready once every step has run.
+    """
+    def __init__(self, started_at: Optional[float] = None):
+        # time.monotonic() when the process started serving code
+        self.started_at = started_at if started_at is not None else time.monotonic()
+        self.ready = False
+        self.time_to_ready: Optional[float] = None
+        self.steps: Dict[str, Dict[str, Any]] = {}
+
+    async def warm_up(self, steps: Iterable[Tuple[str, Callable[[], Any]]]):
+        for name, step in steps:
+            start_time = time.perf_counter()
+            record: Dict[str, Any] = {}
+            try:
+                detail = await asyncio.to_thread(step)
+                if detail:
+                    record["detail"] = detail
+            except Exception as e:
+                logger.warning(f"Warm-up step {name} failed, deferring to first use: {e}")
+                record["error"] = str(e)
+            record["seconds"] = round(time.perf_counter() - start_time, 3)
+            self.steps[name] = record
+            SERVICE_WARMUP_STEP_SECONDS.labels(step=name).set(record["seconds"])
+        self.time_to_ready = round(time.monotonic() - self.started_at, 3)
+        self.ready = True
+        SERVICE_TIME_TO_READY.set(self.time_to_ready)
+        logger.info(f"Service ready {self.time_to_ready}s after start-up")
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "time_to_ready_seconds": self.time_to_ready,
+            "uptime_seconds": round(time.monotonic() - self.started_at, 3),
+            "warmup": self.steps
+        }
@@ -5,12 +5,27 @@ This module coordinates the execution of multiple validation engines and aggrega
 """
 import logging
 import json
-from typing import Dict, List, Any, Optional, Type, TypeVar
+import os
+import pickle
+import time
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Any, Optional, Tuple, Type, TypeVar
 from dataclasses import asdict, is_dataclass
 import asyncio
 from contextlib import asynccontextmanager
 
 from validation_engines.base_validator import BaseValidator
+from validation_engines.document_analysis import DocumentAnalysis, analyse_documents
+from monitoring.metrics import VALIDATOR_CPU_SECONDS, VALIDATOR_WALL_SECONDS
+from services.validation_result_store import (
+    ValidationResultStore,
+    document_fingerprints,
+    make_result_fingerprint,
+    validation_result_store
+)
+from models.document_elements import DocumentElements
 from models.validation_models import (
     ValidationResult, 
     ValidationSummary, 
@@ -24,6 +39,49 @@ from models.validation_models import (
 logger = logging.getLogger(__name__)
 T = TypeVar('T', bound=BaseValidator)
 
+# Where validators run: "inline" on the event loop, "thread" in a thread pool
+# (keeps the loop responsive) or "process" in a process pool (one task per request,
+# so concurrent requests use several cores)
+EXECUTOR_MODES = ("inline", "thread", "process")
+VALIDATION_EXECUTOR = os.getenv("VALIDATION_EXECUTOR", "inline").lower()
+VALIDATION_EXECUTOR_WORKERS = int(os.getenv("VALIDATION_EXECUTOR_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+def _validate_sync(
+    validator: BaseValidator,
+    training_unit_dict: Dict[str, Any],
+    documents_list: List[Dict[str, Any]],
+    analyses: Optional[List[DocumentAnalysis]]
+) -> Tuple[Dict[str, Any], float, float]:
+    """Run a validator to completion in the calling thread; returns (result, wall seconds, CPU seconds)"""
+    start_wall, start_cpu = time.perf_counter(), time.thread_time()
+    result_dict = asyncio.run(validator.validate(training_unit_dict, documents_list, analyses))
+    return result_dict, time.perf_counter() - start_wall, time.thread_time() - start_cpu
+
+def _validate_set_in_process(
+    validator_classes: List[Type[BaseValidator]],
+    strictness_level: str,
+    payload: bytes
+) -> Dict[str, Any]:
+    """
+    Process pool entry point: one task per document set runs every pending validator.
+
+    The payload is the request pickled once by the coordinator. The documents are
+    analysed once here and shared by all validators (analyses hold per-process scan
+    caches, so they are built in the worker rather than sent). Returns, per validator
+    class name, (result, wall seconds, CPU seconds) or the exception it raised.
+    """
+    training_unit_dict, documents_list = pickle.loads(payload)
+    analyses = analyse_documents(documents_list)
+    outcomes: Dict[str, Any] = {}
+    for validator_class in validator_classes:
+        try:
+            outcomes[validator_class.__name__] = _validate_sync(
+                validator_class(strictness_level), training_unit_dict, documents_list, analyses
+            )
+        except Exception as e:
+            outcomes[validator_class.__name__] = e
+    return outcomes
+
 def serialize_dataclass_recursively(obj):
     """Recursively convert dataclass objects to dictionaries for JSON serialization."""
     import uuid
@@ -41,31 +99,134 @@ def serialize_dataclass_recursively(obj):
 class ValidationCoordinator:
     """Coordinates the execution of multiple validation engines."""
     
-    def __init__(self, validators: Optional[Dict[ValidationType, Type[BaseValidator]]] = None):
-        """Initialize with a dictionary of validator classes."""
+    def __init__(
+        self,
+        validators: Optional[Dict[ValidationType, Type[BaseValidator]]] = None,
+        executor: str = VALIDATION_EXECUTOR,
+        max_workers: int = VALIDATION_EXECUTOR_WORKERS,
+        result_store: Optional[ValidationResultStore] = None
+    ):
+        """
+        Initialize with a dictionary of validator classes.
+        
+        Args:
+            validators: Validator classes by validation type
+            executor: "inline", "thread" or "process" (see VALIDATION_EXECUTOR)
+            max_workers: Pool size for the thread and process executors
+            result_store: Where per-engine results are stored by input fingerprint;
+                          engines whose inputs are unchanged are not run again
+        """
+        if executor not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown validation executor '{executor}', expected one of {EXECUTOR_MODES}")
         self.validators = validators or {}
+        self.executor_mode = executor
+        self.max_workers = max_workers
+        self._executor: Optional[Executor] = None
+        self.result_store = result_store
+    
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_mode == "process":
+                # spawn: forking a process that runs an event loop and threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="validator"
+                )
+        return self._executor
+    
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
     
     def register_validator(self, validator_type: ValidationType, validator_class: Type[BaseValidator]):
         """Register a new validator class."""
         self.validators[validator_type] = validator_class
     
+    async def _execute(
+        self,
+        validator_class: Type[BaseValidator],
+        request: ValidationRequest,
+        training_unit_dict: Dict[str, Any],
+        documents_list: List[Dict[str, Any]],
+        analyses: Optional[List[DocumentAnalysis]],
+        batch: Optional["asyncio.Future[Dict[str, Any]]"]
+    ) -> Tuple[Dict[str, Any], float, float]:
+        """Run a validator with the configured executor; returns (result, wall seconds, CPU seconds)"""
+        if self.executor_mode == "inline":
+            validator = validator_class(request.strictness_level)
+            start_wall, start_cpu = time.perf_counter(), time.thread_time()
+            result_dict = await validator.validate(training_unit_dict, documents_list, analyses)
+            return result_dict, time.perf_counter() - start_wall, time.thread_time() - start_cpu
+        
+        loop = asyncio.get_running_loop()
+        if self.executor_mode == "thread":
+            validator = validator_class(request.strictness_level)
+            return await loop.run_in_executor(
+                self._get_executor(), _validate_sync, validator, training_unit_dict, documents_list, analyses
+            )
+        
+        outcome = (await batch)[validator_class.__name__]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+    
+    async def _execute_batch(
+        self,
+        validator_classes: List[Type[BaseValidator]],
+        request: ValidationRequest,
+        payload: bytes
+    ) -> Dict[str, Any]:
+        """Run all pending validators as one process pool task; see _validate_set_in_process"""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._get_executor(), _validate_set_in_process, validator_classes, request.strictness_level, payload
+            )
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next request
+            self._executor = None
+            raise
+    
     async def _run_validator(
         self, 
         validator_class: Type[BaseValidator],
-        request: ValidationRequest
+        request: ValidationRequest,
+        training_unit_dict: Dict[str, Any],
+        documents_list: List[Dict[str, Any]],
+        analyses: Optional[List[DocumentAnalysis]],
+        batch: Optional["asyncio.Future[Dict[str, Any]]"] = None,
+        fingerprint: Optional[str] = None
     ) -> ValidationResult:
-        """Run a single validator and handle errors."""
-        validator = validator_class(request.strictness_level)
+        """Run a single validator and handle errors; successful results are stored under the fingerprint."""
         try:
-            # Convert dataclass objects to dictionaries for legacy validators
-            training_unit_dict = asdict(request.training_unit)
-            documents_list = [asdict(doc) for doc in request.documents]
-            result_dict = await validator.validate(training_unit_dict, documents_list)
+            result_dict, wall_seconds, cpu_seconds = await self._execute(
+                validator_class, request, training_unit_dict, documents_list, analyses, batch
+            )
+            VALIDATOR_WALL_SECONDS.labels(validator=validator_class.__name__, executor=self.executor_mode).observe(wall_seconds)
+            VALIDATOR_CPU_SECONDS.labels(validator=validator_class.__name__, executor=self.executor_mode).observe(cpu_seconds)
+            if fingerprint is not None:
+                await self.result_store.put(
+                    fingerprint, validator_class.__name__, validator_class.get_validation_type().value,
+                    serialize_dataclass_recursively(result_dict)
+                )
             return ValidationResult(
                 validation_type=validator_class.get_validation_type(),
                 overall_score=result_dict.get("overall_score", 0),
                 details=result_dict,
-                recommendations=result_dict.get("recommendations", [])
+                recommendations=result_dict.get("recommendations", []),
+                timing={
+                    "executor": self.executor_mode,
+                    "wall_seconds": round(wall_seconds, 4),
+                    "cpu_seconds": round(cpu_seconds, 4)
+                },
+                fingerprint=fingerprint
             )
         except Exception as e:
             logger.exception(f"Validator {validator_class.__name__} failed")
@@ -73,9 +234,45 @@ class ValidationCoordinator:
                 validation_type=validator_class.get_validation_type(),
                 overall_score=0,
                 details={"error": str(e)},
-                error=str(e)
+                error=str(e),
+                fingerprint=fingerprint
             )
     
+    async def _stored_results(
+        self,
+        request: ValidationRequest,
+        training_unit_dict: Dict[str, Any],
+        documents_list: List[Dict[str, Any]]
+    ) -> Tuple[Dict[ValidationType, str], Dict[ValidationType, ValidationResult]]:
+        """Fingerprint each engine's inputs; returns the fingerprints and the results already stored under them"""
+        if self.result_store is None or not self.result_store.enabled:
+            return {}, {}
+        documents = document_fingerprints(documents_list)
+        fingerprints = {
+            validation_type: make_result_fingerprint(
+                validator_class.__name__,
+                validator_class.RESULT_VERSION,
+                validator_class.unit_inputs(training_unit_dict),
+                documents,
+                request.strictness_level
+            )
+            for validation_type, validator_class in self.validators.items()
+        }
+        stored = await self.result_store.get_many(list(fingerprints.values()))
+        reused = {
+            validation_type: ValidationResult(
+                validation_type=validation_type,
+                overall_score=stored[fingerprint].get("overall_score", 0),
+                details=stored[fingerprint],
+                recommendations=stored[fingerprint].get("recommendations", []),
+                fingerprint=fingerprint,
+                reused=True
+            )
+            for validation_type, fingerprint in fingerprints.items()
+            if fingerprint in stored
+        }
+        return fingerprints, reused
+    
     async def run_validation(self, request: ValidationRequest) -> ValidationResponse:
         """
         Run all registered validators in parallel and return aggregated results.
@@ -88,20 +285,52 @@ class ValidationCoordinator:
         """
         logger.info(f"Starting validation for session {request.session_id}")
         
-        # Run all validators in parallel
+        # Convert to dictionaries for legacy validators and analyse the documents once;
+        # validators only read these, so every validator shares the same objects
+        training_unit_dict = asdict(request.training_unit)
+        documents_list = [asdict(doc) for doc in request.documents]
+        
+        # Engines whose inputs are unchanged since a previous run reuse its result
+        fingerprints, reused = await self._stored_results(request, training_unit_dict, documents_list)
+        pending = {
+            validation_type: validator_class
+            for validation_type, validator_class in self.validators.items()
+            if validation_type not in reused
+        }
+        if reused:
+            logger.info(f"Reusing stored results for {[t.value for t in reused]}, recomputing {[t.value for t in pending]}")
+        
+        analyses, batch = None, None
+        if pending and self.executor_mode == "process":
+            # One worker task per document set: the request is pickled and analysed once,
+            # and every pending validator runs against that analysis
+            payload = pickle.dumps((training_unit_dict, documents_list))
+            batch = asyncio.ensure_future(self._execute_batch(list(pending.values()), request, payload))
+        elif pending:
+            analyses = analyse_documents(request.documents)
+        
+        # Run the remaining validators in parallel
         tasks = [
-            self._run_validator(validator_class, request)
-            for validator_class in self.validators.values()
+            self._run_validator(
+                validator_class, request, training_unit_dict, documents_list, analyses, batch,
+                fingerprints.get(validation_type)
+            )
+            for validation_type, validator_class in pending.items()
         ]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        # Process results
-        results_by_type = {
+        # Process results, in registration order
+        computed = {
             result.validation_type: result 
             for result in results 
             if isinstance(result, ValidationResult)
         }
+        results_by_type = {
+            validation_type: reused.get(validation_type) or computed[validation_type]
+            for validation_type in self.validators
+            if validation_type in reused or validation_type in computed
+        }
         
         # Calculate overall metrics
         scores = [r.overall_score for r in results_by_type.values() if r.error is None]
@@ -125,11 +354,32 @@ class ValidationCoordinator:
             findings={k.value: asdict(v) for k, v in results_by_type.items()},
             recommendations=all_recommendations,
             summary=summary,
-            strictness_level=request.strictness_level
+            strictness_level=request.strictness_level,
+            reuse={
+                "reused": [t.value for t in reused],
+                "recomputed": [t.value for t in computed]
+            }
         )
 
 # Default coordinator instance with standard validators
-default_coordinator = ValidationCoordinator()
+default_coordinator = ValidationCoordinator(result_store=validation_result_store)
+
+def _document_metadata(doc: Dict[str, Any]) -> Dict[str, Any]:
+    metadata = doc.get("metadata")
+    if metadata is None:
+        return {}
+    return metadata if isinstance(metadata, dict) else json.loads(metadata)
+
+def _document_elements(doc: Dict[str, Any]) -> Optional[DocumentElements]:
+    """Unpacked element columns, when the document row came with them"""
+    blob = doc.get("element_columns")
+    if not blob:
+        return None
+    try:
+        return DocumentElements.unpack(blob)
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable element columns for {doc.get('filename')}: {e}")
+        return None
 
 # Helper function for backward compatibility
 async def run_validation_engines(session: Dict[str, Any], documents: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -178,7 +428,8 @@ async def run_validation_engines(session: Dict[str, Any], documents: List[Dict[s
         ValidationDocument(
             filename=doc["filename"],
             content_extracted=doc["content_extracted"],
-            metadata=doc["metadata"] if isinstance(doc["metadata"], dict) else json.loads(doc["metadata"])
+            metadata=_document_metadata(doc),
+            elements=_document_elements(doc)
         )
         for doc in documents
     ]
@@ -4,6 +4,7 @@ from .knowledge_evidence_validator import KnowledgeEvidenceValidator
 from .performance_evidence_validator import PerformanceEvidenceValidator
 from .foundation_skills_validator import FoundationSkillsValidator
 from .validation_gap import ValidationGap
+from .document_analysis import DocumentAnalysis, analyse_documents
 
 __all__ = [
     "BaseValidator",
@@ -11,5 +12,7 @@ __all__ = [
     "KnowledgeEvidenceValidator",
     "PerformanceEvidenceValidator",
     "FoundationSkillsValidator",
-    "ValidationGap"
+    "ValidationGap",
+    "DocumentAnalysis",
+    "analyse_documents"
 ]
@@ -1,17 +1,130 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 import re
-import textstat
 from .validation_gap import ValidationGap
 from .base_validator import BaseValidator
+from .keyword_matcher import KeywordMatcher, KeywordScan
+from .document_analysis import DocumentAnalysis, analyse_documents
 from models.validation_models import ValidationType, TrainingUnit, ValidationDocument, ValidationResult
 
 logger = logging.getLogger(__name__)
 
+# Keywords that make a document relevant to each AC category
+CATEGORY_KEYWORDS = {
+    "environment": ["environment", "location", "workplace", "setting", "conditions", "simulated", "realistic"],
+    "resources": ["resource", "tool", "equipment", "material", "software", "checklist", "rubric"],
+    "supervision": ["supervisor", "assessor", "observer", "qualified", "TAE", "oversight", "monitoring"],
+    "instructions": ["instruction", "direction", "guideline", "procedure", "step", "requirement", "task"],
+    "interaction": ["interaction", "feedback", "question", "discussion", "briefing", "debrief", "communication"],
+    "third_party": ["third party", "witness", "employer", "supervisor report", "external", "workplace supervisor"],
+    "timing": ["time", "duration", "schedule", "deadline", "frequency", "minutes", "hours", "timeframe"]
+}
+
+ENVIRONMENT_KEYWORDS = {
+    'workplace': ['workplace', 'work site', 'on-site', 'real workplace', 'actual workplace'],
+    'simulated': ['simulated', 'simulation', 'mock', 'practice environment', 'training room'],
+    'conditions': ['realistic conditions', 'industry conditions', 'authentic conditions'],
+    'safety': ['safety', 'safe environment', 'safety requirements', 'safety equipment']
+}
+
+ENVIRONMENT_SPECIFICITY_INDICATORS = [
+    'specific location', 'address', 'room number', 'building',
+    'equipment list', 'software version', 'model number',
+    'temperature', 'lighting', 'noise level', 'space requirements'
+]
+
+RESOURCE_CATEGORIES = {
+    'tools': ['tool', 'instrument', 'device'],
+    'equipment': ['equipment', 'machine', 'apparatus'],
+    'materials': ['material', 'supply', 'component'],
+    'software': ['software', 'application', 'program', 'system'],
+    'documentation': ['manual', 'guide', 'specification', 'standard']
+}
+
+VAGUE_RESOURCE_PHRASES = ['access to computer', 'appropriate tools', 'suitable equipment']
+
+SUPERVISION_ELEMENTS = {
+    'assessor_qualifications': ['tae40116', 'tae40110', 'qualified assessor', 'cert iv', 'certificate iv'],
+    'observation_requirements': ['observe', 'observation', 'monitor', 'supervise', 'oversee'],
+    'roles_responsibilities': ['role', 'responsibility', 'duty', 'accountable'],
+    'interaction_level': ['direct supervision', 'indirect supervision', 'remote supervision']
+}
+
+INTERACTION_ELEMENTS = {
+    'feedback': ['feedback', 'comment', 'response', 'review'],
+    'questioning': ['question', 'ask', 'inquiry', 'clarification'],
+    'briefing': ['briefing', 'pre-assessment', 'introduction', 'explanation'],
+    'debriefing': ['debrief', 'post-assessment', 'discussion', 'reflection']
+}
+
+THIRD_PARTY_KEYWORDS = ['third party', 'workplace supervisor', 'employer', 'witness', 'external']
+THIRD_PARTY_GUIDELINE_KEYWORDS = ['template', 'form', 'guideline', 'instruction', 'procedure']
+
+TIMING_ELEMENTS = {
+    'duration': ['duration', 'time limit', 'minutes', 'hours'],
+    'deadlines': ['deadline', 'due date', 'submit by', 'completion date'],
+    'scheduling': ['schedule', 'appointment', 'booking', 'time slot'],
+    'frequency': ['frequency', 'how often', 'regular', 'periodic']
+}
+
+VAGUE_TIMING_PHRASES = ['reasonable time', 'appropriate duration', 'sufficient time']
+
+INSTRUCTION_JARGON = [
+    'assessment', 'criteria', 'evidence', 'portfolio', 'competency',
+    'benchmark', 'rubric', 'holistic', 'formative', 'summative',
+    'authentic', 'validity', 'reliability', 'moderation'
+]
+
+UNCLEAR_PRONOUNS = ['this', 'that', 'these', 'those', 'it']
+
+INSTRUCTION_ESSENTIAL_ELEMENTS = {
+    'submission_requirements': ['submit', 'submission', 'due', 'deadline', 'hand in'],
+    'assessment_criteria': ['criteria', 'standard', 'benchmark', 'graded', 'marked'],
+    'steps_procedures': ['step', 'procedure', 'process', 'method', 'approach'],
+    'time_limits': ['time', 'duration', 'minutes', 'hours', 'deadline'],
+    'resources_needed': ['resource', 'material', 'equipment', 'tool', 'access'],
+    'format_requirements': ['format', 'structure', 'layout', 'presentation', 'style']
+}
+
+TIME_PATTERN = re.compile(r'\d+\s*(?:minutes?|hours?|days?)|\d+:\d+|\d+\s*(?:am|pm)')
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+DEFINITION_PATTERN = re.compile(
+    r'\bmeans\b|\brefers to\b|\bdefined as\b|\bis when\b|\binvolves\b|\binclude[s]?\b|\bfor example\b|\bsuch as\b'
+)
+PASSIVE_PATTERN = re.compile(r'\b(?:is|was|were|been)\s+\w+ed\b')
+DEADLINE_PATTERN = re.compile(r'due\s+(?:by\s+)?(\w+\s+\d+|\d+\s+\w+)')
+SUBMISSION_METHOD_PATTERN = re.compile(r'submit\s+(?:via|through|to)\s+(\w+)')
+TIME_LIMIT_PATTERN = re.compile(r'(\d+)\s+(?:minutes?|hours?)')
+FORMAT_PATTERN = re.compile(r'format\s+(?:should\s+be|must\s+be)\s+(\w+)')
+
+def _namespaced(prefix: str, groups: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    return {f"{prefix}.{name}": keywords for name, keywords in groups.items()}
+
 class AssessmentConditionsValidator(BaseValidator):
     """Validates training documents against Assessment Conditions (AC) requirements"""
     
+    UNIT_FIELDS = ("assessment_conditions",)
+    
+    # Every AC keyword list, matched in one pass per document
+    KEYWORD_MATCHER = KeywordMatcher({
+        **_namespaced("relevance", CATEGORY_KEYWORDS),
+        **_namespaced("environment", ENVIRONMENT_KEYWORDS),
+        "environment_specificity": ENVIRONMENT_SPECIFICITY_INDICATORS,
+        **_namespaced("resources", RESOURCE_CATEGORIES),
+        "vague_resources": VAGUE_RESOURCE_PHRASES,
+        **_namespaced("supervision", SUPERVISION_ELEMENTS),
+        "assessor": ["assessor"],
+        **_namespaced("interaction", INTERACTION_ELEMENTS),
+        "third_party": THIRD_PARTY_KEYWORDS,
+        "third_party_guidelines": THIRD_PARTY_GUIDELINE_KEYWORDS,
+        **_namespaced("timing", TIMING_ELEMENTS),
+        "vague_timing": VAGUE_TIMING_PHRASES,
+        "jargon": INSTRUCTION_JARGON,
+        "pronouns": UNCLEAR_PRONOUNS,
+        **_namespaced("completeness", INSTRUCTION_ESSENTIAL_ELEMENTS),
+    })
+    
     def __init__(self, strictness_level: str = "normal"):
         super().__init__(strictness_level)
         self.ac_categories = [
@@ -28,7 +141,8 @@ class AssessmentConditionsValidator(BaseValidator):
     def get_validation_type(cls) -> ValidationType:
         return ValidationType.ASSESSMENT_CONDITIONS
     
-    async def validate(self, training_unit: Dict[str, Any], documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def validate(self, training_unit: Dict[str, Any], documents: List[Dict[str, Any]],
+                       analyses: Optional[List[DocumentAnalysis]] = None) -> Dict[str, Any]:
         """Execute Assessment Conditions validation"""
         logger.info(f"Starting AC validation for unit {training_unit.get('unit_code')}")
         
@@ -39,9 +153,13 @@ class AssessmentConditionsValidator(BaseValidator):
         
         unit_assessment_conditions = training_unit.get("assessment_conditions", [])
         
+        if analyses is None:
+            analyses = analyse_documents(documents)
+        analysed = [analysis for analysis in analyses if analysis.content]
+        
         for category in self.ac_categories:
             category_result = await self._validate_category(
-                category, unit_assessment_conditions, documents
+                category, unit_assessment_conditions, analysed
             )
             findings[category] = category_result["findings"]
             scores[category] = category_result["score"]
@@ -61,14 +179,14 @@ class AssessmentConditionsValidator(BaseValidator):
             "strictness_level": self.strictness_level
         }
     
-    async def _validate_category(self, category: str, unit_conditions: List[Dict], documents: List[Dict]) -> Dict[str, Any]:
+    async def _validate_category(self, category: str, unit_conditions: List[Dict], analysed: List[DocumentAnalysis]) -> Dict[str, Any]:
         """Validate a specific AC category"""
         findings = []
         recommendations = []
         gaps = []
         score = 0
         
-        relevant_content = self._extract_relevant_content(category, documents)
+        relevant_content = self._extract_relevant_content(category, analysed)
         
         if category == "environment":
             score, category_findings, category_recommendations, category_gaps = await self._validate_environment(
@@ -110,35 +228,18 @@ class AssessmentConditionsValidator(BaseValidator):
             "gaps": [gap.to_dict() for gap in gaps]
         }
     
-    def _extract_relevant_content(self, category: str, documents: List[Dict]) -> List[str]:
-        """Extract content relevant to the AC category from documents"""
-        relevant_content = []
-        
-        for doc in documents:
-            content = doc.get("content_extracted", "")
-            if content and self._is_content_relevant(category, content):
-                relevant_content.append(content)
-        
-        return relevant_content
+    def _extract_relevant_content(self, category: str, analysed: List[DocumentAnalysis]) -> List[DocumentAnalysis]:
+        """Select the documents relevant to the AC category"""
+        return [
+            analysis for analysis in analysed
+            if analysis.scan(self.KEYWORD_MATCHER).has_any(f"relevance.{category}")
+        ]
     
-    def _is_content_relevant(self, category: str, content: str) -> bool:
-        """Check if content is relevant to the AC category"""
-        category_keywords = {
-            "environment": ["environment", "location", "workplace", "setting", "conditions", "simulated", "realistic"],
-            "resources": ["resource", "tool", "equipment", "material", "software", "checklist", "rubric"],
-            "supervision": ["supervisor", "assessor", "observer", "qualified", "TAE", "oversight", "monitoring"],
-            "instructions": ["instruction", "direction", "guideline", "procedure", "step", "requirement", "task"],
-            "interaction": ["interaction", "feedback", "question", "discussion", "briefing", "debrief", "communication"],
-            "third_party": ["third party", "witness", "employer", "supervisor report", "external", "workplace supervisor"],
-            "timing": ["time", "duration", "schedule", "deadline", "frequency", "minutes", "hours", "timeframe"]
-        }
-        
-        keywords = category_keywords.get(category, [])
-        content_lower = content.lower()
-        
-        return any(keyword in content_lower for keyword in keywords)
+    def _combined_scan(self, content: List[DocumentAnalysis]) -> KeywordScan:
+        """Keyword counts over all relevant documents"""
+        return self.KEYWORD_MATCHER.combined(analysis.scan(self.KEYWORD_MATCHER) for analysis in content)
     
-    async def _validate_environment(self, unit_conditions: List[Dict], content: List[str]) -> tuple:
+    async def _validate_environment(self, unit_conditions: List[Dict], content: List[DocumentAnalysis]) -> tuple:
         """Validate assessment environment with semantic analysis"""
         findings = []
         recommendations = []
@@ -156,21 +257,14 @@ class AssessmentConditionsValidator(BaseValidator):
             gaps.append(gap)
             return 30, findings, recommendations, gaps
         
-        combined_content = " ".join(content).lower()
-        
-        environment_keywords = {
-            'workplace': ['workplace', 'work site', 'on-site', 'real workplace', 'actual workplace'],
-            'simulated': ['simulated', 'simulation', 'mock', 'practice environment', 'training room'],
-            'conditions': ['realistic conditions', 'industry conditions', 'authentic conditions'],
-            'safety': ['safety', 'safe environment', 'safety requirements', 'safety equipment']
-        }
+        scan = self._combined_scan(content)
         
         category_scores = {}
-        for category, keywords in environment_keywords.items():
-            matches = sum(1 for keyword in keywords if keyword in combined_content)
+        for category in ENVIRONMENT_KEYWORDS:
+            matches = len(scan.found(f"environment.{category}"))
             category_scores[category] = min(100, matches * 25)
         
-        specificity_score = self._assess_environment_specificity(combined_content)
+        specificity_score = self._assess_environment_specificity(scan)
         
         overall_score = (
             sum(category_scores.values()) / len(category_scores) * 0.7 +
@@ -197,7 +291,7 @@ class AssessmentConditionsValidator(BaseValidator):
         
         return round(overall_score, 2), findings, recommendations, gaps
     
-    async def _validate_resources(self, unit_conditions: List[Dict], content: List[str]) -> tuple:
+    async def _validate_resources(self, unit_conditions: List[Dict], content: List[DocumentAnalysis]) -> tuple:
         """Validate necessary resources"""
         findings = []
         recommendations = []
@@ -215,26 +309,19 @@ class AssessmentConditionsValidator(BaseValidator):
             gaps.append(gap)
             return 35, findings, recommendations, gaps
         
-        combined_content = " ".join(content).lower()
-        
-        resource_categories = {
-            'tools': ['tool', 'instrument', 'device'],
-            'equipment': ['equipment', 'machine', 'apparatus'],
-            'materials': ['material', 'supply', 'component'],
-            'software': ['software', 'application', 'program', 'system'],
-            'documentation': ['manual', 'guide', 'specification', 'standard']
-        }
+        scan = self._combined_scan(content)
+        has_vague_resources = scan.has_any("vague_resources")
         
         found_categories = 0
         specificity_issues = []
         
-        for category, keywords in resource_categories.items():
-            if any(keyword in combined_content for keyword in keywords):
+        for category in RESOURCE_CATEGORIES:
+            if scan.has_any(f"resources.{category}"):
                 found_categories += 1
-                if any(vague in combined_content for vague in ['access to computer', 'appropriate tools', 'suitable equipment']):
+                if has_vague_resources:
                     specificity_issues.append(category)
         
-        base_score = (found_categories / len(resource_categories)) * 100
+        base_score = (found_categories / len(RESOURCE_CATEGORIES)) * 100
         
         if specificity_issues and self.strictness_level in ["normal", "strict"]:
             gap = ValidationGap(
@@ -254,11 +341,11 @@ class AssessmentConditionsValidator(BaseValidator):
             base_score *= 1.15
             base_score = min(100, base_score)
         
-        findings.append(f"Found {found_categories}/{len(resource_categories)} resource categories")
+        findings.append(f"Found {found_categories}/{len(RESOURCE_CATEGORIES)} resource categories")
         
         return round(base_score, 2), findings, recommendations, gaps
     
-    async def _validate_supervision(self, unit_conditions: List[Dict], content: List[str]) -> tuple:
+    async def _validate_supervision(self, unit_conditions: List[Dict], content: List[DocumentAnalysis]) -> tuple:
         """Validate supervision and observation requirements"""
         findings = []
         recommendations = []
@@ -276,23 +363,16 @@ class AssessmentConditionsValidator(BaseValidator):
             gaps.append(gap)
             return 30, findings, recommendations, gaps
         
-        combined_content = " ".join(content).lower()
-        
-        supervision_elements = {
-            'assessor_qualifications': ['tae40116', 'tae40110', 'qualified assessor', 'cert iv', 'certificate iv'],
-            'observation_requirements': ['observe', 'observation', 'monitor', 'supervise', 'oversee'],
-            'roles_responsibilities': ['role', 'responsibility', 'duty', 'accountable'],
-            'interaction_level': ['direct supervision', 'indirect supervision', 'remote supervision']
-        }
+        scan = self._combined_scan(content)
         
         found_elements = 0
-        for element, keywords in supervision_elements.items():
-            if any(keyword in combined_content for keyword in keywords):
+        for element in SUPERVISION_ELEMENTS:
+            if scan.has_any(f"supervision.{element}"):
                 found_elements += 1
         
-        base_score = (found_elements / len(supervision_elements)) * 100
+        base_score = (found_elements / len(SUPERVISION_ELEMENTS)) * 100
         
-        if 'assessor' in combined_content and not any(qual in combined_content for qual in supervision_elements['assessor_qualifications']):
+        if scan.has_any("assessor") and not scan.has_any("supervision.assessor_qualifications"):
             gap = ValidationGap(
                 gap_type="Unspecified Assessor Qualifications",
                 description="Assessor mentioned but qualifications not specified",
@@ -309,11 +389,11 @@ class AssessmentConditionsValidator(BaseValidator):
             base_score *= 1.15
             base_score = min(100, base_score)
         
-        findings.append(f"Found {found_elements}/{len(supervision_elements)} supervision elements")
+        findings.append(f"Found {found_elements}/{len(SUPERVISION_ELEMENTS)} supervision elements")
         
         return round(base_score, 2), findings, recommendations, gaps
     
-    async def _validate_instructions(self, unit_conditions: List[Dict], content: List[str]) -> tuple:
+    async def _validate_instructions(self, unit_conditions: List[Dict], content: List[DocumentAnalysis]) -> tuple:
         """Validate Assessment Instructions with clarity, completeness, and consistency checks"""
         findings = []
         recommendations = []
@@ -331,13 +411,16 @@ class AssessmentConditionsValidator(BaseValidator):
             gaps.append(gap)
             return 20, findings, recommendations, gaps
         
-        combined_content = " ".join(content)
+        combined_content = " ".join(analysis.content for analysis in content)
+        scan = self._combined_scan(content)
         
-        clarity_score = self._analyze_instruction_clarity(combined_content)
+        clarity_score = self._analyze_instruction_clarity(
+            combined_content, " ".join(analysis.normalised for analysis in content), scan
+        )
         
-        completeness_score = self._analyze_instruction_completeness(combined_content, unit_conditions)
+        completeness_score = self._analyze_instruction_completeness(scan, unit_conditions)
         
-        consistency_score = self._analyze_instruction_consistency(content)
+        consistency_score = self._analyze_instruction_consistency([analysis.normalised for analysis in content])
         
         if clarity_score < 70:
             gap = ValidationGap(
@@ -387,7 +470,7 @@ class AssessmentConditionsValidator(BaseValidator):
         
         return round(base_score, 2), findings, recommendations, gaps
     
-    async def _validate_interaction(self, unit_conditions: List[Dict], content: List[str]) -> tuple:
+    async def _validate_interaction(self, unit_conditions: List[Dict], content: List[DocumentAnalysis]) -> tuple:
         """Validate assessor interaction requirements"""
         findings = []
         recommendations = []
@@ -405,21 +488,14 @@ class AssessmentConditionsValidator(BaseValidator):
             gaps.append(gap)
             return 40, findings, recommendations, gaps
         
-        combined_content = " ".join(content).lower()
-        
-        interaction_elements = {
-            'feedback': ['feedback', 'comment', 'response', 'review'],
-            'questioning': ['question', 'ask', 'inquiry', 'clarification'],
-            'briefing': ['briefing', 'pre-assessment', 'introduction', 'explanation'],
-            'debriefing': ['debrief', 'post-assessment', 'discussion', 'reflection']
-        }
+        scan = self._combined_scan(content)
         
         found_elements = 0
-        for element, keywords in interaction_elements.items():
-            if any(keyword in combined_content for keyword in keywords):
+        for element in INTERACTION_ELEMENTS:
+            if scan.has_any(f"interaction.{element}"):
                 found_elements += 1
         
-        base_score = (found_elements / len(interaction_elements)) * 100
+        base_score = (found_elements / len(INTERACTION_ELEMENTS)) * 100
         
         if self.strictness_level == "strict":
             base_score *= 0.85
@@ -427,27 +503,25 @@ class AssessmentConditionsValidator(BaseValidator):
             base_score *= 1.15
             base_score = min(100, base_score)
         
-        findings.append(f"Found {found_elements}/{len(interaction_elements)} interaction elements")
+        findings.append(f"Found {found_elements}/{len(INTERACTION_ELEMENTS)} interaction elements")
         
         return round(base_score, 2), findings, recommendations, gaps
     
-    async def _validate_third_party(self, unit_conditions: List[Dict], content: List[str]) -> tuple:
+    async def _validate_third_party(self, unit_conditions: List[Dict], content: List[DocumentAnalysis]) -> tuple:
         """Validate third-party reports requirements"""
         findings = []
         recommendations = []
         gaps = []
         
-        combined_content = " ".join(content).lower() if content else ""
+        scan = self._combined_scan(content)
         
-        third_party_keywords = ['third party', 'workplace supervisor', 'employer', 'witness', 'external']
-        has_third_party = any(keyword in combined_content for keyword in third_party_keywords)
+        has_third_party = scan.has_any("third_party")
         
         if not has_third_party:
             base_score = 75  # Neutral score
             findings.append("No third-party reporting requirements identified")
         else:
-            guideline_keywords = ['template', 'form', 'guideline', 'instruction', 'procedure']
-            has_guidelines = any(keyword in combined_content for keyword in guideline_keywords)
+            has_guidelines = scan.has_any("third_party_guidelines")
             
             if not has_guidelines:
                 gap = ValidationGap(
@@ -472,7 +546,7 @@ class AssessmentConditionsValidator(BaseValidator):
         
         return round(base_score, 2), findings, recommendations, gaps
     
-    async def _validate_timing(self, unit_conditions: List[Dict], content: List[str]) -> tuple:
+    async def _validate_timing(self, unit_conditions: List[Dict], content: List[DocumentAnalysis]) -> tuple:
         """Validate time constraints and timing requirements"""
         findings = []
         recommendations = []
@@ -490,33 +564,24 @@ class AssessmentConditionsValidator(BaseValidator):
             gaps.append(gap)
             return 45, findings, recommendations, gaps
         
-        combined_content = " ".join(content).lower()
-        
-        timing_elements = {
-            'duration': ['duration', 'time limit', 'minutes', 'hours'],
-            'deadlines': ['deadline', 'due date', 'submit by', 'completion date'],
-            'scheduling': ['schedule', 'appointment', 'booking', 'time slot'],
-            'frequency': ['frequency', 'how often', 'regular', 'periodic']
-        }
+        scan = self._combined_scan(content)
         
         found_elements = 0
         specific_times = []
         
-        for element, keywords in timing_elements.items():
-            if any(keyword in combined_content for keyword in keywords):
+        for element in TIMING_ELEMENTS:
+            if scan.has_any(f"timing.{element}"):
                 found_elements += 1
         
-        time_patterns = [r'\d+\s*(?:minutes?|hours?|days?)', r'\d+:\d+', r'\d+\s*(?:am|pm)']
-        for pattern in time_patterns:
-            matches = re.findall(pattern, combined_content)
-            specific_times.extend(matches)
+        for analysis in content:
+            specific_times.extend(TIME_PATTERN.findall(analysis.normalised))
         
-        base_score = (found_elements / len(timing_elements)) * 100
+        base_score = (found_elements / len(TIMING_ELEMENTS)) * 100
         
         if specific_times:
             base_score = min(100, base_score + len(specific_times) * 5)
         
-        if any(vague in combined_content for vague in ['reasonable time', 'appropriate duration', 'sufficient time']):
+        if scan.has_any("vague_timing"):
             gap = ValidationGap(
                 gap_type="Vague Timing",
                 description="Timing requirements are too vague or non-specific",
@@ -534,86 +599,57 @@ class AssessmentConditionsValidator(BaseValidator):
             base_score *= 1.15
             base_score = min(100, base_score)
         
-        findings.append(f"Found {found_elements}/{len(timing_elements)} timing elements, {len(specific_times)} specific times")
+        findings.append(f"Found {found_elements}/{len(TIMING_ELEMENTS)} timing elements, {len(specific_times)} specific times")
         
         return round(base_score, 2), findings, recommendations, gaps
     
-    def _assess_environment_specificity(self, content: str) -> float:
+    def _assess_environment_specificity(self, scan: KeywordScan) -> float:
         """Assess how specific the environment description is"""
-        specificity_indicators = [
-            'specific location', 'address', 'room number', 'building',
-            'equipment list', 'software version', 'model number',
-            'temperature', 'lighting', 'noise level', 'space requirements'
-        ]
-        
-        matches = sum(1 for indicator in specificity_indicators if indicator in content)
+        matches = len(scan.found("environment_specificity"))
         return min(100, matches * 10)
     
-    def _analyze_instruction_clarity(self, content: str) -> float:
+    def _analyze_instruction_clarity(self, content: str, content_lower: str, scan: KeywordScan) -> float:
         """Analyze clarity of assessment instructions using enhanced NLP"""
         if not content:
             return 0
         
+        # textstat loads its hyphenation dictionaries on import; only this check needs it
+        import textstat
         flesch_score = textstat.flesch_reading_ease(content)
         
-        sentences = re.split(r'[.!?]+', content)
+        sentences = SENTENCE_SPLIT.split(content)
         complex_sentences = sum(1 for s in sentences if len(s.split()) > 25)
         complexity_penalty = (complex_sentences / len(sentences)) * 30 if sentences else 0
         
-        jargon_words = [
-            'assessment', 'criteria', 'evidence', 'portfolio', 'competency',
-            'benchmark', 'rubric', 'holistic', 'formative', 'summative',
-            'authentic', 'validity', 'reliability', 'moderation'
-        ]
-        jargon_count = sum(content.lower().count(word) for word in jargon_words)
+        jargon_count = scan.total("jargon")
         
-        definition_patterns = [
-            r'\bmeans\b', r'\brefers to\b', r'\bdefined as\b', r'\bis when\b',
-            r'\binvolves\b', r'\binclude[s]?\b', r'\bfor example\b', r'\bsuch as\b'
-        ]
-        definitions_count = sum(len(re.findall(pattern, content.lower())) for pattern in definition_patterns)
+        definitions_count = len(DEFINITION_PATTERN.findall(content_lower))
         
         jargon_penalty = max(0, (jargon_count - definitions_count) * 1.5)
         
-        passive_patterns = [r'\bis\s+\w+ed\b', r'\bwas\s+\w+ed\b', r'\bwere\s+\w+ed\b', r'\bbeen\s+\w+ed\b']
-        passive_count = sum(len(re.findall(pattern, content.lower())) for pattern in passive_patterns)
+        passive_count = len(PASSIVE_PATTERN.findall(content_lower))
         passive_penalty = min(15, passive_count * 2)
         
-        unclear_pronouns = ['this', 'that', 'these', 'those', 'it']
-        pronoun_count = sum(content.lower().count(pronoun) for pronoun in unclear_pronouns)
+        pronoun_count = scan.total("pronouns")
         pronoun_penalty = min(10, pronoun_count * 0.5)
         
         clarity_score = max(0, min(100, (flesch_score + 100) / 2 - complexity_penalty - jargon_penalty - passive_penalty - pronoun_penalty))
         
         return clarity_score
     
-    def _analyze_instruction_completeness(self, content: str, unit_conditions: List[Dict]) -> float:
+    def _analyze_instruction_completeness(self, scan: KeywordScan, unit_conditions: List[Dict]) -> float:
         """Analyze completeness of assessment instructions"""
-        if not content:
-            return 0
-        
-        content_lower = content.lower()
-        
-        essential_elements = {
-            'submission_requirements': ['submit', 'submission', 'due', 'deadline', 'hand in'],
-            'assessment_criteria': ['criteria', 'standard', 'benchmark', 'graded', 'marked'],
-            'steps_procedures': ['step', 'procedure', 'process', 'method', 'approach'],
-            'time_limits': ['time', 'duration', 'minutes', 'hours', 'deadline'],
-            'resources_needed': ['resource', 'material', 'equipment', 'tool', 'access'],
-            'format_requirements': ['format', 'structure', 'layout', 'presentation', 'style']
-        }
-        
         present_elements = 0
-        for element, keywords in essential_elements.items():
-            if any(keyword in content_lower for keyword in keywords):
+        for element in INSTRUCTION_ESSENTIAL_ELEMENTS:
+            if scan.has_any(f"completeness.{element}"):
                 present_elements += 1
         
-        completeness_score = (present_elements / len(essential_elements)) * 100
+        completeness_score = (present_elements / len(INSTRUCTION_ESSENTIAL_ELEMENTS)) * 100
         
         return completeness_score
     
     def _analyze_instruction_consistency(self, content_list: List[str]) -> float:
-        """Analyze consistency of instructions across multiple documents"""
+        """Analyze consistency of instructions across multiple (lower-cased) documents"""
         if len(content_list) < 2:
             return 100  # Single document is consistent by default
         
@@ -637,15 +673,13 @@ class AssessmentConditionsValidator(BaseValidator):
         consistency_score = max(0, 100 - (consistency_issues / total_comparisons) * 100)
         return consistency_score
     
-    def _extract_instruction_elements(self, content: str) -> Dict[str, List[str]]:
-        """Extract key instruction elements from content"""
-        content_lower = content.lower()
-        
+    def _extract_instruction_elements(self, content_lower: str) -> Dict[str, List[str]]:
+        """Extract key instruction elements from lower-cased content"""
         elements = {
-            'deadlines': re.findall(r'due\s+(?:by\s+)?(\w+\s+\d+|\d+\s+\w+)', content_lower),
-            'submission_methods': re.findall(r'submit\s+(?:via|through|to)\s+(\w+)', content_lower),
-            'time_limits': re.findall(r'(\d+)\s+(?:minutes?|hours?)', content_lower),
-            'formats': re.findall(r'format\s+(?:should\s+be|must\s+be)\s+(\w+)', content_lower)
+            'deadlines': DEADLINE_PATTERN.findall(content_lower),
+            'submission_methods': SUBMISSION_METHOD_PATTERN.findall(content_lower),
+            'time_limits': TIME_LIMIT_PATTERN.findall(content_lower),
+            'formats': FORMAT_PATTERN.findall(content_lower)
         }
         
         return elements
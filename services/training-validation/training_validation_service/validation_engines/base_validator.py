@@ -1,11 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 from models.validation_models import TrainingUnit, ValidationDocument, ValidationResult, ValidationType
+from .document_analysis import DocumentAnalysis
 
 class BaseValidator(ABC):
     """Base class for all validation engines."""
     
+    # Training unit fields the engine reads. A stored result is reused while these, the
+    # documents and the strictness level are unchanged; None means the whole unit.
+    UNIT_FIELDS: Optional[Tuple[str, ...]] = None
+    # Bump when the engine's logic changes so stored results are recomputed
+    RESULT_VERSION = 1
+    
     def __init__(self, strictness_level: str = "normal"):
         """Initialize the validator with a strictness level."""
         self.strictness_level = strictness_level
@@ -17,11 +24,19 @@ class BaseValidator(ABC):
         """Return the type of validation this engine performs."""
         pass
     
+    @classmethod
+    def unit_inputs(cls, training_unit: Dict[str, Any]) -> Dict[str, Any]:
+        """The part of the training unit this engine's result depends on"""
+        if cls.UNIT_FIELDS is None:
+            return dict(training_unit)
+        return {name: training_unit.get(name) for name in ("unit_code",) + cls.UNIT_FIELDS}
+    
     @abstractmethod
     async def validate(
         self, 
         training_unit: TrainingUnit, 
-        documents: List[ValidationDocument]
+        documents: List[ValidationDocument],
+        analyses: Optional[List[DocumentAnalysis]] = None
     ) -> ValidationResult:
         """
         Validate documents against the training unit.
@@ -29,6 +44,8 @@ class BaseValidator(ABC):
         Args:
             training_unit: The training unit to validate against
             documents: List of documents to validate
+            analyses: Shared per-request analysis of each document, in document order;
+                      built from the documents when not provided
             
         Returns:
             ValidationResult containing the validation outcome
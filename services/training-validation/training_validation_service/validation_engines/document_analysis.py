@@ -0,0 +1,205 @@
+import os
+import hashlib
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from models.document_elements import DocumentElements
+from models.validation_models import ValidationDocument
+from .keyword_matcher import SENTENCE_BOUNDARY, KeywordMatcher, KeywordScan
+
+# Characters of document text whose analyses are kept across requests (least recently used evicted)
+DOCUMENT_ANALYSIS_CACHE_CHARS = int(os.getenv("DOCUMENT_ANALYSIS_CACHE_CHARS", str(50_000_000)))
+
+# Words ignored when extracting key terms from requirements and content
+STOP_WORDS = frozenset({
+    "the", "and", "or", "of", "to", "in", "for", "with", "by", "from", "a", "an",
+    "is", "are", "be", "have", "has", "will", "can", "may", "must", "should"
+})
+
+# Punctuation stripped from whitespace-separated tokens
+TOKEN_PUNCTUATION = ".,!?;:"
+
+def is_key_term(term: str, min_length: int = 3) -> bool:
+    return len(term) >= min_length and term not in STOP_WORDS
+
+def key_terms(text: str, min_length: int = 3) -> List[str]:
+    """Lower-cased whitespace tokens of at least min_length characters that are not stop words"""
+    terms = []
+    for word in text.lower().split():
+        term = word.strip(TOKEN_PUNCTUATION)
+        if is_key_term(term, min_length):
+            terms.append(term)
+    return terms
+
+@dataclass(frozen=True, slots=True)
+class DocumentAnalysis:
+    """
+    Normalised text and derived structure for one document, built once per request.
+
+    Every validator receives the same instances, so the document is lower-cased,
+    tokenised and sentence-split once instead of once per validator. Instances are
+    immutable; sentence offsets and the token stream are stored as machine-word arrays
+    (tokens as ids into a per-document vocabulary) and term frequencies behind a
+    read-only mapping. Keyword scans are memoised per matcher.
+    """
+    filename: str
+    content: str
+    normalised: str
+    # Sentence i spans content[sentence_starts[i]:sentence_ends[i]]
+    sentence_starts: array
+    sentence_ends: array
+    # Tokens of sentence i are token_ids[sentence_token_offsets[i]:sentence_token_offsets[i + 1]]
+    vocabulary: Tuple[str, ...]
+    token_ids: array
+    sentence_token_offsets: array
+    term_frequencies: Mapping[str, int]
+    # Element types and pages by offset into content, when the document has them stored
+    elements: Optional[DocumentElements] = None
+    _scans: Dict[int, KeywordScan] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_document(cls, document: Union[Dict[str, Any], ValidationDocument]) -> "DocumentAnalysis":
+        if isinstance(document, ValidationDocument):
+            filename, content, elements = document.filename, document.content_extracted, document.elements
+        else:
+            filename, content = document.get("filename", "Unknown"), document.get("content_extracted", "")
+            elements = document.get("elements")
+        if not isinstance(elements, DocumentElements):
+            elements = None
+        content = content or ""
+        normalised = content.lower()
+
+        starts, ends = array("L"), array("L")
+        position = 0
+        for boundary in SENTENCE_BOUNDARY.finditer(content):
+            starts.append(position)
+            ends.append(boundary.start())
+            position = boundary.end()
+        if position < len(content):
+            starts.append(position)
+            ends.append(len(content))
+
+        # Tokenise sentence by sentence so sentence-level statistics need no second pass
+        text = normalised if len(normalised) == len(content) else None
+        ids: Dict[str, int] = {}
+        token_ids, token_offsets = array("L"), array("L", [0])
+        for start, end in zip(starts, ends):
+            words = (text[start:end] if text is not None else content[start:end].lower()).split()
+            token_ids.extend([
+                ids.setdefault(term, len(ids))
+                for term in (word.strip(TOKEN_PUNCTUATION) for word in words) if term
+            ])
+            token_offsets.append(len(token_ids))
+
+        vocabulary = tuple(ids)
+        frequencies = {vocabulary[term_id]: count for term_id, count in Counter(token_ids).items()}
+
+        return cls(
+            filename=filename,
+            content=content,
+            normalised=normalised,
+            sentence_starts=starts,
+            sentence_ends=ends,
+            vocabulary=vocabulary,
+            token_ids=token_ids,
+            sentence_token_offsets=token_offsets,
+            term_frequencies=MappingProxyType(frequencies),
+            elements=elements,
+        )
+
+    @property
+    def tokens(self):
+        """Distinct normalised tokens (a set-like view, not a copy)"""
+        return self.term_frequencies.keys()
+
+    def key_terms(self, min_length: int = 3) -> frozenset:
+        return frozenset(term for term in self.term_frequencies if is_key_term(term, min_length))
+
+    @property
+    def sentence_count(self) -> int:
+        return len(self.sentence_starts)
+
+    def sentence(self, index: int) -> str:
+        return self.content[self.sentence_starts[index]:self.sentence_ends[index]]
+
+    def sentence_page(self, index: int) -> Optional[int]:
+        """Page the sentence starts on, when element pages are known"""
+        if self.elements is None:
+            return None
+        return self.elements.page_at(self.sentence_starts[index])
+
+    def sentences(self, limit: Optional[int] = None) -> Iterator[str]:
+        """Sentences of the original text, in order"""
+        count = self.sentence_count if limit is None else min(limit, self.sentence_count)
+        for i in range(count):
+            yield self.content[self.sentence_starts[i]:self.sentence_ends[i]]
+
+    def scan(self, matcher: KeywordMatcher) -> KeywordScan:
+        """Keyword scan of the normalised text, shared by every caller using the same matcher"""
+        scan = self._scans.get(id(matcher))
+        if scan is None:
+            # Offsets into content only hold while lower-casing kept the length (it does except for a few Unicode characters)
+            sentence_ends = self.sentence_ends if len(self.normalised) == len(self.content) else None
+            scan = self._scans[id(matcher)] = matcher.scan(self.normalised, normalised=True, sentence_ends=sentence_ends)
+        return scan
+
+class AnalysisCache:
+    """
+    DocumentAnalysis instances of recent documents, keyed by filename and content hash.
+
+    Analyses are immutable apart from their memoised keyword scans, which depend only on
+    the text and the (class-level) matcher, so a re-validation that changes one document
+    re-analyses and re-scans only that one. Bounded by total characters of cached text.
+    """
+    def __init__(self, max_chars: int = DOCUMENT_ANALYSIS_CACHE_CHARS):
+        self.max_chars = max_chars
+        self._entries: "OrderedDict[Tuple[str, str], DocumentAnalysis]" = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def analyse(self, document: Union[Dict[str, Any], ValidationDocument]) -> "DocumentAnalysis":
+        if isinstance(document, ValidationDocument):
+            filename, content, elements = document.filename, document.content_extracted, document.elements
+        else:
+            filename, content = document.get("filename", "Unknown"), document.get("content_extracted", "")
+            elements = document.get("elements")
+        if self.max_chars <= 0:
+            return DocumentAnalysis.from_document(document)
+        key = (filename, hashlib.sha256((content or "").encode("utf-8")).hexdigest())
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if analysis is None:
+            self.misses += 1
+            analysis = DocumentAnalysis.from_document(document)
+            size = len(analysis.content)
+            if size <= self.max_chars:
+                with self._lock:
+                    if key not in self._entries:
+                        self._entries[key] = analysis
+                        self._chars += size
+                    while self._chars > self.max_chars:
+                        _, evicted = self._entries.popitem(last=False)
+                        self._chars -= len(evicted.content)
+        elif isinstance(elements, DocumentElements) and analysis.elements is not elements:
+            # Same text, this request's element columns; the scan memo is shared
+            analysis = replace(analysis, elements=elements)
+        return analysis
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+analysis_cache = AnalysisCache()
+
+def analyse_documents(documents: List[Union[Dict[str, Any], ValidationDocument]]) -> List["DocumentAnalysis"]:
+    return [analysis_cache.analyse(document) for document in documents]
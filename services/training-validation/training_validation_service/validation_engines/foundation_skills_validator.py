@@ -1,31 +1,43 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 from .validation_gap import ValidationGap
 from .base_validator import BaseValidator
+from .keyword_matcher import KeywordMatcher
+from .document_analysis import DocumentAnalysis, analyse_documents, key_terms
 from models.validation_models import ValidationType, TrainingUnit, ValidationDocument, ValidationResult
 
 logger = logging.getLogger(__name__)
 
+FOUNDATION_SKILLS_CATEGORIES = {
+    "literacy": ["reading", "writing", "communication", "language", "vocabulary"],
+    "numeracy": ["mathematics", "calculation", "measurement", "data", "statistics"],
+    "digital_literacy": ["computer", "technology", "digital", "software", "online"],
+    "critical_thinking": ["analysis", "problem solving", "decision making", "evaluation"],
+    "teamwork": ["collaboration", "team", "group work", "cooperation"],
+    "learning": ["learning", "study", "research", "self-directed"]
+}
+
+ASSESSMENT_KEYWORDS = ["assess", "evaluate", "test", "measure", "demonstrate"]
+
 class FoundationSkillsValidator(BaseValidator):
     """Validates training documents against Foundation Skills (FS) requirements"""
     
+    UNIT_FIELDS = ("foundation_skills",)
+    
+    # Skill categories plus assessment keywords, matched in one pass per document
+    KEYWORD_MATCHER = KeywordMatcher({**FOUNDATION_SKILLS_CATEGORIES, "_assessment": ASSESSMENT_KEYWORDS})
+    
     def __init__(self, strictness_level: str = "normal"):
         super().__init__(strictness_level)
-        self.foundation_skills_categories = {
-            "literacy": ["reading", "writing", "communication", "language", "vocabulary"],
-            "numeracy": ["mathematics", "calculation", "measurement", "data", "statistics"],
-            "digital_literacy": ["computer", "technology", "digital", "software", "online"],
-            "critical_thinking": ["analysis", "problem solving", "decision making", "evaluation"],
-            "teamwork": ["collaboration", "team", "group work", "cooperation"],
-            "learning": ["learning", "study", "research", "self-directed"]
-        }
+        self.foundation_skills_categories = FOUNDATION_SKILLS_CATEGORIES
     
     @classmethod
     def get_validation_type(cls) -> ValidationType:
         return ValidationType.FOUNDATION_SKILLS
     
-    async def validate(self, training_unit: Dict[str, Any], documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def validate(self, training_unit: Dict[str, Any], documents: List[Dict[str, Any]],
+                       analyses: Optional[List[DocumentAnalysis]] = None) -> Dict[str, Any]:
         """Execute Foundation Skills validation"""
         logger.info(f"Starting FS validation for unit {training_unit.get('unit_code')}")
         
@@ -41,7 +53,10 @@ class FoundationSkillsValidator(BaseValidator):
                 "skill_coverage": {}
             }
         
-        skills_coverage = await self._analyze_foundation_skills_coverage(unit_foundation_skills, documents)
+        if analyses is None:
+            analyses = analyse_documents(documents)
+        
+        skills_coverage = await self._analyze_foundation_skills_coverage(unit_foundation_skills, analyses)
         
         gaps = self._identify_fs_gaps(skills_coverage, unit_foundation_skills)
         recommendations = self._generate_fs_recommendations(skills_coverage, gaps)
@@ -61,11 +76,14 @@ class FoundationSkillsValidator(BaseValidator):
             "skills_breakdown": skills_coverage
         }
     
-    async def _analyze_foundation_skills_coverage(self, unit_skills: List[Dict], documents: List[Dict]) -> Dict[str, Any]:
+    async def _analyze_foundation_skills_coverage(self, unit_skills: List[Dict], analyses: List[DocumentAnalysis]) -> Dict[str, Any]:
         """Analyze foundation skills coverage in documents"""
         coverage_analysis = {}
         
-        for category, keywords in self.foundation_skills_categories.items():
+        # One scan per document covers every category and the assessment keywords
+        scans = [analysis.scan(self.KEYWORD_MATCHER) for analysis in analyses]
+        
+        for category in self.foundation_skills_categories:
             coverage_analysis[category] = {
                 "coverage_score": 0,
                 "keyword_matches": [],
@@ -74,39 +92,24 @@ class FoundationSkillsValidator(BaseValidator):
             }
             
             total_matches = 0
-            found_keywords = set()
+            found_keywords = []
             supporting_content = []
             
-            for doc in documents:
-                content = doc.get("content_extracted", "").lower()
-                
-                for keyword in keywords:
-                    matches = content.count(keyword)
-                    if matches > 0:
-                        total_matches += matches
-                        found_keywords.add(keyword)
-                        
-                        sentences = content.split('.')
-                        for sentence in sentences:
-                            if keyword in sentence and len(sentence.strip()) > 20:
-                                supporting_content.append(sentence.strip()[:200])
-                                if len(supporting_content) >= 3:
-                                    break
+            for scan in scans:
+                total_matches += scan.total(category)
+                found_keywords.extend(k for k in scan.found(category) if k not in found_keywords)
+                if len(supporting_content) < 3:
+                    supporting_content.extend(scan.sentences(
+                        category, min_length=20, limit=3 - len(supporting_content), max_chars=200
+                    ))
+                if scan.has_any(category) and scan.has_any("_assessment"):
+                    coverage_analysis[category]["assessment_integration"] = True
             
-            coverage_analysis[category]["keyword_matches"] = list(found_keywords)
-            coverage_analysis[category]["supporting_content"] = supporting_content[:3]  # Limit to 3 examples
+            coverage_analysis[category]["keyword_matches"] = found_keywords
+            coverage_analysis[category]["supporting_content"] = supporting_content  # Limited to 3 examples
             
             if total_matches > 0:
                 coverage_analysis[category]["coverage_score"] = min(100, total_matches * 15)
-            
-            assessment_keywords = ["assess", "evaluate", "test", "measure", "demonstrate"]
-            for doc in documents:
-                content = doc.get("content_extracted", "").lower()
-                for keyword in keywords:
-                    for assess_keyword in assessment_keywords:
-                        if keyword in content and assess_keyword in content:
-                            coverage_analysis[category]["assessment_integration"] = True
-                            break
         
         return coverage_analysis
     
@@ -231,14 +234,4 @@ class FoundationSkillsValidator(BaseValidator):
     
     def _extract_element_key_terms(self, text: str) -> List[str]:
         """Extract key terms from element or performance criteria text"""
-        common_words = {"the", "and", "or", "of", "to", "in", "for", "with", "by", "from", "a", "an", "is", "are", "be", "have", "has", "will", "can", "may", "must", "should"}
-        
-        words = text.split()
-        key_terms = []
-        
-        for word in words:
-            clean_word = word.strip(".,!?;:")
-            if len(clean_word) > 3 and clean_word not in common_words:
-                key_terms.append(clean_word)
-        
-        return key_terms[:5]  # Return top 5 key terms
+        return key_terms(text, min_length=4)[:5]  # Return top 5 key terms
@@ -0,0 +1,164 @@
+import re
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Sentence boundaries used for supporting-content spans
+SENTENCE_BOUNDARY = re.compile(r"[.!?]+")
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """Build a regex that matches the longest keyword starting at a position.
+
+    Keywords are folded into a character trie so the engine checks one branch per
+    leading character instead of every keyword in turn.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def render(node: Dict) -> str:
+        terminal = "" in node
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Optional suffix: the greedy match prefers the longer keyword
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+class KeywordScan:
+    """Keyword hits for one scanned text (or the combined counts of several scans)"""
+
+    def __init__(self, matcher: "KeywordMatcher", text: Optional[str], counts: Counter,
+                 positions: Dict[str, List[int]], sentence_ends: Optional[Sequence[int]] = None):
+        self.matcher = matcher
+        self.text = text
+        self.counts = counts
+        self.positions = positions
+        self._sentence_ends = sentence_ends
+
+    @classmethod
+    def combine(cls, matcher: "KeywordMatcher", scans: Iterable["KeywordScan"]) -> "KeywordScan":
+        """Sum the counts of several scans; the result has no text or sentence spans"""
+        counts: Counter = Counter()
+        for scan in scans:
+            counts.update(scan.counts)
+        return cls(matcher, None, counts, {})
+
+    def count(self, keyword: str) -> int:
+        return self.counts.get(keyword.lower(), 0)
+
+    def found(self, category: str) -> List[str]:
+        """Keywords of the category that occur at least once, in category order"""
+        return [keyword for keyword in self.matcher.categories[category] if self.counts.get(keyword)]
+
+    def has_any(self, category: str) -> bool:
+        return any(self.counts.get(keyword) for keyword in self.matcher.categories[category])
+
+    def total(self, category: str) -> int:
+        """Total occurrences of all keywords in the category"""
+        return sum(self.counts.get(keyword, 0) for keyword in self.matcher.categories[category])
+
+    def sentence_spans(self, category: str, min_length: int = 0, limit: Optional[int] = None) -> List[Tuple[int, int]]:
+        """Distinct (start, end) spans of sentences containing a hit from the category, in text order"""
+        if self.text is None:
+            raise ValueError("Sentence spans are only available for a single scanned text")
+        if self._sentence_ends is None:
+            self._sentence_ends = [m.start() for m in SENTENCE_BOUNDARY.finditer(self.text)]
+        ends = self._sentence_ends
+
+        hit_positions = sorted(
+            position
+            for keyword in self.matcher.categories[category]
+            for position in self.positions.get(keyword, ())
+        )
+        spans: List[Tuple[int, int]] = []
+        seen = set()
+        for position in hit_positions:
+            index = bisect_right(ends, position)
+            if index in seen:
+                continue
+            seen.add(index)
+            start = SENTENCE_BOUNDARY.match(self.text, ends[index - 1]).end() if index else 0
+            end = ends[index] if index < len(ends) else len(self.text)
+            if len(self.text[start:end].strip()) <= min_length:
+                continue
+            spans.append((start, end))
+            if limit is not None and len(spans) >= limit:
+                break
+        return spans
+
+    def sentences(self, category: str, min_length: int = 0, limit: Optional[int] = None,
+                  max_chars: Optional[int] = None) -> List[str]:
+        return [self.text[start:end].strip()[:max_chars] for start, end in self.sentence_spans(category, min_length, limit)]
+
+class KeywordMatcher:
+    """
+    Matches every keyword of a fixed set of categories in a single pass over the text.
+
+    Matching is case-insensitive substring matching, the same semantics as
+    ``keyword in text.lower()`` and ``text.lower().count(keyword)`` (except that a
+    keyword overlapping itself, like "aa" in "aaa", counts every start). The compiled
+    pattern finds the longest keyword at each match position; shorter keywords that
+    are prefixes of it are credited from a precomputed table, and only the offsets
+    inside a match where another keyword could start are re-checked, so overlapping
+    keywords (e.g. "supervisor" and "supervisor report") are all counted.
+
+    Build one matcher per validator class and reuse it for every document.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self.categories: Dict[str, List[str]] = {
+            name: list(dict.fromkeys(keyword.lower() for keyword in keywords if keyword))
+            for name, keywords in categories.items()
+        }
+        keywords = sorted({keyword for group in self.categories.values() for keyword in group})
+        keyword_set = set(keywords)
+        # Keywords matched at a position: the longest match plus its keyword prefixes
+        self._implied = {
+            keyword: [keyword[:i] for i in range(1, len(keyword) + 1) if keyword[:i] in keyword_set]
+            for keyword in keywords
+        }
+        # Offsets inside a matched keyword where another keyword could also start
+        self._interior = {
+            keyword: [
+                i for i in range(1, len(keyword))
+                if any(other.startswith(keyword[i:]) or keyword[i:].startswith(other) for other in keywords)
+            ]
+            for keyword in keywords
+        }
+        self.pattern = re.compile(_trie_pattern(keywords)) if keywords else None
+
+    def scan(self, text: str, normalised: bool = False, sentence_ends: Optional[Sequence[int]] = None) -> KeywordScan:
+        """Scan text once and return hit counts and positions for every keyword.
+
+        sentence_ends may pass precomputed SENTENCE_BOUNDARY offsets for the text.
+        """
+        text = text if normalised else text.lower()
+        counts: Counter = Counter()
+        positions: Dict[str, List[int]] = {}
+        if self.pattern is not None:
+            pattern, implied, interior = self.pattern, self._implied, self._interior
+
+            def credit(longest: str, start: int):
+                for keyword in implied[longest]:
+                    counts[keyword] += 1
+                    positions.setdefault(keyword, []).append(start)
+
+            for match in pattern.finditer(text):
+                start, longest = match.start(), match.group()
+                credit(longest, start)
+                for offset in interior[longest]:
+                    overlap = pattern.match(text, start + offset)
+                    if overlap:
+                        credit(overlap.group(), start + offset)
+        return KeywordScan(self, text, counts, positions, sentence_ends)
+
+    def combined(self, scans: Iterable[KeywordScan]) -> KeywordScan:
+        return KeywordScan.combine(self, scans)
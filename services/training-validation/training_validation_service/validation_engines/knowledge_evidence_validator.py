@@ -1,16 +1,34 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 import re
 from .validation_gap import ValidationGap
 from .base_validator import BaseValidator
+from .keyword_matcher import KeywordMatcher, KeywordScan
+from .document_analysis import DocumentAnalysis, analyse_documents, key_terms
+from .sentence_index import SentenceIndex
 from models.validation_models import ValidationType, TrainingUnit, ValidationDocument, ValidationResult
 
 logger = logging.getLogger(__name__)
 
+# Requirement term -> related terms credited when they appear in the content
+RELATED_TERM_MAPPINGS = {
+    'safety': ['hazard', 'risk', 'protection', 'secure'],
+    'quality': ['standard', 'excellence', 'grade', 'level'],
+    'process': ['procedure', 'method', 'workflow', 'system'],
+    'communication': ['interaction', 'dialogue', 'discussion', 'exchange'],
+    'management': ['administration', 'supervision', 'control', 'oversight'],
+    'technical': ['technology', 'equipment', 'machinery', 'tools'],
+    'compliance': ['regulation', 'standard', 'requirement', 'guideline']
+}
+
 class KnowledgeEvidenceValidator(BaseValidator):
     """Validates training documents against Knowledge Evidence (KE) requirements"""
     
+    UNIT_FIELDS = ("knowledge_evidence",)
+    
+    KEYWORD_MATCHER = KeywordMatcher(RELATED_TERM_MAPPINGS)
+    
     def __init__(self, strictness_level: str = "normal"):
         super().__init__(strictness_level)
     
@@ -18,7 +36,8 @@ class KnowledgeEvidenceValidator(BaseValidator):
     def get_validation_type(cls) -> ValidationType:
         return ValidationType.KNOWLEDGE_EVIDENCE
     
-    async def validate(self, training_unit: Dict[str, Any], documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def validate(self, training_unit: Dict[str, Any], documents: List[Dict[str, Any]],
+                       analyses: Optional[List[DocumentAnalysis]] = None) -> Dict[str, Any]:
         """Execute Knowledge Evidence validation"""
         logger.info(f"Starting KE validation for unit {training_unit.get('unit_code')}")
         
@@ -34,7 +53,10 @@ class KnowledgeEvidenceValidator(BaseValidator):
                 "gaps": ["Complete knowledge evidence requirements missing"]
             }
         
-        coverage_analysis = await self._analyze_knowledge_coverage(unit_knowledge_evidence, documents)
+        if analyses is None:
+            analyses = analyse_documents(documents)
+        
+        coverage_analysis = await self._analyze_knowledge_coverage(unit_knowledge_evidence, analyses)
         
         gaps = self._identify_knowledge_gaps(unit_knowledge_evidence, coverage_analysis)
         recommendations = self._generate_ke_recommendations(gaps, coverage_analysis)
@@ -55,13 +77,25 @@ class KnowledgeEvidenceValidator(BaseValidator):
             "gaps": gaps
         }
     
-    async def _analyze_knowledge_coverage(self, knowledge_requirements: List[Dict], documents: List[Dict]) -> Dict[str, Any]:
+    async def _analyze_knowledge_coverage(self, knowledge_requirements: List[Dict], analyses: List[DocumentAnalysis]) -> Dict[str, Any]:
         """Analyze how well documents cover knowledge requirements"""
         coverage_analysis = {}
         
-        for i, requirement in enumerate(knowledge_requirements):
+        # Content key terms and the sentence index are built once; every requirement is
+        # then scored against all sentences of all documents in one batch
+        documents = [analysis for analysis in analyses if analysis.content]
+        content_terms = [analysis.key_terms() for analysis in documents]
+        index = SentenceIndex(documents)
+        
+        requirement_texts = [
+            str(requirement) if isinstance(requirement, dict) else requirement
+            for requirement in knowledge_requirements
+        ]
+        requirement_terms = [self._extract_key_terms(text) for text in requirement_texts]
+        sentence_scores = index.score(requirement_terms)
+        
+        for i, requirement_text in enumerate(requirement_texts):
             req_key = f"ke_{i+1}"
-            requirement_text = str(requirement) if isinstance(requirement, dict) else requirement
             
             coverage_analysis[req_key] = {
                 "requirement": requirement_text,
@@ -71,41 +105,41 @@ class KnowledgeEvidenceValidator(BaseValidator):
                 "relevant_content": []
             }
             
-            for doc in documents:
-                content = doc.get("content_extracted", "")
-                if content:
-                    coverage_score = self._assess_requirement_coverage(requirement_text, content)
-                    if coverage_score > 0.3:  # Threshold for considering it covered
-                        coverage_analysis[req_key]["covered"] = True
-                        coverage_analysis[req_key]["coverage_strength"] = max(
-                            coverage_analysis[req_key]["coverage_strength"], coverage_score
-                        )
-                        coverage_analysis[req_key]["supporting_documents"].append(doc.get("filename", "Unknown"))
-                        
-                        relevant_snippets = self._extract_relevant_snippets(requirement_text, content)
-                        coverage_analysis[req_key]["relevant_content"].extend(relevant_snippets)
+            for document, analysis in enumerate(documents):
+                coverage_score = self._assess_requirement_coverage(
+                    requirement_text, requirement_terms[i], analysis, content_terms[document]
+                )
+                if coverage_score > 0.3:  # Threshold for considering it covered
+                    coverage_analysis[req_key]["covered"] = True
+                    coverage_analysis[req_key]["coverage_strength"] = max(
+                        coverage_analysis[req_key]["coverage_strength"], coverage_score
+                    )
+                    coverage_analysis[req_key]["supporting_documents"].append(analysis.filename)
+                    
+                    # Best-matching sentences sharing at least 2 terms with the requirement
+                    relevant_snippets = sentence_scores.top_sentences(i, document, k=3, min_matched=2)
+                    coverage_analysis[req_key]["relevant_content"].extend(relevant_snippets)
         
         return coverage_analysis
     
-    def _assess_requirement_coverage(self, requirement: str, content: str) -> float:
-        """Assess how well content covers a knowledge requirement"""
+    def _assess_requirement_coverage(self, requirement: str, key_terms: List[str],
+                                     analysis: DocumentAnalysis, content_terms: frozenset) -> float:
+        """Assess how well an analysed document covers a knowledge requirement"""
         requirement_lower = requirement.lower()
-        content_lower = content.lower()
+        exact_match = requirement_lower in analysis.normalised
         
-        semantic_score = self._semantic_similarity_score(requirement_lower, content_lower)
-        
-        key_terms = self._extract_key_terms(requirement_lower)
+        semantic_score = self._semantic_similarity_score(requirement_lower, key_terms, analysis, content_terms, exact_match)
         
         matches = 0
         total_terms = len(key_terms)
         
         for term in key_terms:
-            if term in content_lower:
+            if term in content_terms:
                 matches += 1
         
         keyword_score = matches / total_terms if total_terms > 0 else 0
         
-        exact_match_bonus = 0.3 if requirement_lower in content_lower else 0
+        exact_match_bonus = 0.3 if exact_match else 0
         
         coverage_score = (semantic_score * 0.5 + keyword_score * 0.4 + exact_match_bonus * 0.1)
         
@@ -113,37 +147,7 @@ class KnowledgeEvidenceValidator(BaseValidator):
     
     def _extract_key_terms(self, text: str) -> List[str]:
         """Extract key terms from requirement text"""
-        common_words = {"the", "and", "or", "of", "to", "in", "for", "with", "by", "from", "a", "an", "is", "are", "be", "have", "has", "will", "can", "may", "must", "should"}
-        
-        words = text.split()
-        key_terms = []
-        
-        for word in words:
-            clean_word = word.strip(".,!?;:")
-            if len(clean_word) > 2 and clean_word not in common_words:
-                key_terms.append(clean_word)
-        
-        return key_terms
-    
-    def _extract_relevant_snippets(self, requirement: str, content: str, max_snippets: int = 3) -> List[str]:
-        """Extract relevant content snippets that relate to the requirement"""
-        sentences = content.split('.')
-        relevant_snippets = []
-        
-        requirement_terms = set(self._extract_key_terms(requirement.lower()))
-        
-        for sentence in sentences[:50]:  # Limit to first 50 sentences for performance
-            sentence_lower = sentence.lower()
-            sentence_terms = set(self._extract_key_terms(sentence_lower))
-            
-            overlap = len(requirement_terms.intersection(sentence_terms))
-            if overlap >= 2:  # At least 2 terms match
-                relevant_snippets.append(sentence.strip())
-                
-                if len(relevant_snippets) >= max_snippets:
-                    break
-        
-        return relevant_snippets
+        return key_terms(text)
     
     def _identify_knowledge_gaps(self, requirements: List[Dict], coverage_analysis: Dict[str, Any]) -> List[str]:
         """Identify knowledge gaps based on coverage analysis"""
@@ -215,44 +219,33 @@ class KnowledgeEvidenceValidator(BaseValidator):
         
         return min(100, max(0, overall_score))
     
-    def _semantic_similarity_score(self, requirement: str, content: str) -> float:
-        """Calculate semantic similarity between requirement and content"""
-        req_words = set(self._extract_key_terms(requirement.lower()))
-        content_words = set(self._extract_key_terms(content.lower()))
+    def _semantic_similarity_score(self, requirement: str, key_terms: List[str], analysis: DocumentAnalysis,
+                                   content_words: frozenset, exact_match: bool) -> float:
+        """Calculate semantic similarity between a lower-cased requirement and an analysed document"""
+        req_words = set(key_terms)
         
         intersection = len(req_words.intersection(content_words))
-        union = len(req_words.union(content_words))
+        # |A ∪ B| = |A| + |B| - |A ∩ B|, without copying the document's vocabulary
+        union = len(req_words) + len(content_words) - intersection
         
         if union == 0:
             return 0.0
         
         jaccard_score = intersection / union
         
-        if requirement.lower() in content.lower():
+        if exact_match:
             jaccard_score += 0.3
         
-        related_terms = self._find_related_terms(requirement.lower(), content.lower())
+        related_terms = self._find_related_terms(requirement, analysis.scan(self.KEYWORD_MATCHER))
         jaccard_score += len(related_terms) * 0.1
         
         return min(1.0, jaccard_score)
     
-    def _find_related_terms(self, requirement: str, content: str) -> List[str]:
-        """Find semantically related terms"""
-        related_mappings = {
-            'safety': ['hazard', 'risk', 'protection', 'secure'],
-            'quality': ['standard', 'excellence', 'grade', 'level'],
-            'process': ['procedure', 'method', 'workflow', 'system'],
-            'communication': ['interaction', 'dialogue', 'discussion', 'exchange'],
-            'management': ['administration', 'supervision', 'control', 'oversight'],
-            'technical': ['technology', 'equipment', 'machinery', 'tools'],
-            'compliance': ['regulation', 'standard', 'requirement', 'guideline']
-        }
-        
+    def _find_related_terms(self, requirement: str, scan: KeywordScan) -> List[str]:
+        """Find semantically related terms present in the scanned content"""
         related_found = []
-        for term, related in related_mappings.items():
+        for term in RELATED_TERM_MAPPINGS:
             if term in requirement:
-                for related_term in related:
-                    if related_term in content:
-                        related_found.append(related_term)
+                related_found.extend(scan.found(term))
         
         return related_found
@@ -1,15 +1,44 @@
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import json
 from .validation_gap import ValidationGap
 from .base_validator import BaseValidator
+from .keyword_matcher import KeywordMatcher, KeywordScan
+from .document_analysis import DocumentAnalysis, analyse_documents
 from models.validation_models import ValidationType, TrainingUnit, ValidationDocument, ValidationResult
 
 logger = logging.getLogger(__name__)
 
+ASSESSMENT_METHODS = [
+    "observation", "demonstration", "portfolio", "project", "case study",
+    "simulation", "role play", "presentation", "interview", "practical assessment"
+]
+
+COLLECTION_KEYWORDS = [
+    "evidence", "documentation", "record", "portfolio", "collect", "gather",
+    "submit", "store", "maintain", "organize", "file"
+]
+
+EVIDENCE_TYPES = [
+    "written work", "practical demonstration", "video recording", "photographs",
+    "witness testimony", "supervisor feedback", "self-assessment", "peer review"
+]
+
+STORAGE_KEYWORDS = ["store", "maintain", "organize", "file", "archive", "database"]
+
 class PerformanceEvidenceValidator(BaseValidator):
     """Validates training documents against Performance Evidence (PE) requirements"""
     
+    UNIT_FIELDS = ("performance_evidence",)
+    
+    # All PE keyword lists, matched in one pass per document
+    KEYWORD_MATCHER = KeywordMatcher({
+        "methods": ASSESSMENT_METHODS,
+        "collection": COLLECTION_KEYWORDS,
+        "evidence_types": EVIDENCE_TYPES,
+        "storage": STORAGE_KEYWORDS,
+    })
+    
     def __init__(self, strictness_level: str = "normal"):
         super().__init__(strictness_level)
     
@@ -17,7 +46,8 @@ class PerformanceEvidenceValidator(BaseValidator):
     def get_validation_type(cls) -> ValidationType:
         return ValidationType.PERFORMANCE_EVIDENCE
     
-    async def validate(self, training_unit: Dict[str, Any], documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def validate(self, training_unit: Dict[str, Any], documents: List[Dict[str, Any]],
+                       analyses: Optional[List[DocumentAnalysis]] = None) -> Dict[str, Any]:
         """Execute Performance Evidence validation"""
         logger.info(f"Starting PE validation for unit {training_unit.get('unit_code')}")
         
@@ -34,9 +64,13 @@ class PerformanceEvidenceValidator(BaseValidator):
                 "evidence_collection": {}
             }
         
-        assessment_methods = await self._analyze_assessment_methods(unit_performance_evidence, documents)
+        if analyses is None:
+            analyses = analyse_documents(documents)
+        scans = [analysis.scan(self.KEYWORD_MATCHER) for analysis in analyses]
+        
+        assessment_methods = await self._analyze_assessment_methods(unit_performance_evidence, scans)
         
-        evidence_collection = await self._analyze_evidence_collection(unit_performance_evidence, documents)
+        evidence_collection = await self._analyze_evidence_collection(unit_performance_evidence, scans)
         
         gaps = self._identify_pe_gaps(assessment_methods, evidence_collection)
         recommendations = self._generate_pe_recommendations(assessment_methods, evidence_collection, gaps)
@@ -49,7 +83,7 @@ class PerformanceEvidenceValidator(BaseValidator):
             "findings": {
                 "assessment_methods_analysis": assessment_methods,
                 "evidence_collection_analysis": evidence_collection,
-                "performance_criteria_alignment": await self._analyze_performance_criteria_alignment(unit_performance_evidence, documents)
+                "performance_criteria_alignment": await self._analyze_performance_criteria_alignment(unit_performance_evidence, analyses)
             },
             "recommendations": recommendations,
             "gaps": [gap.to_dict() for gap in gaps],
@@ -57,7 +91,7 @@ class PerformanceEvidenceValidator(BaseValidator):
             "evidence_collection": evidence_collection
         }
     
-    async def _analyze_assessment_methods(self, performance_requirements: List[Dict], documents: List[Dict]) -> Dict[str, Any]:
+    async def _analyze_assessment_methods(self, performance_requirements: List[Dict], scans: List[KeywordScan]) -> Dict[str, Any]:
         """Analyze assessment methods specified in documents"""
         methods_analysis = {
             "identified_methods": [],
@@ -66,21 +100,12 @@ class PerformanceEvidenceValidator(BaseValidator):
             "method_coverage": 0
         }
         
-        assessment_methods = [
-            "observation", "demonstration", "portfolio", "project", "case study",
-            "simulation", "role play", "presentation", "interview", "practical assessment"
-        ]
-        
         identified_methods = set()
         method_mentions = 0
         
-        for doc in documents:
-            content = doc.get("content_extracted", "").lower()
-            
-            for method in assessment_methods:
-                if method in content:
-                    identified_methods.add(method)
-                    method_mentions += content.count(method)
+        for scan in scans:
+            identified_methods.update(scan.found("methods"))
+            method_mentions += scan.total("methods")
         
         methods_analysis["identified_methods"] = list(identified_methods)
         
@@ -102,7 +127,7 @@ class PerformanceEvidenceValidator(BaseValidator):
         
         return methods_analysis
     
-    async def _analyze_evidence_collection(self, performance_requirements: List[Dict], documents: List[Dict]) -> Dict[str, Any]:
+    async def _analyze_evidence_collection(self, performance_requirements: List[Dict], scans: List[KeywordScan]) -> Dict[str, Any]:
         """Analyze evidence collection procedures"""
         evidence_analysis = {
             "collection_procedures": [],
@@ -112,31 +137,14 @@ class PerformanceEvidenceValidator(BaseValidator):
             "storage_procedures": 0
         }
         
-        collection_keywords = [
-            "evidence", "documentation", "record", "portfolio", "collect", "gather",
-            "submit", "store", "maintain", "organize", "file"
-        ]
-        
-        evidence_types = [
-            "written work", "practical demonstration", "video recording", "photographs",
-            "witness testimony", "supervisor feedback", "self-assessment", "peer review"
-        ]
-        
         found_procedures = set()
         found_evidence_types = set()
         collection_mentions = 0
         
-        for doc in documents:
-            content = doc.get("content_extracted", "").lower()
-            
-            for keyword in collection_keywords:
-                if keyword in content:
-                    collection_mentions += content.count(keyword)
-                    found_procedures.add(keyword)
-            
-            for evidence_type in evidence_types:
-                if evidence_type in content:
-                    found_evidence_types.add(evidence_type)
+        for scan in scans:
+            collection_mentions += scan.total("collection")
+            found_procedures.update(scan.found("collection"))
+            found_evidence_types.update(scan.found("evidence_types"))
         
         evidence_analysis["collection_procedures"] = list(found_procedures)
         evidence_analysis["evidence_types"] = list(found_evidence_types)
@@ -144,15 +152,14 @@ class PerformanceEvidenceValidator(BaseValidator):
         if collection_mentions > 0:
             evidence_analysis["collection_clarity"] = min(100, collection_mentions * 10)
         
-        storage_keywords = ["store", "maintain", "organize", "file", "archive", "database"]
-        storage_mentions = sum([doc.get("content_extracted", "").lower().count(keyword) for doc in documents for keyword in storage_keywords])
+        storage_mentions = sum(scan.total("storage") for scan in scans)
         
         if storage_mentions > 0:
             evidence_analysis["storage_procedures"] = min(100, storage_mentions * 20)
         
         return evidence_analysis
     
-    async def _analyze_performance_criteria_alignment(self, performance_requirements: List[Dict], documents: List[Dict]) -> Dict[str, Any]:
+    async def _analyze_performance_criteria_alignment(self, performance_requirements: List[Dict], analyses: List[DocumentAnalysis]) -> Dict[str, Any]:
         """Analyze alignment between performance criteria and evidence requirements"""
         alignment_analysis = {
             "criteria_coverage": 0,
@@ -161,7 +168,7 @@ class PerformanceEvidenceValidator(BaseValidator):
         }
         
         
-        total_content_length = sum([len(doc.get("content_extracted", "")) for doc in documents])
+        total_content_length = sum(len(analysis.content) for analysis in analyses)
         
         if total_content_length > 5000:
             alignment_analysis["criteria_coverage"] = 85
@@ -0,0 +1,119 @@
+from collections import Counter
+from typing import Dict, List, Sequence
+
+import numpy as np
+from scipy import sparse
+
+from .document_analysis import DocumentAnalysis, is_key_term
+
+class SentenceIndex:
+    """
+    Sparse TF-IDF matrix over the sentences of a set of analysed documents.
+
+    Rows are sentences (document by document, so each document owns a contiguous
+    block of rows), columns are key terms. The matrix is assembled from the token ids
+    each DocumentAnalysis already holds, so building it does not re-tokenise the text.
+    Weights are sublinear TF times smoothed IDF, L2-normalised per row, as in
+    scikit-learn's TfidfVectorizer. A batch of queries is scored with one sparse
+    product Q·Sᵀ, giving the cosine similarity of every query to every sentence.
+    """
+    def __init__(self, analyses: Sequence[DocumentAnalysis]):
+        self.analyses = list(analyses)
+        self.vocabulary: Dict[str, int] = {}
+        # First row of each document's block
+        self.document_offsets = [0]
+        rows, columns = [], []
+
+        for analysis in self.analyses:
+            row_base = self.document_offsets[-1]
+            # Document term id -> matrix column, or -1 for stop words and short tokens
+            columns_by_id = np.fromiter(
+                (
+                    self.vocabulary.setdefault(term, len(self.vocabulary)) if is_key_term(term) else -1
+                    for term in analysis.vocabulary
+                ),
+                dtype=np.int64, count=len(analysis.vocabulary)
+            )
+            token_columns = columns_by_id[np.asarray(analysis.token_ids, dtype=np.int64)]
+            token_rows = np.repeat(
+                np.arange(row_base, row_base + analysis.sentence_count, dtype=np.int64),
+                np.diff(np.asarray(analysis.sentence_token_offsets, dtype=np.int64))
+            )
+            keep = token_columns >= 0
+            rows.append(token_rows[keep])
+            columns.append(token_columns[keep])
+            self.document_offsets.append(row_base + analysis.sentence_count)
+
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        columns = np.concatenate(columns) if columns else np.empty(0, dtype=np.int64)
+        shape = (self.document_offsets[-1], len(self.vocabulary))
+        # One entry per occurrence; duplicates are summed into term counts
+        term_counts = sparse.csr_matrix((np.ones(rows.size), (rows, columns)), shape=shape)
+        term_counts.sum_duplicates()
+
+        # Smoothed IDF over the sentences that contain any key term
+        sentences = np.count_nonzero(np.diff(term_counts.indptr))
+        document_frequency = np.bincount(term_counts.indices, minlength=shape[1])
+        self.idf = np.log((1 + sentences) / (1 + document_frequency)) + 1
+        self.matrix = self._weigh(term_counts)
+
+    def _weigh(self, term_counts: sparse.csr_matrix) -> sparse.csr_matrix:
+        """Sublinear TF-IDF with L2-normalised rows"""
+        weighted = term_counts.copy()
+        weighted.data = 1 + np.log(weighted.data)
+        weighted = weighted.multiply(self.idf).tocsr()
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ weighted
+
+    def _query_matrix(self, queries: Sequence[Sequence[str]]) -> sparse.csr_matrix:
+        rows, columns, counts = [], [], []
+        for row, query in enumerate(queries):
+            for term, count in Counter(query).items():
+                column = self.vocabulary.get(term)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+                    counts.append(count)
+        return sparse.csr_matrix(
+            (np.asarray(counts, dtype=np.float64), (rows, columns)),
+            shape=(len(queries), len(self.vocabulary))
+        )
+
+    def score(self, queries: Sequence[Sequence[str]]) -> "SentenceScores":
+        """Score every query (a list of key terms) against every sentence in one batch"""
+        query_counts = self._query_matrix(queries)
+        similarity = (self._weigh(query_counts) @ self.matrix.T).tocsr()
+        # Number of distinct query terms each sentence shares with the query. All weights
+        # are positive, so both products have the same sparsity pattern.
+        matched = (query_counts.sign() @ self.matrix.sign().T).tocsr()
+        similarity.sort_indices()
+        matched.sort_indices()
+        return SentenceScores(self, similarity, matched)
+
+class SentenceScores:
+    """Query × sentence similarity from SentenceIndex.score"""
+    def __init__(self, index: SentenceIndex, similarity: sparse.csr_matrix, matched: sparse.csr_matrix):
+        self.index = index
+        self.similarity = similarity
+        self.matched = matched
+
+    def top_sentences(self, query: int, document: int, k: int = 3, min_matched: int = 1) -> List[str]:
+        """The k best-scoring sentences of one document sharing at least min_matched terms with the query"""
+        # The query's non-zero entries, narrowed to the document's block of rows
+        row_start, row_end = self.similarity.indptr[query], self.similarity.indptr[query + 1]
+        columns = self.similarity.indices[row_start:row_end]
+        document_start = self.index.document_offsets[document]
+        first, last = np.searchsorted(columns, [document_start, self.index.document_offsets[document + 1]])
+        rows = columns[first:last]
+        scores = self.similarity.data[row_start + first:row_start + last]
+        keep = self.matched.data[row_start + first:row_start + last] >= min_matched
+        rows, scores = rows[keep], scores[keep]
+        if rows.size > k:
+            best = np.argpartition(-scores, k)[:k]
+            rows, scores = rows[best], scores[best]
+        analysis = self.index.analyses[document]
+        return [
+            analysis.sentence(int(row) - document_start).strip()
+            for row in rows[np.argsort(-scores, kind="stable")]
+        ]
@@ -0,0 +1,25 @@
+-- Keyset pagination and precomputed revision counters for airlock item listings
+
+-- Maintained by the airlock service inside the create_revision transaction
+ALTER TABLE airlock_items ADD COLUMN IF NOT EXISTS revision_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE airlock_items ADD COLUMN IF NOT EXISTS latest_revision INTEGER;
+
+-- Backfill from existing revisions
+UPDATE airlock_items ai
+SET revision_count = r.revision_count,
+    latest_revision = r.latest_revision
+FROM (
+    SELECT airlock_item_id, COUNT(*) AS revision_count, MAX(revision_number) AS latest_revision
+    FROM airlock_revisions
+    GROUP BY airlock_item_id
+) r
+WHERE ai.id = r.airlock_item_id;
+
+-- Composite indexes matching ORDER BY created_at DESC, id DESC for each list filter
+CREATE INDEX IF NOT EXISTS idx_airlock_items_created_id ON airlock_items(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_airlock_items_status_created ON airlock_items(status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_airlock_items_reviewer_created ON airlock_items(assigned_reviewer_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_airlock_items_reviewer_status_created ON airlock_items(assigned_reviewer_id, status, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_airlock_items_source_created ON airlock_items(source_service, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_airlock_items_content_type_created ON airlock_items(content_type_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_airlock_items_priority_created ON airlock_items(priority, created_at DESC, id DESC);
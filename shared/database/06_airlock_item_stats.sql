@@ -0,0 +1,61 @@
+-- Incrementally maintained airlock dashboard counters
+-- One row per (reviewer, status, priority, content type) combination, kept in step with
+-- airlock_items by trigger inside the same transaction as the item write. Dashboard and
+-- health reads aggregate this small table instead of scanning airlock_items.
+
+CREATE TABLE IF NOT EXISTS airlock_item_stats (
+    assigned_reviewer_id VARCHAR(255) NOT NULL DEFAULT '', -- '' for unassigned items
+    status VARCHAR(50) NOT NULL,
+    priority VARCHAR(20) NOT NULL DEFAULT '',
+    content_type_id TEXT NOT NULL, -- text so it works with integer or UUID content type keys
+    item_count BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (assigned_reviewer_id, status, priority, content_type_id)
+);
+
+CREATE OR REPLACE FUNCTION airlock_item_stats_apply()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND NEW.status IS NOT DISTINCT FROM OLD.status
+       AND NEW.priority IS NOT DISTINCT FROM OLD.priority
+       AND NEW.content_type_id IS NOT DISTINCT FROM OLD.content_type_id
+       AND NEW.assigned_reviewer_id IS NOT DISTINCT FROM OLD.assigned_reviewer_id THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE airlock_item_stats
+        SET item_count = item_count - 1
+        WHERE assigned_reviewer_id = COALESCE(OLD.assigned_reviewer_id, '')
+          AND status = OLD.status
+          AND priority = COALESCE(OLD.priority, '')
+          AND content_type_id = OLD.content_type_id::text;
+    END IF;
+
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO airlock_item_stats (assigned_reviewer_id, status, priority, content_type_id, item_count)
+        VALUES (COALESCE(NEW.assigned_reviewer_id, ''), NEW.status, COALESCE(NEW.priority, ''),
+                NEW.content_type_id::text, 1)
+        ON CONFLICT (assigned_reviewer_id, status, priority, content_type_id)
+        DO UPDATE SET item_count = airlock_item_stats.item_count + 1;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS airlock_items_stats_trigger ON airlock_items;
+CREATE TRIGGER airlock_items_stats_trigger
+    AFTER INSERT OR UPDATE OR DELETE ON airlock_items
+    FOR EACH ROW EXECUTE FUNCTION airlock_item_stats_apply();
+
+-- Backfill from existing items
+TRUNCATE airlock_item_stats;
+INSERT INTO airlock_item_stats (assigned_reviewer_id, status, priority, content_type_id, item_count)
+SELECT COALESCE(assigned_reviewer_id, ''), status, COALESCE(priority, ''), content_type_id::text, COUNT(*)
+FROM airlock_items
+GROUP BY 1, 2, 3, 4;
+
+-- Overdue counts depend on NOW() so they cannot be counters; keep them to an index range scan
+CREATE INDEX IF NOT EXISTS idx_airlock_items_pending_deadline
+    ON airlock_items(review_deadline, assigned_reviewer_id) WHERE status = 'pending_review';
@@ -0,0 +1,11 @@
+-- Overflow storage for airlock broadcasts too large for a NOTIFY payload
+-- Rows are only read by listeners within seconds of being written, so the table is
+-- unlogged and pruned by the publishing service.
+
+CREATE UNLOGGED TABLE IF NOT EXISTS airlock_broadcast_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    payload TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_airlock_broadcast_outbox_created_at ON airlock_broadcast_outbox(created_at);
@@ -0,0 +1,29 @@
+-- Denormalised item reference on chat messages for direct, cursor-based history reads
+
+ALTER TABLE airlock_chat_messages
+    ADD COLUMN IF NOT EXISTS airlock_item_id UUID REFERENCES airlock_items(id) ON DELETE CASCADE;
+
+UPDATE airlock_chat_messages acm
+SET airlock_item_id = acs.airlock_item_id
+FROM airlock_chat_sessions acs
+WHERE acm.session_id = acs.id AND acm.airlock_item_id IS NULL;
+
+-- Fill the column for writers that only supply session_id
+CREATE OR REPLACE FUNCTION airlock_chat_messages_set_item()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.airlock_item_id IS NULL THEN
+        SELECT airlock_item_id INTO NEW.airlock_item_id
+        FROM airlock_chat_sessions WHERE id = NEW.session_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS airlock_chat_messages_set_item_trigger ON airlock_chat_messages;
+CREATE TRIGGER airlock_chat_messages_set_item_trigger
+    BEFORE INSERT ON airlock_chat_messages
+    FOR EACH ROW EXECUTE FUNCTION airlock_chat_messages_set_item();
+
+CREATE INDEX IF NOT EXISTS idx_airlock_chat_messages_item_created
+    ON airlock_chat_messages(airlock_item_id, created_at, id);
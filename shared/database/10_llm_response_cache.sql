@@ -0,0 +1,17 @@
+-- Content-addressed cache of LLM responses for the training validation service.
+-- cache_key is a SHA-256 over (model, system prompt, context, sampling parameters).
+
+CREATE TABLE IF NOT EXISTS llm_response_cache (
+    cache_key CHAR(64) PRIMARY KEY,
+    model VARCHAR(255) NOT NULL,
+    response JSONB NOT NULL,
+    response_bytes INTEGER NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    last_accessed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- TTL expiry and least-recently-used eviction
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires_at ON llm_response_cache(expires_at);
+CREATE INDEX IF NOT EXISTS idx_llm_response_cache_last_accessed ON llm_response_cache(last_accessed_at);
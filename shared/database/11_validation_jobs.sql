@@ -0,0 +1,33 @@
+-- Durable queue of validation runs for the training validation service.
+-- Workers claim queued jobs with SELECT ... FOR UPDATE SKIP LOCKED; a running job whose
+-- heartbeat is older than the lease is returned to the queue, so runs survive restarts.
+
+CREATE TABLE IF NOT EXISTS validation_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    session_id UUID NOT NULL REFERENCES validation_sessions(id),
+    -- Concurrency is capped per tenant (the session owner)
+    tenant_id VARCHAR(255) NOT NULL,
+    status VARCHAR(50) NOT NULL DEFAULT 'queued', -- 'queued', 'running', 'succeeded', 'failed', 'cancelled'
+    parameters JSONB NOT NULL DEFAULT '{}', -- Strictness level, reviewer, airlock submission
+    progress JSONB NOT NULL DEFAULT '{}', -- Current stage and percentage
+    result JSONB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    run_after TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(), -- Retry backoff
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+    locked_by VARCHAR(255),
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Claiming: the oldest runnable queued job
+CREATE INDEX IF NOT EXISTS idx_validation_jobs_queued ON validation_jobs(run_after, created_at) WHERE status = 'queued';
+-- Per-tenant concurrency cap and lease expiry
+CREATE INDEX IF NOT EXISTS idx_validation_jobs_running ON validation_jobs(tenant_id, heartbeat_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_validation_jobs_session ON validation_jobs(session_id, created_at);
+-- At most one queued or running job per session
+CREATE UNIQUE INDEX IF NOT EXISTS idx_validation_jobs_active_session ON validation_jobs(session_id) WHERE status IN ('queued', 'running');
@@ -0,0 +1,17 @@
+-- Per-engine validation results keyed by the fingerprint of their inputs.
+-- fingerprint is a SHA-256 over (engine, engine result version, the training unit fields the
+-- engine reads, each document's filename and content hash, strictness level); a re-run whose
+-- inputs for an engine are unchanged reuses the stored result instead of recomputing it.
+
+CREATE TABLE IF NOT EXISTS validation_engine_results (
+    fingerprint CHAR(64) PRIMARY KEY,
+    engine VARCHAR(255) NOT NULL,
+    validation_type VARCHAR(100) NOT NULL,
+    result JSONB NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+    last_used_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Least-recently-used eviction
+CREATE INDEX IF NOT EXISTS idx_validation_engine_results_last_used ON validation_engine_results(last_used_at);
@@ -0,0 +1,21 @@
+-- Compact per-document element store.
+-- element_columns is a zlib-compressed columnar blob (models/document_elements.py): element type ids,
+-- page numbers and start/end offsets into validation_documents.content_extracted, a few bytes
+-- per element. Validation loads it with the text instead of validation_documents.metadata,
+-- which now only holds the document summary. source_elements keeps the full Unstructured
+-- element JSON (gzip) for re-processing; nothing on the validation path reads it.
+
+CREATE TABLE IF NOT EXISTS validation_document_elements (
+    document_id UUID PRIMARY KEY REFERENCES validation_documents(id) ON DELETE CASCADE,
+    format SMALLINT NOT NULL,
+    element_count INTEGER NOT NULL,
+    page_count INTEGER NOT NULL,
+    element_columns BYTEA NOT NULL,
+    source_elements BYTEA,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Columnar blobs and gzip JSON are already compressed
+ALTER TABLE validation_document_elements ALTER COLUMN element_columns SET STORAGE EXTERNAL;
+ALTER TABLE validation_document_elements ALTER COLUMN source_elements SET STORAGE EXTERNAL;
+
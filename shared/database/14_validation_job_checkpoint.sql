@@ -0,0 +1,5 @@
+-- What a validation job has committed, so a retried attempt resumes instead of repeating it:
+-- the stored result, report asset and summary once they commit, and the airlock submission
+-- once it succeeds.
+
+ALTER TABLE validation_jobs ADD COLUMN IF NOT EXISTS checkpoint JSONB NOT NULL DEFAULT '{}';
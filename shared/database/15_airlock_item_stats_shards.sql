@@ -0,0 +1,86 @@
+-- Spread the airlock dashboard counters over shards
+-- With one row per (reviewer, status, priority, content type), every item write updated
+-- the same few counter rows, so concurrent creates queued on their row locks and a batch
+-- COPY held them until its transaction committed. Each counter now has up to 16 shard
+-- rows: a statement adds its aggregated delta to the shard of its backend
+-- (pg_backend_pid() % 16), so concurrent connections mostly touch different rows. A
+-- shard may go negative when an item is changed by a different backend than the one
+-- that created it; readers SUM(item_count) over the shards.
+
+ALTER TABLE airlock_item_stats ADD COLUMN IF NOT EXISTS shard SMALLINT NOT NULL DEFAULT 0;
+ALTER TABLE airlock_item_stats DROP CONSTRAINT IF EXISTS airlock_item_stats_pkey;
+ALTER TABLE airlock_item_stats ADD PRIMARY KEY (assigned_reviewer_id, status, priority, content_type_id, shard);
+
+-- Statement-level: one upsert per counter per statement rather than one per row, which
+-- keeps a COPY of many items to a handful of counter writes. Rows are upserted in key
+-- order so two statements sharing a shard lock them in the same order.
+CREATE OR REPLACE FUNCTION airlock_item_stats_apply_statement()
+RETURNS TRIGGER AS $$
+DECLARE
+    target_shard SMALLINT := pg_backend_pid() % 16;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO airlock_item_stats (assigned_reviewer_id, status, priority, content_type_id, shard, item_count)
+        SELECT COALESCE(assigned_reviewer_id, ''), status, COALESCE(priority, ''), content_type_id::text,
+               target_shard, COUNT(*)
+        FROM new_rows
+        GROUP BY 1, 2, 3, 4
+        ORDER BY 1, 2, 3, 4
+        ON CONFLICT (assigned_reviewer_id, status, priority, content_type_id, shard)
+        DO UPDATE SET item_count = airlock_item_stats.item_count + EXCLUDED.item_count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO airlock_item_stats (assigned_reviewer_id, status, priority, content_type_id, shard, item_count)
+        SELECT COALESCE(assigned_reviewer_id, ''), status, COALESCE(priority, ''), content_type_id::text,
+               target_shard, -COUNT(*)
+        FROM old_rows
+        GROUP BY 1, 2, 3, 4
+        ORDER BY 1, 2, 3, 4
+        ON CONFLICT (assigned_reviewer_id, status, priority, content_type_id, shard)
+        DO UPDATE SET item_count = airlock_item_stats.item_count + EXCLUDED.item_count;
+    ELSE
+        -- Unchanged rows add and remove the same counter and net to zero
+        INSERT INTO airlock_item_stats (assigned_reviewer_id, status, priority, content_type_id, shard, item_count)
+        SELECT assigned_reviewer_id, status, priority, content_type_id, target_shard, SUM(delta)
+        FROM (
+            SELECT COALESCE(assigned_reviewer_id, '') AS assigned_reviewer_id, status,
+                   COALESCE(priority, '') AS priority, content_type_id::text AS content_type_id, 1 AS delta
+            FROM new_rows
+            UNION ALL
+            SELECT COALESCE(assigned_reviewer_id, ''), status, COALESCE(priority, ''), content_type_id::text, -1
+            FROM old_rows
+        ) changes
+        GROUP BY 1, 2, 3, 4
+        HAVING SUM(delta) <> 0
+        ORDER BY 1, 2, 3, 4
+        ON CONFLICT (assigned_reviewer_id, status, priority, content_type_id, shard)
+        DO UPDATE SET item_count = airlock_item_stats.item_count + EXCLUDED.item_count;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Transition tables allow one event per trigger
+DROP TRIGGER IF EXISTS airlock_items_stats_trigger ON airlock_items;
+DROP FUNCTION IF EXISTS airlock_item_stats_apply();
+DROP TRIGGER IF EXISTS airlock_items_stats_insert ON airlock_items;
+CREATE TRIGGER airlock_items_stats_insert
+    AFTER INSERT ON airlock_items
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION airlock_item_stats_apply_statement();
+DROP TRIGGER IF EXISTS airlock_items_stats_update ON airlock_items;
+CREATE TRIGGER airlock_items_stats_update
+    AFTER UPDATE ON airlock_items
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION airlock_item_stats_apply_statement();
+DROP TRIGGER IF EXISTS airlock_items_stats_delete ON airlock_items;
+CREATE TRIGGER airlock_items_stats_delete
+    AFTER DELETE ON airlock_items
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION airlock_item_stats_apply_statement();
+
+-- Rebuild from the items, collapsed into shard 0
+TRUNCATE airlock_item_stats;
+INSERT INTO airlock_item_stats (assigned_reviewer_id, status, priority, content_type_id, shard, item_count)
+SELECT COALESCE(assigned_reviewer_id, ''), status, COALESCE(priority, ''), content_type_id::text, 0, COUNT(*)
+FROM airlock_items
+GROUP BY 1, 2, 3, 4;
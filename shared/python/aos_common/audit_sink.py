@@ -0,0 +1,250 @@
+# Asynchronous, batched audit log writer
+# File: /shared/python/aos_common/audit_sink.py
+#
+# Used by the airlock system and the audit service. Audit events are queued in
+# memory and written to audit_logs in batches with COPY, off the request path. A
+# batch that cannot be written for any reason other than a bad row is appended
+# to a local JSON-lines spool file and replayed once the database is reachable
+# again. stop() drains the queue before shutdown.
+
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
+import uuid
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+AUDIT_COLUMNS = ["id", "event_type", "entity_type", "entity_id", "actor_type", "actor_id",
+                 "action", "details", "timestamp", "session_id"]
+
+# Errors that mean "database unreachable" (spool and retry) rather than "bad row"
+CONNECTION_ERRORS = (OSError, asyncio.TimeoutError, asyncpg.PostgresConnectionError,
+                     asyncpg.InterfaceError, asyncpg.CannotConnectNowError)
+
+class AuditSink:
+    def __init__(self, database_url: str,
+                 batch_size: int = int(os.getenv("AUDIT_BATCH_SIZE", "500")),
+                 flush_interval: float = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0")),
+                 max_queue: int = int(os.getenv("AUDIT_MAX_QUEUE", "50000")),
+                 spool_dir: str = os.getenv("AUDIT_SPOOL_DIR", "audit_spool"),
+                 spool_name: str = "audit"):
+        self.database_url = database_url
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.spool_path = os.path.join(spool_dir, f"{spool_name}.jsonl")
+        self.rejected_path = os.path.join(spool_dir, f"{spool_name}.rejected.jsonl")
+        self.queue: deque = deque()
+        self.conn: Optional[asyncpg.Connection] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._stats = {"enqueued": 0, "written": 0, "spooled": 0, "replayed": 0, "rejected": 0}
+
+    async def start(self):
+        os.makedirs(os.path.dirname(self.spool_path) or ".", exist_ok=True)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Audit sink started (batch size {self.batch_size}, spool {self.spool_path})")
+
+    async def stop(self):
+        """Stop the flusher and drain everything still queued"""
+        if self._task:
+            # Let the flusher finish the batch it is writing rather than cancelling it mid-write
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        while self.queue:
+            await self.flush()
+        if self.conn and not self.conn.is_closed():
+            await self.conn.close()
+        self.conn = None
+        logger.info(f"Audit sink stopped: {self.stats()}")
+
+    def log(self, event_type: str, entity_type: str, entity_id: str, actor_type: str, actor_id: str,
+            action: str, details: Dict[str, Any], session_id: Optional[str] = None,
+            timestamp: Optional[datetime] = None) -> str:
+        """Queue an audit event and return its ID; never blocks on the database"""
+        audit_id = str(uuid.uuid4())
+        record = {
+            "id": audit_id,
+            "event_type": event_type,
+            "entity_type": entity_type,
+            "entity_id": str(entity_id),
+            "actor_type": actor_type,
+            "actor_id": actor_id,
+            "action": action,
+            "details": json.dumps(details, default=str),
+            "timestamp": (timestamp or datetime.now(timezone.utc)).isoformat(),
+            "session_id": session_id
+        }
+        self._stats["enqueued"] += 1
+        if len(self.queue) >= self.max_queue:
+            # Memory bound reached (database likely down); go straight to disk
+            self._spool([record])
+            return audit_id
+        self.queue.append(record)
+        if len(self.queue) >= self.batch_size:
+            self._wakeup.set()
+        return audit_id
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "queued": len(self.queue),
+            "spool_bytes": os.path.getsize(self.spool_path) if os.path.exists(self.spool_path) else 0
+        }
+
+    async def flush(self):
+        """Write one batch from the queue, spooling it if it cannot be written"""
+        async with self._flush_lock:
+            batch = [self.queue.popleft() for _ in range(min(self.batch_size, len(self.queue)))]
+            if not batch:
+                return
+            try:
+                await self._write(batch)
+                self._stats["written"] += len(batch)
+            except asyncio.CancelledError:
+                # The batch has left the queue; keep it on disk so it is replayed, not lost
+                self._spool(batch)
+                raise
+            except Exception as e:
+                # Unreachable database, refused connection (too many clients, bad
+                # credentials) or anything else: keep the batch for the spool replay
+                if isinstance(e, CONNECTION_ERRORS):
+                    logger.warning(f"Audit database unavailable, spooling {len(batch)} events: {e}")
+                else:
+                    logger.error(f"Audit batch write failed, spooling {len(batch)} events: {e}")
+                await self._reset_connection()
+                self._spool(batch)
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                # stop() drains the queue itself
+                break
+            try:
+                while self.queue:
+                    await self.flush()
+                    if len(self.queue) < self.batch_size:
+                        break
+                await self._replay_spool()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Audit sink flush failed: {e}")
+
+    async def _connection(self) -> asyncpg.Connection:
+        if self.conn is None or self.conn.is_closed():
+            self.conn = await asyncpg.connect(self.database_url, timeout=10)
+        return self.conn
+
+    async def _reset_connection(self):
+        if self.conn is not None:
+            try:
+                await self.conn.close(timeout=1)
+            except Exception:
+                pass
+        self.conn = None
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        conn = await self._connection()
+        try:
+            await conn.copy_records_to_table("audit_logs", records=[self._to_row(r) for r in batch],
+                                             columns=AUDIT_COLUMNS)
+        except CONNECTION_ERRORS:
+            raise
+        except asyncpg.PostgresError as e:
+            # A bad row fails the whole COPY; fall back to row-by-row to isolate it
+            logger.warning(f"Audit batch COPY failed ({e}); retrying {len(batch)} events individually")
+            for record in batch:
+                try:
+                    await conn.copy_records_to_table("audit_logs", records=[self._to_row(record)],
+                                                     columns=AUDIT_COLUMNS)
+                except CONNECTION_ERRORS:
+                    raise
+                except asyncpg.UniqueViolationError:
+                    # Event IDs are generated once in log(); a conflict means an earlier,
+                    # interrupted write already stored this event
+                    continue
+                except asyncpg.PostgresError as row_error:
+                    self._reject(record, str(row_error))
+
+    def _to_row(self, record: Dict[str, Any]) -> tuple:
+        return tuple(
+            datetime.fromisoformat(record[column]) if column == "timestamp" else record[column]
+            for column in AUDIT_COLUMNS
+        )
+
+    def _spool(self, records: List[Dict[str, Any]]):
+        with open(self.spool_path, "a", encoding="utf-8") as spool:
+            for record in records:
+                spool.write(json.dumps(record) + "\n")
+            spool.flush()
+            os.fsync(spool.fileno())
+        self._stats["spooled"] += len(records)
+
+    def _reject(self, record: Dict[str, Any], error: str):
+        with open(self.rejected_path, "a", encoding="utf-8") as rejected:
+            rejected.write(json.dumps({**record, "error": error}) + "\n")
+        self._stats["rejected"] += 1
+        logger.error(f"Audit event {record['id']} rejected by database: {error}")
+
+    async def _replay_spool(self):
+        """Move spooled events back into the database once it is reachable.
+
+        The number of records already written is kept next to the replay file, so a
+        replay interrupted part-way resumes after them instead of writing them again.
+        """
+        replay_path = self.spool_path + ".replay"
+        offset_path = replay_path + ".offset"
+        if not os.path.exists(replay_path):
+            if not os.path.exists(self.spool_path):
+                return
+            os.replace(self.spool_path, replay_path)
+        with open(replay_path, encoding="utf-8") as spool:
+            records = [json.loads(line) for line in spool if line.strip()]
+        resumed = written = self._read_offset(offset_path)
+        try:
+            for start in range(written, len(records), self.batch_size):
+                await self._write(records[start:start + self.batch_size])
+                written = min(start + self.batch_size, len(records))
+                self._write_offset(offset_path, written)
+        except Exception as e:
+            # Keep the replay file; it is retried from the offset on the next cycle
+            await self._reset_connection()
+            logger.warning(f"Audit spool replay deferred after {written} of {len(records)} events: {e}")
+            return
+        finally:
+            self._stats["replayed"] += written - resumed
+        os.remove(replay_path)
+        if os.path.exists(offset_path):
+            os.remove(offset_path)
+        logger.info(f"Replayed {len(records) - resumed} spooled audit events")
+
+    def _read_offset(self, offset_path: str) -> int:
+        try:
+            with open(offset_path, encoding="utf-8") as offset:
+                return int(offset.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_offset(self, offset_path: str, written: int):
+        temporary_path = offset_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as offset:
+            offset.write(str(written))
+            offset.flush()
+            os.fsync(offset.fileno())
+        os.replace(temporary_path, offset_path)